@@ -2,13 +2,13 @@ from __future__ import annotations
 
 """Anthropic Claude adapter with web_search tool."""
 
+import asyncio
 import os
 import json
 import time
 from datetime import date
 
-import anthropic
-
+from adapters import clients
 from utils import get_logger, extract_json_from_text
 
 log = get_logger("claude_adapter")
@@ -66,50 +66,62 @@ PREDICTION_SCHEMA = """{
 }"""
 
 
+def _request_kwargs(prompt: str) -> dict:
+    return dict(
+        model=MODEL_ID,
+        max_tokens=4096,
+        tools=[{"type": "web_search_20250305", "name": "web_search", "max_uses": 5}],
+        messages=[{"role": "user", "content": prompt}],
+    )
+
+
 class ClaudeAdapter:
     model_id = MODEL_ID
     model_display_name = DISPLAY_NAME
     slug = "claude"
 
-    def generate(self, date_str: str, market_context: str = "") -> dict | None:
+    def _api_key(self) -> str | None:
         self.last_error = None
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
             self.last_error = "ANTHROPIC_API_KEY not set"
             log.error(self.last_error)
+        return api_key
+
+    def _parse(self, response, date_str: str, attempt: int) -> dict | None:
+        # Extract text from response content
+        text = ""
+        for block in response.content:
+            if hasattr(block, "text"):
+                text += block.text
+
+        data = extract_json_from_text(text)
+        if data:
+            # Enforce correct metadata
+            data["model"] = MODEL_ID
+            data["model_display_name"] = DISPLAY_NAME
+            data["date"] = date_str
+            return data
+        self.last_error = "Claude returned content that was not valid JSON"
+        log.warning(f"Claude attempt {attempt + 1}: could not parse JSON from response")
+        log.debug(f"Raw response: {text[:500]}")
+        return None
+
+    def generate(self, date_str: str, market_context: str = "") -> dict | None:
+        api_key = self._api_key()
+        if not api_key:
             return None
 
-        client = anthropic.Anthropic(api_key=api_key)
+        client = clients.anthropic_client(api_key)
         prompt = _build_prompt(date_str, PREDICTION_SCHEMA, market_context)
 
         for attempt in range(3):
             try:
                 log.info(f"Claude attempt {attempt + 1}...")
-                response = client.messages.create(
-                    model=MODEL_ID,
-                    max_tokens=4096,
-                    tools=[{"type": "web_search_20250305", "name": "web_search", "max_uses": 5}],
-                    messages=[{"role": "user", "content": prompt}],
-                )
-
-                # Extract text from response content
-                text = ""
-                for block in response.content:
-                    if hasattr(block, "text"):
-                        text += block.text
-
-                data = extract_json_from_text(text)
+                response = client.messages.create(**_request_kwargs(prompt))
+                data = self._parse(response, date_str, attempt)
                 if data:
-                    # Enforce correct metadata
-                    data["model"] = MODEL_ID
-                    data["model_display_name"] = DISPLAY_NAME
-                    data["date"] = date_str
                     return data
-                else:
-                    self.last_error = "Claude returned content that was not valid JSON"
-                    log.warning(f"Claude attempt {attempt + 1}: could not parse JSON from response")
-                    log.debug(f"Raw response: {text[:500]}")
-
             except Exception as e:
                 self.last_error = str(e)
                 log.error(f"Claude attempt {attempt + 1} failed: {e}")
@@ -119,3 +131,28 @@ class ClaudeAdapter:
 
         log.error("Claude: all 3 attempts failed")
         return None
+
+    async def agenerate(self, date_str: str, market_context: str = "") -> dict | None:
+        api_key = self._api_key()
+        if not api_key:
+            return None
+
+        client = clients.async_anthropic_client(api_key)
+        prompt = _build_prompt(date_str, PREDICTION_SCHEMA, market_context)
+
+        for attempt in range(3):
+            try:
+                log.info(f"Claude attempt {attempt + 1}...")
+                response = await client.messages.create(**_request_kwargs(prompt))
+                data = self._parse(response, date_str, attempt)
+                if data:
+                    return data
+            except Exception as e:
+                self.last_error = str(e)
+                log.error(f"Claude attempt {attempt + 1} failed: {e}")
+
+            if attempt < 2:
+                await asyncio.sleep(2 ** attempt)
+
+        log.error("Claude: all 3 attempts failed")
+        return None
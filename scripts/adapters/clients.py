@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+"""Shared, long-lived SDK clients for the model adapters.
+
+Clients are cached per (provider, api_key, base_url) so retries, repair passes
+and adapters that hit the same endpoint reuse one connection pool instead of
+building a fresh SDK client (and TLS session) on every call. Async clients are
+additionally keyed by the running event loop, since their connection pools are
+bound to it; call ``aclose_async_clients()`` before the loop shuts down.
+
+SDKs are imported lazily so a missing package only breaks the adapter that
+needs it, matching the resilient loading in ``adapters/__init__.py``.
+"""
+
+import asyncio
+import threading
+
+_lock = threading.Lock()
+_sync_clients = {}
+_async_clients = {}
+
+
+def _cached(key, factory):
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = factory()
+            _sync_clients[key] = client
+        return client
+
+
+def _cached_async(key, factory):
+    key = (id(asyncio.get_running_loop()),) + key
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = factory()
+            _async_clients[key] = client
+        return client
+
+
+def anthropic_client(api_key: str):
+    import anthropic
+    return _cached(("anthropic", api_key), lambda: anthropic.Anthropic(api_key=api_key))
+
+
+def async_anthropic_client(api_key: str):
+    import anthropic
+    return _cached_async(("anthropic", api_key), lambda: anthropic.AsyncAnthropic(api_key=api_key))
+
+
+def openai_client(api_key: str, base_url: str | None = None):
+    """OpenAI-compatible client; also used for Perplexity and Grok via *base_url*."""
+    from openai import OpenAI
+    return _cached(("openai", api_key, base_url), lambda: OpenAI(api_key=api_key, base_url=base_url))
+
+
+def async_openai_client(api_key: str, base_url: str | None = None):
+    from openai import AsyncOpenAI
+    return _cached_async(
+        ("openai", api_key, base_url),
+        lambda: AsyncOpenAI(api_key=api_key, base_url=base_url),
+    )
+
+
+def gemini_client(api_key: str):
+    """google-genai client; its async surface is ``client.aio``."""
+    from google import genai
+    return _cached(("gemini", api_key), lambda: genai.Client(api_key=api_key))
+
+
+def async_gemini_client(api_key: str):
+    """Per-loop google-genai client for ``client.aio`` calls (its aiohttp session is loop-bound)."""
+    from google import genai
+    return _cached_async(("gemini", api_key), lambda: genai.Client(api_key=api_key))
+
+
+async def _aclose(client):
+    aio = getattr(client, "aio", None)
+    if aio is not None:  # google-genai: the async session lives on client.aio
+        await aio.aclose()
+        client.close()
+    else:
+        await client.close()
+
+
+async def aclose_async_clients():
+    """Close every async client created on the current event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    with _lock:
+        keys = [k for k in _async_clients if k[0] == loop_id]
+        to_close = [_async_clients.pop(k) for k in keys]
+    for client in to_close:
+        try:
+            await _aclose(client)
+        except Exception:
+            pass
@@ -2,14 +2,15 @@ from __future__ import annotations
 
 """Google Gemini adapter with Google Search grounding (new google-genai SDK)."""
 
+import asyncio
 import os
 import re
 import time
 from datetime import datetime, timezone
 
-from google import genai
 from google.genai import types
 
+from adapters import clients
 from utils import get_logger, extract_json_from_text
 
 log = get_logger("gemini_adapter")
@@ -98,8 +99,7 @@ def _clean_grounding_artifacts(text):
     return text
 
 
-def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact: str) -> dict | None:
-    """Second-pass repair: coerce Gemini's free-form text into strict JSON without tools."""
+def _repair_request(raw_text: str, date_str: str, now: str, date_compact: str) -> dict:
     prompt = JSON_REPAIR_TEMPLATE.format(
         date=date_str,
         model_id=MODEL_ID,
@@ -107,7 +107,7 @@ def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact
         date_compact=date_compact,
         raw_text=raw_text[:12000],
     )
-    response = client.models.generate_content(
+    return dict(
         model=MODEL_ID,
         contents=prompt,
         config=types.GenerateContentConfig(
@@ -116,24 +116,61 @@ def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact
             response_mime_type="application/json",
         ),
     )
+
+
+def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact: str) -> dict | None:
+    """Second-pass repair: coerce Gemini's free-form text into strict JSON without tools."""
+    response = client.models.generate_content(
+        **_repair_request(raw_text, date_str, now, date_compact)
+    )
     text = response.text or ""
     return extract_json_from_text(text)
 
 
+async def _arepair_to_json(client, raw_text: str, date_str: str, now: str, date_compact: str) -> dict | None:
+    """Async twin of ``_repair_to_json`` on the shared client's ``aio`` surface."""
+    response = await client.aio.models.generate_content(
+        **_repair_request(raw_text, date_str, now, date_compact)
+    )
+    text = response.text or ""
+    return extract_json_from_text(text)
+
+
+def _request(prompt: str) -> dict:
+    return dict(
+        model=MODEL_ID,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            temperature=0.2,
+            max_output_tokens=2048,
+            tools=[
+                types.Tool(google_search=types.GoogleSearch()),
+            ],
+        ),
+    )
+
+
+def _stamp(data: dict, date_str: str) -> dict:
+    data["model"] = MODEL_ID
+    data["model_display_name"] = DISPLAY_NAME
+    data["date"] = date_str
+    return data
+
+
 class GeminiAdapter:
     model_id = MODEL_ID
     model_display_name = DISPLAY_NAME
     slug = "gemini"
 
-    def generate(self, date_str: str, market_context: str = "") -> dict | None:
+    def _api_key(self) -> str | None:
         self.last_error = None
         api_key = os.environ.get("GOOGLE_GEMINI_API_KEY")
         if not api_key:
             self.last_error = "GOOGLE_GEMINI_API_KEY not set"
             log.error(self.last_error)
-            return None
+        return api_key
 
-        client = genai.Client(api_key=api_key)
+    def _prepare(self, date_str: str, market_context: str):
         now = datetime.now(timezone.utc).isoformat()
         date_compact = date_str.replace("-", "")
 
@@ -145,38 +182,31 @@ class GeminiAdapter:
         )
         if market_context:
             prompt = f"{market_context}\n\n{prompt}"
+        return now, date_compact, prompt
+
+    def generate(self, date_str: str, market_context: str = "") -> dict | None:
+        api_key = self._api_key()
+        if not api_key:
+            return None
+
+        client = clients.gemini_client(api_key)
+        now, date_compact, prompt = self._prepare(date_str, market_context)
 
         for attempt in range(3):
             try:
                 log.info(f"Gemini attempt {attempt + 1}...")
-                response = client.models.generate_content(
-                    model=MODEL_ID,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        temperature=0.2,
-                        max_output_tokens=2048,
-                        tools=[
-                            types.Tool(google_search=types.GoogleSearch()),
-                        ],
-                    ),
-                )
+                response = client.models.generate_content(**_request(prompt))
                 text = response.text or ""
                 # Grounding can inject markdown links/citations — strip them
                 cleaned = _clean_grounding_artifacts(text)
                 data = extract_json_from_text(cleaned)
                 if data:
-                    data["model"] = MODEL_ID
-                    data["model_display_name"] = DISPLAY_NAME
-                    data["date"] = date_str
-                    return data
+                    return _stamp(data, date_str)
                 else:
                     log.warning(f"Gemini attempt {attempt + 1}: could not parse JSON, trying repair pass")
                     repaired = _repair_to_json(client, cleaned or text, date_str, now, date_compact)
                     if repaired:
-                        repaired["model"] = MODEL_ID
-                        repaired["model_display_name"] = DISPLAY_NAME
-                        repaired["date"] = date_str
-                        return repaired
+                        return _stamp(repaired, date_str)
                     self.last_error = "Gemini returned content that could not be repaired into valid JSON"
                     log.info(f"Raw (first 500 chars): {text[:500]}")
             except Exception as e:
@@ -188,3 +218,38 @@ class GeminiAdapter:
 
         log.error("Gemini: all 3 attempts failed")
         return None
+
+    async def agenerate(self, date_str: str, market_context: str = "") -> dict | None:
+        api_key = self._api_key()
+        if not api_key:
+            return None
+
+        client = clients.async_gemini_client(api_key)
+        now, date_compact, prompt = self._prepare(date_str, market_context)
+
+        for attempt in range(3):
+            try:
+                log.info(f"Gemini attempt {attempt + 1}...")
+                response = await client.aio.models.generate_content(**_request(prompt))
+                text = response.text or ""
+                # Grounding can inject markdown links/citations — strip them
+                cleaned = _clean_grounding_artifacts(text)
+                data = extract_json_from_text(cleaned)
+                if data:
+                    return _stamp(data, date_str)
+                else:
+                    log.warning(f"Gemini attempt {attempt + 1}: could not parse JSON, trying repair pass")
+                    repaired = await _arepair_to_json(client, cleaned or text, date_str, now, date_compact)
+                    if repaired:
+                        return _stamp(repaired, date_str)
+                    self.last_error = "Gemini returned content that could not be repaired into valid JSON"
+                    log.info(f"Raw (first 500 chars): {text[:500]}")
+            except Exception as e:
+                self.last_error = str(e)
+                log.error(f"Gemini attempt {attempt + 1} failed: {e}")
+
+            if attempt < 2:
+                await asyncio.sleep(2 ** attempt)
+
+        log.error("Gemini: all 3 attempts failed")
+        return None
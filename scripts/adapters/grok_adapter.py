@@ -2,13 +2,13 @@ from __future__ import annotations
 
 """xAI Grok adapter with web search (OpenAI-compatible API)."""
 
+import asyncio
 import os
 import json
 import time
 from datetime import datetime, timezone
 
-from openai import OpenAI
-
+from adapters import clients
 from utils import get_logger, extract_json_from_text
 
 log = get_logger("grok_adapter")
@@ -56,6 +56,40 @@ Return ONLY this JSON:
 }}"""
 
 
+def _request_kwargs(user_msg: str) -> dict:
+    return dict(
+        model=MODEL_ID,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=2048,
+        temperature=0.2,
+    )
+
+
+def _build_user_message(date_str: str, market_context: str) -> str:
+    now = datetime.now(timezone.utc).isoformat()
+    date_compact = date_str.replace("-", "")
+    user_msg = USER_TEMPLATE.format(date=date_str, now=now, date_compact=date_compact)
+    if market_context:
+        user_msg = f"{market_context}\n\n{user_msg}"
+    return user_msg
+
+
+def _parse(response, date_str: str, attempt: int) -> dict | None:
+    text = response.choices[0].message.content or ""
+    data = extract_json_from_text(text)
+    if data:
+        data["model"] = MODEL_ID
+        data["model_display_name"] = DISPLAY_NAME
+        data["date"] = date_str
+        return data
+    log.warning(f"Grok attempt {attempt + 1}: could not parse JSON")
+    log.debug(f"Raw: {text[:500]}")
+    return None
+
+
 class GrokAdapter:
     model_id = MODEL_ID
     model_display_name = DISPLAY_NAME
@@ -67,35 +101,16 @@ class GrokAdapter:
             log.error("XAI_API_KEY not set")
             return None
 
-        client = OpenAI(api_key=api_key, base_url=BASE_URL)
-        now = datetime.now(timezone.utc).isoformat()
-        date_compact = date_str.replace("-", "")
-        user_msg = USER_TEMPLATE.format(date=date_str, now=now, date_compact=date_compact)
-        if market_context:
-            user_msg = f"{market_context}\n\n{user_msg}"
+        client = clients.openai_client(api_key, BASE_URL)
+        user_msg = _build_user_message(date_str, market_context)
 
         for attempt in range(3):
             try:
                 log.info(f"Grok attempt {attempt + 1}...")
-                response = client.chat.completions.create(
-                    model=MODEL_ID,
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_msg},
-                    ],
-                    max_tokens=2048,
-                    temperature=0.2,
-                )
-                text = response.choices[0].message.content or ""
-                data = extract_json_from_text(text)
+                response = client.chat.completions.create(**_request_kwargs(user_msg))
+                data = _parse(response, date_str, attempt)
                 if data:
-                    data["model"] = MODEL_ID
-                    data["model_display_name"] = DISPLAY_NAME
-                    data["date"] = date_str
                     return data
-                else:
-                    log.warning(f"Grok attempt {attempt + 1}: could not parse JSON")
-                    log.debug(f"Raw: {text[:500]}")
             except Exception as e:
                 log.error(f"Grok attempt {attempt + 1} failed: {e}")
 
@@ -104,3 +119,28 @@ class GrokAdapter:
 
         log.error("Grok: all 3 attempts failed")
         return None
+
+    async def agenerate(self, date_str: str, market_context: str = "") -> dict | None:
+        api_key = os.environ.get("XAI_API_KEY")
+        if not api_key:
+            log.error("XAI_API_KEY not set")
+            return None
+
+        client = clients.async_openai_client(api_key, BASE_URL)
+        user_msg = _build_user_message(date_str, market_context)
+
+        for attempt in range(3):
+            try:
+                log.info(f"Grok attempt {attempt + 1}...")
+                response = await client.chat.completions.create(**_request_kwargs(user_msg))
+                data = _parse(response, date_str, attempt)
+                if data:
+                    return data
+            except Exception as e:
+                log.error(f"Grok attempt {attempt + 1} failed: {e}")
+
+            if attempt < 2:
+                await asyncio.sleep(2 ** attempt)
+
+        log.error("Grok: all 3 attempts failed")
+        return None
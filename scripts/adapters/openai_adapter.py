@@ -2,14 +2,14 @@ from __future__ import annotations
 
 """OpenAI GPT-4o adapter with web search tool."""
 
+import asyncio
 import os
 import json
 import re
 import time
 from datetime import datetime, timezone
 
-from openai import OpenAI
-
+from adapters import clients
 from utils import get_logger, extract_json_from_text
 
 log = get_logger("openai_adapter")
@@ -117,20 +117,39 @@ def _strip_search_citations(text: str) -> str:
     return text
 
 
-def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact: str) -> dict | None:
-    """Second-pass repair: use standard gpt-4o with JSON mode to fix malformed output."""
+def _repair_kwargs(raw_text: str, date_str: str, now: str, date_compact: str) -> dict:
     prompt = JSON_REPAIR_TEMPLATE.format(
         date=date_str,
         now=now,
         date_compact=date_compact,
         raw_text=raw_text[:12000],
     )
+    return dict(
+        model=REPAIR_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"},
+        max_tokens=2048,
+    )
+
+
+def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact: str) -> dict | None:
+    """Second-pass repair: use standard gpt-4o with JSON mode to fix malformed output."""
     try:
         response = client.chat.completions.create(
-            model=REPAIR_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            max_tokens=2048,
+            **_repair_kwargs(raw_text, date_str, now, date_compact)
+        )
+        text = response.choices[0].message.content or ""
+        return extract_json_from_text(text)
+    except Exception as e:
+        log.warning(f"GPT-4o repair pass failed: {e}")
+        return None
+
+
+async def _arepair_to_json(client, raw_text: str, date_str: str, now: str, date_compact: str) -> dict | None:
+    """Async twin of ``_repair_to_json``; reuses the caller's pooled client."""
+    try:
+        response = await client.chat.completions.create(
+            **_repair_kwargs(raw_text, date_str, now, date_compact)
         )
         text = response.choices[0].message.content or ""
         return extract_json_from_text(text)
@@ -139,61 +158,71 @@ def _repair_to_json(client, raw_text: str, date_str: str, now: str, date_compact
         return None
 
 
+def _request_kwargs(user_msg: str) -> dict:
+    return dict(
+        model=MODEL_ID,
+        web_search_options={},
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=2048,
+    )
+
+
+def _response_text(response) -> str:
+    # Extract text from the search-preview response.
+    # msg.content contains the text but may include inline
+    # citations (【4:0†source】) injected by web_search_options.
+    msg = response.choices[0].message
+    return msg.content or ""
+
+
+def _stamp(data: dict, date_str: str) -> dict:
+    data["model"] = MODEL_ID
+    data["model_display_name"] = DISPLAY_NAME
+    data["date"] = date_str
+    return data
+
+
 class OpenAIAdapter:
     model_id = MODEL_ID
     model_display_name = DISPLAY_NAME
     slug = "gpt4o"
 
+    def _prepare(self, date_str: str, market_context: str):
+        now = datetime.now(timezone.utc).isoformat()
+        date_compact = date_str.replace("-", "")
+        user_msg = USER_TEMPLATE.format(date=date_str, now=now, date_compact=date_compact)
+        if market_context:
+            user_msg = f"{market_context}\n\n{user_msg}"
+        return now, date_compact, user_msg
+
     def generate(self, date_str: str, market_context: str = "") -> dict | None:
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             log.error("OPENAI_API_KEY not set")
             return None
 
-        client = OpenAI(api_key=api_key)
-        now = datetime.now(timezone.utc).isoformat()
-        date_compact = date_str.replace("-", "")
-        user_msg = USER_TEMPLATE.format(date=date_str, now=now, date_compact=date_compact)
-        if market_context:
-            user_msg = f"{market_context}\n\n{user_msg}"
+        client = clients.openai_client(api_key)
+        now, date_compact, user_msg = self._prepare(date_str, market_context)
 
         for attempt in range(3):
             try:
                 log.info(f"GPT-4o attempt {attempt + 1}...")
-                response = client.chat.completions.create(
-                    model=MODEL_ID,
-                    web_search_options={},
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_msg},
-                    ],
-                    max_tokens=2048,
-                )
-
-                # Extract text from the search-preview response.
-                # msg.content contains the text but may include inline
-                # citations (【4:0†source】) injected by web_search_options.
-                text = ""
-                msg = response.choices[0].message
-                if msg.content:
-                    text = msg.content
+                response = client.chat.completions.create(**_request_kwargs(user_msg))
+                text = _response_text(response)
 
                 cleaned = _strip_search_citations(text)
                 data = extract_json_from_text(cleaned)
                 if data:
-                    data["model"] = MODEL_ID
-                    data["model_display_name"] = DISPLAY_NAME
-                    data["date"] = date_str
-                    return data
+                    return _stamp(data, date_str)
                 else:
                     log.warning(f"GPT-4o attempt {attempt + 1}: could not parse JSON, trying repair pass")
                     log.info(f"Raw (first 500 chars): {text[:500]}")
                     repaired = _repair_to_json(client, cleaned or text, date_str, now, date_compact)
                     if repaired:
-                        repaired["model"] = MODEL_ID
-                        repaired["model_display_name"] = DISPLAY_NAME
-                        repaired["date"] = date_str
-                        return repaired
+                        return _stamp(repaired, date_str)
             except Exception as e:
                 log.error(f"GPT-4o attempt {attempt + 1} failed: {e}")
 
@@ -202,3 +231,37 @@ class OpenAIAdapter:
 
         log.error("GPT-4o: all 3 attempts failed")
         return None
+
+    async def agenerate(self, date_str: str, market_context: str = "") -> dict | None:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            log.error("OPENAI_API_KEY not set")
+            return None
+
+        client = clients.async_openai_client(api_key)
+        now, date_compact, user_msg = self._prepare(date_str, market_context)
+
+        for attempt in range(3):
+            try:
+                log.info(f"GPT-4o attempt {attempt + 1}...")
+                response = await client.chat.completions.create(**_request_kwargs(user_msg))
+                text = _response_text(response)
+
+                cleaned = _strip_search_citations(text)
+                data = extract_json_from_text(cleaned)
+                if data:
+                    return _stamp(data, date_str)
+                else:
+                    log.warning(f"GPT-4o attempt {attempt + 1}: could not parse JSON, trying repair pass")
+                    log.info(f"Raw (first 500 chars): {text[:500]}")
+                    repaired = await _arepair_to_json(client, cleaned or text, date_str, now, date_compact)
+                    if repaired:
+                        return _stamp(repaired, date_str)
+            except Exception as e:
+                log.error(f"GPT-4o attempt {attempt + 1} failed: {e}")
+
+            if attempt < 2:
+                await asyncio.sleep(2 ** attempt)
+
+        log.error("GPT-4o: all 3 attempts failed")
+        return None
@@ -1,19 +1,51 @@
-"""Compute performance analytics from scored predictions."""
+"""Compute performance analytics from scored predictions.
+
+Analytics are built in a single streaming pass over the columnar results
+archive (results_archive.py): each scoring day's resolved results are grouped
+once per call (utils.call_key: ticker, prediction date and timeframe), and
+that day is fed to every aggregator. Aggregator state is
+plain JSON-friendly dicts keyed by strings, so it is checkpointed to
+data/analytics_state.json and a normal run only folds in score files newer
+than the checkpoint.
+
+Usage:
+    python analytics.py [--full] [--check]
+"""
 from __future__ import annotations
 
+import argparse
+import copy
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from itertools import combinations
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent))
-from utils import get_logger, load_json, save_json, sync_to_public, SCORES_DIR, DATA_DIR
+import results_archive
+from utils import call_key, get_logger, load_json, save_json, sync_to_public, DATA_DIR
 
 log = get_logger("analytics")
 
 INDEX_TICKERS = {"SPY", "QQQ", "DIA"}
 MIN_TICKER_PREDICTIONS = 3
+RECENT_CLASHES = 15
+ROLLING_WINDOWS = (5, 20, 60)  # scoring days; 5 is also emitted as rolling_accuracy
+EWM_SPAN = 20
+
+ANALYTICS_FILE = DATA_DIR / "analytics.json"
+ANALYTICS_STATE_FILE = DATA_DIR / "analytics_state.json"
+ANALYTICS_STATE_VERSION = 2
+
+CALIBRATION_BUCKETS = [
+    ("50-59%", 0.50, 0.60, 0.55),
+    ("60-69%", 0.60, 0.70, 0.65),
+    ("70-79%", 0.70, 0.80, 0.75),
+    ("80-89%", 0.80, 0.90, 0.85),
+    ("90%+",   0.90, 1.01, 0.925),
+]
 
 
 def ticker_group(ticker):
@@ -24,350 +56,604 @@ def ticker_group(ticker):
     return "stock"
 
 
+def load_score_day(archive, date_str):
+    """Return (date, resolved results with date attached) for one scoring day."""
+    results = archive.records(archive.day(date_str), resolved_only=True)
+    for r in results:
+        r["date"] = date_str
+    return date_str, results
+
+
+def iter_score_days():
+    """Yield (date, resolved results) for each scoring day, oldest first."""
+    archive = results_archive.load()
+    for date_str in archive.dates():
+        yield load_score_day(archive, date_str)
+
+
 def load_all_scores():
     """Load all score files, return flat list of results with date attached."""
-    all_results = []
-    for path in sorted(SCORES_DIR.glob("*.json")):
-        data = load_json(path)
-        date_str = data["date"]
-        for r in data.get("results", []):
-            if r.get("status") != "resolved":
-                continue
-            r["date"] = date_str
-            all_results.append(r)
-    return all_results
+    return [r for _date, results in iter_score_days() for r in results]
 
 
-def compute_ticker_breakdown(results):
-    """Per-ticker and per-group accuracy breakdown by model."""
-    # Accumulate per (ticker, model)
-    ticker_model = defaultdict(lambda: {"predictions": 0, "correct": 0, "total_score": 0.0, "total_conf": 0.0})
+def group_calls(results):
+    """One day's results grouped by call (ticker, prediction date, timeframe), in file order.
+
+    Same-day comparisons only pit calls of the same horizon made on the same
+    day against each other — never an end_of_day call against a horizon
+    result that happens to resolve that day.
+    """
+    calls = defaultdict(list)
     for r in results:
-        key = (r["ticker"], r["model_display_name"])
-        d = ticker_model[key]
-        d["predictions"] += 1
-        d["correct"] += int(r["direction_correct"])
-        d["total_score"] += r["score"]
-        d["total_conf"] += r["confidence_at_prediction"]
-
-    # Group by ticker
-    tickers = defaultdict(list)
-    for (ticker, model), d in ticker_model.items():
-        tickers[ticker].append({
-            "model": model,
-            "predictions": d["predictions"],
-            "correct": d["correct"],
-            "accuracy": round(d["correct"] / d["predictions"], 4) if d["predictions"] else 0,
-            "total_score": round(d["total_score"], 2),
-            "avg_confidence": round(d["total_conf"] / d["predictions"], 4) if d["predictions"] else 0,
-        })
+        calls[call_key(r)].append(r)
+    return calls
 
-    by_ticker = []
-    for ticker, models in sorted(tickers.items()):
-        total_preds = sum(m["predictions"] for m in models)
-        if total_preds < MIN_TICKER_PREDICTIONS:
-            continue
-        by_ticker.append({
-            "ticker": ticker,
-            "group": ticker_group(ticker),
-            "models": sorted(models, key=lambda m: m["model"]),
-        })
 
-    # Group by group
-    group_model = defaultdict(lambda: {"predictions": 0, "correct": 0, "total_score": 0.0})
-    for r in results:
-        key = (ticker_group(r["ticker"]), r["model_display_name"])
-        d = group_model[key]
-        d["predictions"] += 1
-        d["correct"] += int(r["direction_correct"])
-        d["total_score"] += r["score"]
-
-    groups = defaultdict(list)
-    for (group, model), d in group_model.items():
-        groups[group].append({
-            "model": model,
-            "predictions": d["predictions"],
-            "correct": d["correct"],
-            "accuracy": round(d["correct"] / d["predictions"], 4) if d["predictions"] else 0,
-            "total_score": round(d["total_score"], 2),
-        })
+# ── Aggregators ────────────────────────────────────────────────────────────────
+# Each aggregator consumes one scoring day at a time via add_day(date, results,
+# calls) and renders its analytics.json section with result(). STATE lists
+# the attributes that make up its checkpointed state.
 
-    by_group = [
-        {"group": g, "models": sorted(ms, key=lambda m: m["model"])}
-        for g, ms in sorted(groups.items())
-    ]
+class Aggregator:
+    STATE = ()
 
-    return {"by_ticker": by_ticker, "by_group": by_group}
+    def to_state(self) -> dict:
+        return {attr: getattr(self, attr) for attr in self.STATE}
 
+    @classmethod
+    def from_state(cls, state: dict):
+        agg = cls()
+        for attr in cls.STATE:
+            setattr(agg, attr, state[attr])
+        return agg
 
-def compute_calibration(results):
-    """Confidence calibration buckets per model."""
-    buckets_def = [
-        ("50-59%", 0.50, 0.60, 0.55),
-        ("60-69%", 0.60, 0.70, 0.65),
-        ("70-79%", 0.70, 0.80, 0.75),
-        ("80-89%", 0.80, 0.90, 0.85),
-        ("90%+",   0.90, 1.01, 0.925),
-    ]
-
-    model_buckets = defaultdict(lambda: defaultdict(lambda: {"predictions": 0, "correct": 0}))
-    for r in results:
-        conf = r["confidence_at_prediction"]
-        model = r["model_display_name"]
-        for label, lo, hi, _ in buckets_def:
-            if lo <= conf < hi:
-                b = model_buckets[model][label]
-                b["predictions"] += 1
-                b["correct"] += int(r["direction_correct"])
-                break
-
-    models_out = []
-    for model in sorted(model_buckets.keys()):
-        buckets = []
-        errors = []
-        for label, _, _, midpoint in buckets_def:
-            b = model_buckets[model][label]
-            if b["predictions"] == 0:
+
+class TickerBreakdown(Aggregator):
+    """Per-ticker and per-group accuracy breakdown by model."""
+
+    STATE = ("ticker_model", "group_model")
+
+    def __init__(self):
+        self.ticker_model = {}  # ticker -> model -> counters
+        self.group_model = {}   # group -> model -> counters
+
+    def add_day(self, date_str, results, calls):
+        for r in results:
+            model = r["model_display_name"]
+            d = self.ticker_model.setdefault(r["ticker"], {}).setdefault(
+                model, {"predictions": 0, "correct": 0, "total_score": 0.0, "total_conf": 0.0}
+            )
+            d["predictions"] += 1
+            d["correct"] += int(r["direction_correct"])
+            d["total_score"] += r["score"]
+            d["total_conf"] += r["confidence_at_prediction"]
+
+            g = self.group_model.setdefault(ticker_group(r["ticker"]), {}).setdefault(
+                model, {"predictions": 0, "correct": 0, "total_score": 0.0}
+            )
+            g["predictions"] += 1
+            g["correct"] += int(r["direction_correct"])
+            g["total_score"] += r["score"]
+
+    def result(self):
+        by_ticker = []
+        for ticker, per_model in sorted(self.ticker_model.items()):
+            if sum(d["predictions"] for d in per_model.values()) < MIN_TICKER_PREDICTIONS:
                 continue
-            actual_acc = b["correct"] / b["predictions"]
-            buckets.append({
-                "confidence_range": label,
-                "confidence_midpoint": midpoint,
-                "predictions": b["predictions"],
-                "correct": b["correct"],
-                "actual_accuracy": round(actual_acc, 4),
+            by_ticker.append({
+                "ticker": ticker,
+                "group": ticker_group(ticker),
+                "models": [
+                    {
+                        "model": model,
+                        "predictions": d["predictions"],
+                        "correct": d["correct"],
+                        "accuracy": round(d["correct"] / d["predictions"], 4) if d["predictions"] else 0,
+                        "total_score": round(d["total_score"], 2),
+                        "avg_confidence": round(d["total_conf"] / d["predictions"], 4) if d["predictions"] else 0,
+                    }
+                    for model, d in sorted(per_model.items())
+                ],
             })
-            errors.append(abs(midpoint - actual_acc))
 
-        cal_error = round(sum(errors) / len(errors), 4) if errors else 0
-        models_out.append({
-            "model": model,
-            "calibration_error": cal_error,
-            "buckets": buckets,
-        })
+        by_group = [
+            {
+                "group": group,
+                "models": [
+                    {
+                        "model": model,
+                        "predictions": d["predictions"],
+                        "correct": d["correct"],
+                        "accuracy": round(d["correct"] / d["predictions"], 4) if d["predictions"] else 0,
+                        "total_score": round(d["total_score"], 2),
+                    }
+                    for model, d in sorted(per_model.items())
+                ],
+            }
+            for group, per_model in sorted(self.group_model.items())
+        ]
 
-    return {"models": models_out}
+        return {"by_ticker": by_ticker, "by_group": by_group}
 
 
-def compute_herding(results):
-    """Model agreement / herding analysis."""
-    # Group predictions by (date, ticker)
-    date_ticker = defaultdict(list)
-    for r in results:
-        date_ticker[(r["date"], r["ticker"])].append(r)
-
-    total_overlaps = 0
-    unanimous_count = 0
-    unanimous_correct = 0
-    split_count = 0
-    contrarian_wins = 0
-    daily_data = defaultdict(lambda: {"overlaps": 0, "unanimous": 0})
-
-    for (date, ticker), preds in date_ticker.items():
-        if len(preds) < 2:
-            continue
-        total_overlaps += 1
-        daily_data[date]["overlaps"] += 1
-
-        directions = [p["predicted_direction"] for p in preds]
-        if len(set(directions)) == 1:
-            unanimous_count += 1
-            daily_data[date]["unanimous"] += 1
-            # Check if the unanimous call was correct
-            if preds[0]["direction_correct"]:
-                unanimous_correct += 1
-        else:
-            split_count += 1
-            # Contrarian win: minority direction was correct
-            from collections import Counter
-            dir_counts = Counter(directions)
-            minority_dir = dir_counts.most_common()[-1][0]
-            for p in preds:
-                if p["predicted_direction"] == minority_dir and p["direction_correct"]:
-                    contrarian_wins += 1
+class Calibration(Aggregator):
+    """Confidence calibration buckets per model."""
+
+    STATE = ("model_buckets",)
+
+    def __init__(self):
+        self.model_buckets = {}  # model -> bucket label -> counters
+
+    def add_day(self, date_str, results, calls):
+        for r in results:
+            conf = r["confidence_at_prediction"]
+            for label, lo, hi, _ in CALIBRATION_BUCKETS:
+                if lo <= conf < hi:
+                    b = self.model_buckets.setdefault(r["model_display_name"], {}).setdefault(
+                        label, {"predictions": 0, "correct": 0}
+                    )
+                    b["predictions"] += 1
+                    b["correct"] += int(r["direction_correct"])
                     break
 
-    herding_rate = round(unanimous_count / total_overlaps, 4) if total_overlaps else 0
-    unan_acc = round(unanimous_correct / unanimous_count, 4) if unanimous_count else 0
-
-    daily_herding = []
-    for date in sorted(daily_data.keys()):
-        d = daily_data[date]
-        daily_herding.append({
-            "date": date,
-            "overlaps": d["overlaps"],
-            "unanimous": d["unanimous"],
-            "herding_rate": round(d["unanimous"] / d["overlaps"], 4) if d["overlaps"] else 0,
-        })
+    def result(self):
+        models_out = []
+        for model in sorted(self.model_buckets):
+            buckets = []
+            errors = []
+            for label, _, _, midpoint in CALIBRATION_BUCKETS:
+                b = self.model_buckets[model].get(label)
+                if not b or b["predictions"] == 0:
+                    continue
+                actual_acc = b["correct"] / b["predictions"]
+                buckets.append({
+                    "confidence_range": label,
+                    "confidence_midpoint": midpoint,
+                    "predictions": b["predictions"],
+                    "correct": b["correct"],
+                    "actual_accuracy": round(actual_acc, 4),
+                })
+                errors.append(abs(midpoint - actual_acc))
+
+            cal_error = round(sum(errors) / len(errors), 4) if errors else 0
+            models_out.append({
+                "model": model,
+                "calibration_error": cal_error,
+                "buckets": buckets,
+            })
 
-    return {
-        "summary": {
-            "total_overlaps": total_overlaps,
-            "unanimous": unanimous_count,
-            "split": split_count,
-            "herding_rate": herding_rate,
-            "unanimous_correct": unanimous_correct,
-            "unanimous_accuracy": unan_acc,
-            "contrarian_wins": contrarian_wins,
-        },
-        "daily_herding": daily_herding,
-    }
+        return {"models": models_out}
 
 
-def compute_time_series(results):
-    """Daily scores and rolling accuracy per model."""
-    # Daily aggregation
-    daily_model = defaultdict(lambda: defaultdict(lambda: {"score": 0.0, "correct": 0, "predictions": 0}))
-    for r in results:
-        d = daily_model[r["date"]][r["model_display_name"]]
-        d["score"] += r["score"]
-        d["correct"] += int(r["direction_correct"])
-        d["predictions"] += 1
-
-    dates = sorted(daily_model.keys())
-    all_models = sorted({r["model_display_name"] for r in results})
-
-    # Build cumulative scores
-    cumulative = {m: 0.0 for m in all_models}
-    daily = []
-    for date in dates:
-        entry = {"date": date}
-        for m in all_models:
-            d = daily_model[date].get(m, {"score": 0, "correct": 0, "predictions": 0})
-            cumulative[m] += d["score"]
-            acc = round(d["correct"] / d["predictions"], 4) if d["predictions"] else None
-            entry[m] = {
-                "daily_score": round(d["score"], 2),
-                "cumulative_score": round(cumulative[m], 2),
-                "accuracy": acc,
-                "predictions": d["predictions"],
-            }
-        daily.append(entry)
+class Herding(Aggregator):
+    """Model agreement / herding analysis."""
+
+    STATE = ("summary", "daily")
+
+    def __init__(self):
+        self.summary = {
+            "total_overlaps": 0,
+            "unanimous": 0,
+            "split": 0,
+            "unanimous_correct": 0,
+            "contrarian_wins": 0,
+        }
+        self.daily = {}  # date -> {"overlaps", "unanimous"}
+
+    def add_day(self, date_str, results, calls):
+        s = self.summary
+        for preds in calls.values():
+            if len(preds) < 2:
+                continue
+            s["total_overlaps"] += 1
+            day = self.daily.setdefault(date_str, {"overlaps": 0, "unanimous": 0})
+            day["overlaps"] += 1
+
+            directions = [p["predicted_direction"] for p in preds]
+            if len(set(directions)) == 1:
+                s["unanimous"] += 1
+                day["unanimous"] += 1
+                # Check if the unanimous call was correct
+                if preds[0]["direction_correct"]:
+                    s["unanimous_correct"] += 1
+            else:
+                s["split"] += 1
+                # Contrarian win: minority direction was correct
+                minority_dir = Counter(directions).most_common()[-1][0]
+                for p in preds:
+                    if p["predicted_direction"] == minority_dir and p["direction_correct"]:
+                        s["contrarian_wins"] += 1
+                        break
+
+    def result(self):
+        s = self.summary
+        total_overlaps = s["total_overlaps"]
+        unanimous_count = s["unanimous"]
+
+        daily_herding = []
+        for date in sorted(self.daily):
+            d = self.daily[date]
+            daily_herding.append({
+                "date": date,
+                "overlaps": d["overlaps"],
+                "unanimous": d["unanimous"],
+                "herding_rate": round(d["unanimous"] / d["overlaps"], 4) if d["overlaps"] else 0,
+            })
 
-    # 5-day rolling accuracy
-    rolling = []
+        return {
+            "summary": {
+                "total_overlaps": total_overlaps,
+                "unanimous": unanimous_count,
+                "split": s["split"],
+                "herding_rate": round(unanimous_count / total_overlaps, 4) if total_overlaps else 0,
+                "unanimous_correct": s["unanimous_correct"],
+                "unanimous_accuracy": round(s["unanimous_correct"] / unanimous_count, 4) if unanimous_count else 0,
+                "contrarian_wins": s["contrarian_wins"],
+            },
+            "daily_herding": daily_herding,
+        }
+
+
+class TimeSeries(Aggregator):
+    """Daily scores plus rolling-window and exponentially weighted accuracy per model."""
+
+    STATE = ("daily_model",)
+
+    def __init__(self):
+        self.daily_model = {}  # date -> model -> {"score", "correct", "predictions"}
+
+    def add_day(self, date_str, results, calls):
+        day = self.daily_model.setdefault(date_str, {})
+        for r in results:
+            d = day.setdefault(r["model_display_name"], {"score": 0.0, "correct": 0, "predictions": 0})
+            d["score"] += r["score"]
+            d["correct"] += int(r["direction_correct"])
+            d["predictions"] += 1
+
+    def result(self):
+        dates = sorted(self.daily_model)
+        all_models = sorted({m for day in self.daily_model.values() for m in day})
+        empty = {"score": 0, "correct": 0, "predictions": 0}
+
+        # Build cumulative scores
+        cumulative = {m: 0.0 for m in all_models}
+        daily = []
+        for date in dates:
+            entry = {"date": date}
+            for m in all_models:
+                d = self.daily_model[date].get(m, empty)
+                cumulative[m] += d["score"]
+                acc = round(d["correct"] / d["predictions"], 4) if d["predictions"] else None
+                entry[m] = {
+                    "daily_score": round(d["score"], 2),
+                    "cumulative_score": round(cumulative[m], 2),
+                    "accuracy": acc,
+                    "predictions": d["predictions"],
+                }
+            daily.append(entry)
+
+        # Dense (date x model) count matrices; windows are differences of prefix sums
+        correct = np.array(
+            [[self.daily_model[d].get(m, empty)["correct"] for m in all_models] for d in dates],
+            dtype=np.int64,
+        ).reshape(len(dates), len(all_models))
+        predictions = np.array(
+            [[self.daily_model[d].get(m, empty)["predictions"] for m in all_models] for d in dates],
+            dtype=np.int64,
+        ).reshape(len(dates), len(all_models))
+
+        windows = {
+            str(w): _accuracy_rows(dates, all_models, *_window_sums(correct, predictions, w))
+            for w in ROLLING_WINDOWS
+        }
+        ewm = _accuracy_rows(dates, all_models, *_ewm_sums(correct, predictions, EWM_SPAN))
+
+        return {
+            "daily": daily,
+            "rolling_accuracy": windows["5"],
+            "rolling_windows": windows,
+            "ewm_accuracy": ewm,
+            "ewm_span": EWM_SPAN,
+        }
+
+
+def _window_sums(correct, predictions, window):
+    """Trailing *window*-day sums per column, via prefix sums (O(days x models))."""
+    sums = []
+    for counts in (correct, predictions):
+        cs = np.vstack([np.zeros((1, counts.shape[1]), dtype=counts.dtype), np.cumsum(counts, axis=0)])
+        starts = np.maximum(np.arange(1, len(counts) + 1) - window, 0)
+        sums.append(cs[1:] - cs[starts])
+    return sums
+
+
+def _ewm_sums(correct, predictions, span):
+    """Exponentially weighted correct/prediction totals (alpha = 2 / (span + 1))."""
+    alpha = 2.0 / (span + 1)
+    c_out = np.zeros(correct.shape)
+    p_out = np.zeros(predictions.shape)
+    c = np.zeros(correct.shape[1])
+    p = np.zeros(predictions.shape[1])
+    for i in range(len(correct)):
+        c = (1 - alpha) * c + alpha * correct[i]
+        p = (1 - alpha) * p + alpha * predictions[i]
+        c_out[i], p_out[i] = c, p
+    return c_out, p_out
+
+
+def _accuracy_rows(dates, models, correct, predictions):
+    """[{date, <model>: accuracy or None}] from aligned correct/prediction matrices."""
+    rows = []
     for i, date in enumerate(dates):
-        window_start = max(0, i - 4)
         entry = {"date": date}
-        for m in all_models:
-            total_c = 0
-            total_p = 0
-            for j in range(window_start, i + 1):
-                d_date = dates[j]
-                d = daily_model[d_date].get(m, {"correct": 0, "predictions": 0})
-                total_c += d["correct"]
-                total_p += d["predictions"]
-            entry[m] = round(total_c / total_p, 4) if total_p else None
-        rolling.append(entry)
+        for j, m in enumerate(models):
+            p = predictions[i, j]
+            entry[m] = round(correct[i, j].item() / p.item(), 4) if p > 0 else None
+        rows.append(entry)
+    return rows
+
+
+class HeadToHead(Aggregator):
+    """Pairwise model comparison on same-ticker, same-day, same-horizon calls."""
+
+    STATE = ("pair_records", "recent_clashes")
+
+    def __init__(self):
+        self.pair_records = {}    # model_a -> model_b -> tallies (model_a < model_b)
+        self.recent_clashes = []  # last RECENT_CLASHES decisive clashes
+
+    def add_day(self, date_str, results, calls):
+        for key in sorted(calls):
+            ticker = key[0]
+            # Last result wins if a model somehow made the same call twice
+            by_model = {r["model_display_name"]: r for r in calls[key]}
+            for a, b in combinations(sorted(by_model), 2):
+                ra, rb = by_model[a], by_model[b]
+                rec = self.pair_records.setdefault(a, {}).setdefault(
+                    b, {"matchups": 0, "a_wins": 0, "b_wins": 0, "ties": 0}
+                )
+                rec["matchups"] += 1
+                a_correct = ra["direction_correct"]
+                b_correct = rb["direction_correct"]
+
+                if a_correct and not b_correct:
+                    rec["a_wins"] += 1
+                    winner = a
+                elif b_correct and not a_correct:
+                    rec["b_wins"] += 1
+                    winner = b
+                else:
+                    rec["ties"] += 1
+                    continue
+
+                self.recent_clashes.append({
+                    "date": date_str,
+                    "ticker": ticker,
+                    "model_a": a,
+                    "model_a_direction": ra["predicted_direction"],
+                    "model_a_correct": a_correct,
+                    "model_b": b,
+                    "model_b_direction": rb["predicted_direction"],
+                    "model_b_correct": b_correct,
+                    "winner": winner,
+                })
+        del self.recent_clashes[:-RECENT_CLASHES]
+
+    def result(self):
+        records = []
+        for a in sorted(self.pair_records):
+            for b, rec in sorted(self.pair_records[a].items()):
+                decided = rec["a_wins"] + rec["b_wins"]
+                records.append({
+                    "model_a": a,
+                    "model_b": b,
+                    "matchups": rec["matchups"],
+                    "a_wins": rec["a_wins"],
+                    "b_wins": rec["b_wins"],
+                    "ties": rec["ties"],
+                    "a_win_rate": round(rec["a_wins"] / decided, 4) if decided else 0.5,
+                })
+
+        # Only the last clashes where there was a decisive winner
+        return {"records": records, "recent_clashes": list(self.recent_clashes)}
+
+
+class AnalyticsEngine:
+    """Feeds each scoring day to every aggregator exactly once."""
+
+    SECTIONS = {
+        "ticker_breakdown": TickerBreakdown,
+        "calibration": Calibration,
+        "herding": Herding,
+        "time_series": TimeSeries,
+        "head_to_head": HeadToHead,
+    }
 
-    return {"daily": daily, "rolling_accuracy": rolling}
+    def __init__(self):
+        self.dates = []
+        self.total_predictions = 0
+        self.aggregators = {name: cls() for name, cls in self.SECTIONS.items()}
+
+    def add_day(self, date_str, results):
+        if not results:
+            return
+        self.dates.append(date_str)
+        self.total_predictions += len(results)
+        calls = group_calls(results)
+        for agg in self.aggregators.values():
+            agg.add_day(date_str, results, calls)
+
+    def to_state(self) -> dict:
+        return {
+            "dates": self.dates,
+            "total_predictions": self.total_predictions,
+            "aggregators": {name: agg.to_state() for name, agg in self.aggregators.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        engine = cls()
+        engine.dates = state["dates"]
+        engine.total_predictions = state["total_predictions"]
+        engine.aggregators = {
+            name: agg_cls.from_state(state["aggregators"][name])
+            for name, agg_cls in cls.SECTIONS.items()
+        }
+        return engine
+
+    def build(self) -> dict:
+        dates = sorted(self.dates)
+        analytics = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "data_range": {
+                "first_date": dates[0],
+                "last_date": dates[-1],
+                "scoring_days": len(dates),
+                "total_predictions": self.total_predictions,
+            },
+        }
+        for name, agg in self.aggregators.items():
+            analytics[name] = agg.result()
+        return analytics
+
+
+def _feed(aggregator, results):
+    """Run one aggregator over a flat result list (for the compute_* helpers)."""
+    days = defaultdict(list)
+    for r in results:
+        days[r["date"]].append(r)
+    for date_str in sorted(days):
+        aggregator.add_day(date_str, days[date_str], group_calls(days[date_str]))
+    return aggregator.result()
 
 
-def compute_head_to_head(results):
-    """Pairwise model comparison on same-ticker same-day predictions."""
-    # Index by (date, ticker, model)
-    lookup = {}
-    for r in results:
-        lookup[(r["date"], r["ticker"], r["model_display_name"])] = r
+def compute_ticker_breakdown(results):
+    return _feed(TickerBreakdown(), results)
 
-    # Group by (date, ticker) to find overlapping models
-    date_ticker_models = defaultdict(set)
-    for r in results:
-        date_ticker_models[(r["date"], r["ticker"])].add(r["model_display_name"])
-
-    # Pairwise records
-    pair_records = defaultdict(lambda: {"matchups": 0, "a_wins": 0, "b_wins": 0, "ties": 0})
-    recent_clashes = []
-
-    all_models = sorted({r["model_display_name"] for r in results})
-    pairs = list(combinations(all_models, 2))
-
-    for (date, ticker), models in sorted(date_ticker_models.items()):
-        models_list = sorted(models)
-        for a, b in combinations(models_list, 2):
-            key = (a, b) if a < b else (b, a)
-            ra = lookup.get((date, ticker, a))
-            rb = lookup.get((date, ticker, b))
-            if not ra or not rb:
-                continue
 
-            rec = pair_records[key]
-            rec["matchups"] += 1
-            a_correct = ra["direction_correct"]
-            b_correct = rb["direction_correct"]
-
-            winner = None
-            if a_correct and not b_correct:
-                rec["a_wins"] += 1
-                winner = a
-            elif b_correct and not a_correct:
-                rec["b_wins"] += 1
-                winner = b
-            else:
-                rec["ties"] += 1
-                winner = "Tie"
+def compute_calibration(results):
+    return _feed(Calibration(), results)
 
-            recent_clashes.append({
-                "date": date,
-                "ticker": ticker,
-                "model_a": key[0],
-                "model_a_direction": ra["predicted_direction"],
-                "model_a_correct": a_correct,
-                "model_b": key[1],
-                "model_b_direction": rb["predicted_direction"],
-                "model_b_correct": b_correct,
-                "winner": winner,
-            })
 
-    records = []
-    for (a, b), rec in sorted(pair_records.items()):
-        records.append({
-            "model_a": a,
-            "model_b": b,
-            "matchups": rec["matchups"],
-            "a_wins": rec["a_wins"],
-            "b_wins": rec["b_wins"],
-            "ties": rec["ties"],
-            "a_win_rate": round(rec["a_wins"] / (rec["a_wins"] + rec["b_wins"]), 4) if (rec["a_wins"] + rec["b_wins"]) else 0.5,
+def compute_herding(results):
+    return _feed(Herding(), results)
+
+
+def compute_time_series(results):
+    return _feed(TimeSeries(), results)
+
+
+def compute_head_to_head(results):
+    return _feed(HeadToHead(), results)
+
+
+# ── Incremental runs ───────────────────────────────────────────────────────────
+# Same checkpoint scheme as the leaderboard: engine state as of the second-newest
+# score file plus a content hash per covered file. Any change to a covered file
+# discards the checkpoint and replays everything.
+
+def _load_checkpoint(hashes: dict):
+    """Return (engine, through) from the checkpoint, or None if it is unusable."""
+    if not ANALYTICS_STATE_FILE.exists():
+        return None
+    try:
+        state = load_json(ANALYTICS_STATE_FILE)
+    except Exception as e:
+        log.warning(f"Could not read analytics checkpoint, recomputing: {e}")
+        return None
+    if state.get("version") != ANALYTICS_STATE_VERSION:
+        log.info("Analytics checkpoint format changed — recomputing")
+        return None
+    covered = {stem: h for stem, h in hashes.items() if stem <= state["through"]}
+    if covered != state["files"]:
+        log.info(f"Score files on or before {state['through']} changed — recomputing analytics")
+        return None
+    return AnalyticsEngine.from_state(state["engine"]), state["through"]
+
+
+def build_analytics(full: bool = False):
+    """Fold score files into an engine, checkpointing all but the newest day.
+
+    Returns (engine, number of score files applied).
+    """
+    archive = results_archive.load()
+    hashes = archive.files
+    checkpoint = None if full else _load_checkpoint(hashes)
+    if checkpoint:
+        engine, through = checkpoint
+    else:
+        engine, through = AnalyticsEngine(), ""
+    new_days = [stem for stem in sorted(hashes) if stem > through]
+
+    for stem in new_days[:-1]:
+        engine.add_day(*load_score_day(archive, stem))
+    if len(new_days) > 1:
+        through = new_days[-2]
+    if hashes:
+        save_json(ANALYTICS_STATE_FILE, {
+            "version": ANALYTICS_STATE_VERSION,
+            "through": through,
+            "files": {stem: h for stem, h in hashes.items() if stem <= through},
+            "engine": engine.to_state(),
         })
+    for stem in new_days[-1:]:
+        engine.add_day(*load_score_day(archive, stem))
+    return engine, len(new_days)
 
-    # Only keep last 15 clashes where there was a decisive winner
-    decisive = [c for c in recent_clashes if c["winner"] != "Tie"]
-    decisive = decisive[-15:]
 
-    return {"records": records, "recent_clashes": decisive}
+def _without_timestamp(analytics: dict) -> dict:
+    out = copy.copy(analytics)
+    out.pop("generated_at", None)
+    return out
 
 
-def main():
+def run(full: bool = False, check: bool = False) -> bool:
+    """Write analytics.json. Returns False if *check* found incremental drift."""
     log.info("Loading scored predictions...")
-    results = load_all_scores()
+    engine, applied = build_analytics(full=full)
 
-    if not results:
+    if not engine.dates:
         log.warning("No scored predictions found. Exiting.")
-        return
-
-    dates = sorted({r["date"] for r in results})
-    log.info(f"Found {len(results)} predictions across {len(dates)} days")
-
-    analytics = {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "data_range": {
-            "first_date": dates[0],
-            "last_date": dates[-1],
-            "scoring_days": len(dates),
-            "total_predictions": len(results),
-        },
-        "ticker_breakdown": compute_ticker_breakdown(results),
-        "calibration": compute_calibration(results),
-        "herding": compute_herding(results),
-        "time_series": compute_time_series(results),
-        "head_to_head": compute_head_to_head(results),
-    }
+        return True
+
+    log.info(
+        f"Found {engine.total_predictions} predictions across {len(engine.dates)} days "
+        f"({applied} score file(s) applied)"
+    )
+    analytics = engine.build()
+
+    consistent = True
+    if check and not full:
+        full_analytics = build_analytics(full=True)[0].build()
+        if _without_timestamp(full_analytics) != _without_timestamp(analytics):
+            # Publish the full recompute (which also reset the checkpoint) and fail loudly
+            log.error("Incremental analytics differ from a full recompute — writing the full result")
+            analytics = full_analytics
+            consistent = False
+        else:
+            log.info("Consistency check passed: incremental analytics match a full recompute")
+
+    save_json(ANALYTICS_FILE, analytics)
+    sync_to_public(ANALYTICS_FILE)
+    log.info(f"Analytics written to {ANALYTICS_FILE}")
+    return consistent
 
-    out_path = DATA_DIR / "analytics.json"
-    save_json(out_path, analytics)
-    sync_to_public(out_path)
-    log.info(f"Analytics written to {out_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute performance analytics")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the checkpoint and recompute from every score file",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Also recompute from scratch and fail if the incremental result differs",
+    )
+    args = parser.parse_args()
+    if not run(full=args.full, check=args.check):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """
-One-shot: rewrite simulator.json entry/exit prices using real yfinance data.
+One-shot: re-source simulator entry/exit prices from real yfinance data.
 
-For each trade in data/simulator.json:
+For each recorded trade:
   - entry_price ← regular-session Open on trade date (yfinance)
   - exit_price  ← regular-session Close on trade date (yfinance)
   - shares recomputed from the running balance at trade time and the new entry
@@ -9,90 +9,165 @@ For each trade in data/simulator.json:
   - final balance recomputed from starting_balance + cumulative pnl
 
 Open trades keep exit_price/pnl null; only their entry is refreshed.
-
-Usage: python scripts/backfill_simulator.py
+Corrections are appended to the simulator ledger as trade_revised events,
+followed by one balance_adjusted event for the recomputed balance.
+
+Prices are resolved in bulk: every (ticker, date) pair goes through one
+market_data.resolve_prices call per field, so each ticker's full date span
+is filled into the price store once. Pairs the store can't answer fall back
+to the per-trade getters. --dry-run prints the trades that would change and
+records nothing.
+
+Usage:
+    python scripts/backfill_simulator.py
+    python scripts/backfill_simulator.py --dry-run
 """
 
+import argparse
 import sys
 from datetime import date as date_cls
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils import get_logger, load_json, save_json, sync_to_public, DATA_DIR
-from market_data import get_open_price, get_closing_price
+from utils import get_logger
+from market_data import CLOSE_LOOKBACK_DAYS, get_closing_price, get_open_price, resolve_prices
+from winner import adjust_balance, load_simulator, revise_trade, simulator_transaction
 
 log = get_logger("backfill_simulator")
-SIMULATOR_FILE = DATA_DIR / "simulator.json"
-
-
-def main():
-    sim = load_json(SIMULATOR_FILE)
-    starting_balance = sim.get("starting_balance", 25000)
-    balance = starting_balance
-
-    for trade in sim.get("trades", []):
-        ticker = trade["ticker"]
-        trade_date = date_cls.fromisoformat(trade["date"])
-        direction = trade["direction"]
-        status = trade.get("status", "OPEN")
-
-        old_entry = trade.get("entry_price")
-        new_entry = get_open_price(ticker, trade_date)
-        if new_entry is None or new_entry <= 0:
-            log.error(f"Could not fetch open price for {ticker} on {trade_date}; keeping old entry {old_entry}")
-            new_entry = old_entry
-
-        if new_entry is None or new_entry <= 0:
-            log.error(f"No usable entry price for {ticker} on {trade_date}; skipping trade")
-            continue
 
-        # Size position from current running balance (consistent with open_trade logic).
-        shares = int(balance / new_entry)
-        if shares <= 0:
-            log.warning(f"Insufficient balance ${balance:.2f} to buy {ticker} @ ${new_entry:.2f}")
-            trade["entry_price"] = new_entry
+DIFF_FIELDS = ("entry_price", "exit_price", "shares", "pnl", "pnl_pct")
+
+
+# ── Prices ─────────────────────────────────────────────────────────────────────
+def _resolve(pairs: list[tuple], field: str, lookback_days: int, fallback) -> np.ndarray:
+    """One bulk lookup for *field* at each (ticker, date); NaN where unavailable."""
+    bars = resolve_prices([(t, d, field) for t, d in pairs], lookback_days)
+    values = np.array([np.nan if b["value"] is None else round(b["value"], 2) for b in bars])
+    for i in np.flatnonzero(np.isnan(values)):
+        ticker, trade_date = pairs[i]
+        log.warning(f"{ticker} {field.lower()} on {trade_date} not in the price store — fetching directly")
+        price = fallback(ticker, trade_date)
+        if price is not None:
+            values[i] = price
+    return values
+
+
+def resolve_trade_prices(trades: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """Session open and close for every trade (NaN if unavailable); closes only for closed trades."""
+    pairs = [(t["ticker"], date_cls.fromisoformat(t["date"])) for t in trades]
+    opens = _resolve(pairs, "Open", 0, get_open_price)
+    closed = [i for i, t in enumerate(trades) if t.get("status", "OPEN") == "CLOSED"]
+    closes = np.full(len(trades), np.nan)
+    if closed:
+        closes[closed] = _resolve([pairs[i] for i in closed], "Close", CLOSE_LOOKBACK_DAYS, get_closing_price)
+    return opens, closes
+
+
+# ── Recompute ──────────────────────────────────────────────────────────────────
+def _old(trades: list[dict], key: str) -> np.ndarray:
+    return np.array([np.nan if t.get(key) is None else t[key] for t in trades], dtype=float)
+
+
+def recompute(trades: list[dict], opens: np.ndarray, closes: np.ndarray,
+              starting_balance: float) -> tuple[list[dict], float]:
+    """Per-trade field updates and the resulting final balance.
+
+    Missing prices keep the trade's recorded ones. Share sizing depends on
+    the running balance, so that is one pass over the arrays; P&L follows
+    from it vectorized.
+    """
+    n = len(trades)
+    entry = np.where(opens > 0, opens, _old(trades, "entry_price"))
+    exit_ = np.where(closes > 0, closes, _old(trades, "exit_price"))
+    usable = entry > 0
+    closed = np.array([t.get("status", "OPEN") == "CLOSED" for t in trades], dtype=bool)
+    books = closed & ~np.isnan(exit_)
+    sign = np.array([1.0 if t["direction"] == "up" else -1.0 for t in trades])
+
+    shares = np.zeros(n)
+    pnl = np.zeros(n)
+    balance = float(starting_balance)
+    for i in np.flatnonzero(usable):
+        shares[i] = int(balance / entry[i])
+        if shares[i] > 0 and books[i]:
+            pnl[i] = sign[i] * (exit_[i] - entry[i]) * shares[i]
+            balance = round(balance + pnl[i], 2)
+
+    cost = entry * shares
+    pnl_pct = np.divide(pnl * 100, cost, out=np.zeros(n), where=cost != 0)
+
+    updates = []
+    for i, trade in enumerate(trades):
+        if not usable[i]:
+            log.error(f"No usable entry price for {trade['ticker']} on {trade['date']}; skipping trade")
+            updates.append({})
             continue
-
-        trade["entry_price"] = new_entry
-        trade["shares"] = shares
-
-        if status == "CLOSED":
-            new_exit = get_closing_price(ticker, trade_date)
-            if new_exit is None or new_exit <= 0:
-                log.error(f"Could not fetch close for {ticker} on {trade_date}; keeping old exit")
-                new_exit = trade.get("exit_price")
-            if new_exit is None:
-                log.error(f"No exit price for {ticker} — skipping P&L recompute")
-                continue
-
-            if direction == "up":
-                pnl = (new_exit - new_entry) * shares
-            else:
-                pnl = (new_entry - new_exit) * shares
-
-            pnl_pct = (pnl / (new_entry * shares)) * 100 if new_entry * shares else 0
-
-            trade["exit_price"] = new_exit
-            trade["pnl"] = round(pnl, 2)
-            trade["pnl_pct"] = round(pnl_pct, 2)
-            balance = round(balance + pnl, 2)
-
-            log.info(
-                f"{trade_date} {direction.upper()} {shares} {ticker} "
-                f"${new_entry:.2f} → ${new_exit:.2f}  P&L ${pnl:+.2f} ({pnl_pct:+.2f}%)  balance=${balance:.2f}"
+        changes = {"entry_price": float(entry[i])}
+        if shares[i] <= 0:
+            log.warning(f"Insufficient balance to buy {trade['ticker']} @ ${entry[i]:.2f}")
+        elif books[i]:
+            changes.update(
+                shares=int(shares[i]), exit_price=float(exit_[i]),
+                pnl=round(float(pnl[i]), 2), pnl_pct=round(float(pnl_pct[i]), 2),
             )
+        elif closed[i]:
+            log.error(f"No exit price for {trade['ticker']} — skipping P&L recompute")
+            changes["shares"] = int(shares[i])
         else:
-            # OPEN trade — refresh entry only, keep pnl null
-            trade["exit_price"] = None
-            trade["pnl"] = None
-            trade["pnl_pct"] = None
-            log.info(f"{trade_date} OPEN {direction.upper()} {shares} {ticker} @ ${new_entry:.2f}")
-
-    sim["balance"] = balance
-    save_json(SIMULATOR_FILE, sim)
-    sync_to_public(SIMULATOR_FILE)
+            changes.update(shares=int(shares[i]), exit_price=None, pnl=None, pnl_pct=None)
+        updates.append(changes)
+    return updates, balance
+
+
+def diff(trades: list[dict], updates: list[dict]) -> list[dict]:
+    """Trades whose recorded fields would change, with old → new values."""
+    rows = []
+    for i, (trade, changes) in enumerate(zip(trades, updates)):
+        fields = {k: (trade.get(k), v) for k, v in changes.items() if trade.get(k) != v}
+        if fields:
+            rows.append({"index": i, "date": trade["date"], "ticker": trade["ticker"], "fields": fields})
+    return rows
+
+
+def log_diff(rows: list[dict], old_balance: float, new_balance: float):
+    for row in rows:
+        changed = "  ".join(
+            f"{k} {old} → {new}" for k, (old, new) in sorted(row["fields"].items(), key=lambda kv: DIFF_FIELDS.index(kv[0]))
+        )
+        log.info(f"#{row['index']:<3} {row['date']} {row['ticker']:<5} {changed}")
+    log.info(f"{len(rows)} trades change; balance ${old_balance:,.2f} → ${new_balance:,.2f}")
+
+
+def backfill(sim: dict, dry_run: bool = False) -> list[dict]:
+    """Re-source every trade's prices; record the corrections unless *dry_run*."""
+    trades = sim.get("trades", [])
+    opens, closes = resolve_trade_prices(trades)
+    updates, balance = recompute(trades, opens, closes, sim.get("starting_balance", 25000))
+    rows = diff(trades, updates)
+    log_diff(rows, sim["balance"], balance)
+    if dry_run:
+        return rows
+
+    for row in rows:
+        revise_trade(sim, row["index"], updates[row["index"]])
+    adjust_balance(sim, balance, "backfill: re-sourced prices")
     log.info(f"Backfill complete. Final balance: ${balance:.2f}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-source simulator trade prices from yfinance")
+    parser.add_argument("--dry-run", action="store_true", help="Show which trades would change; record nothing")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        backfill(load_simulator(), dry_run=True)  # no lock, no export
+        return
+    with simulator_transaction() as sim:
+        backfill(sim)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,314 @@
+"""
+Backtest the consensus-winner paper-trading strategy over every prediction day.
+
+Replays winner.select_todays_winner for any combination of selection
+parameters (minimum agreeing models, the ETF threshold, the leverage map and
+the ranking score) and trades each day's pick the way the live simulator does:
+buy ``int(balance / open)`` shares at the session open, exit at the close.
+
+Everything is precomputed once into arrays — one row per (day, ticker,
+direction) consensus group, plus a (ticker x day) open/close matrix read from
+the local price store — so a config is a handful of masks, one per-day argmax
+and a day loop that is vectorized across configs. Hundreds of configs run in
+well under a second. With a warm data/prices/ store no network is needed;
+--offline never downloads.
+
+Usage:
+    python backtest.py                                  # live parameters
+    python backtest.py --min-models 2 3 4 --etf-min-models 3 4 5 \\
+        --leverage 3x none --ranker all                 # grid, ranked
+"""
+
+import argparse
+import itertools
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import prediction_index
+from score import round_like_builtin
+from utils import get_logger, save_json, DATA_DIR
+from winner import (
+    DEFAULT_SIMULATOR,
+    ETF_LEVERAGE_MAP,
+    ETF_MIN_MODELS,
+    EXCLUDED_TICKERS,
+    MIN_MODELS_AGREEING,
+)
+
+log = get_logger("backtest")
+
+BACKTEST_FILE = DATA_DIR / "backtest.json"
+STARTING_BALANCE = DEFAULT_SIMULATOR["starting_balance"]
+
+LEVERAGE_MAPS = {
+    "3x": ETF_LEVERAGE_MAP,
+    "none": {},
+}
+
+# Ranking scores over candidate arrays; "conviction_move" is the live rule.
+RANKERS = {
+    "conviction_move": lambda c: c["avg_confidence"] * c["expected_move_pct"],
+    "confidence": lambda c: c["avg_confidence"],
+    "expected_move": lambda c: c["expected_move_pct"],
+    "agreement": lambda c: c["model_count"] * c["avg_confidence"],
+}
+
+LIVE_PARAMS = {
+    "min_models": MIN_MODELS_AGREEING,
+    "etf_min_models": ETF_MIN_MODELS,
+    "leverage": "3x",
+    "ranker": "conviction_move",
+}
+
+
+# ── Inputs ─────────────────────────────────────────────────────────────────────
+def load_candidates() -> dict:
+    """Every (day, ticker, direction) group of usable picks, as aligned arrays.
+
+    Groups keep select_todays_winner's first-appearance order within a day,
+    so argmax ties break the same way ``max()`` does there. Excluded tickers
+    are kept (flagged) so configs can vary the exclusion list.
+    """
+    groups = {}  # (date, ticker, direction) -> [models, conf_sum, target_sum, entry_sum]
+    for row in prediction_index.query():
+        pred = row["prediction"]
+        ticker = pred.get("ticker", "")
+        target = pred.get("target_price")
+        entry = pred.get("current_price_at_prediction")
+        confidence = pred.get("confidence")
+        if ticker.endswith("-USD") or target is None or entry is None or confidence is None:
+            continue
+        g = groups.setdefault((row["date"], ticker, pred.get("direction")), [0, 0.0, 0.0, 0.0])
+        g[0] += 1
+        g[1] += confidence
+        g[2] += target
+        g[3] += entry
+
+    days = sorted({d for d, _, _ in groups})
+    tickers = sorted({t for _, t, _ in groups} | {t for m in LEVERAGE_MAPS.values() for t in m.values()})
+    day_code = {d: i for i, d in enumerate(days)}
+    ticker_code = {t: i for i, t in enumerate(tickers)}
+
+    keys = list(groups)
+    stats = np.array([groups[k] for k in keys], dtype=float).reshape(-1, 4)
+    count = stats[:, 0]
+    avg_conf = stats[:, 1] / count
+    avg_target = stats[:, 2] / count
+    avg_entry = stats[:, 3] / count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        move = np.abs((avg_target - avg_entry) / avg_entry * 100)
+
+    order = np.argsort([day_code[d] for d, _, _ in keys], kind="stable")
+    cands = {
+        "day": np.array([day_code[d] for d, _, _ in keys], dtype=np.int32),
+        "ticker": np.array([ticker_code[t] for _, t, _ in keys], dtype=np.int32),
+        "sign": np.array([1.0 if direction == "up" else -1.0 for _, _, direction in keys]),
+        "model_count": count,
+        "avg_confidence": avg_conf,
+        "expected_move_pct": move,
+        "valid_entry": avg_entry != 0,
+    }
+    cands = {k: v[order] for k, v in cands.items()}
+    return {"days": days, "tickers": tickers, **cands}
+
+
+def load_price_matrix(tickers: list[str], days: list[str], fetch: bool = True) -> dict:
+    """(ticker x day) session open and close, rounded like the live simulator; NaN if absent."""
+    import price_store
+    from market_data import YFINANCE_TICKER_ALIASES
+
+    session = [date.fromisoformat(d) for d in days]
+    symbols = [YFINANCE_TICKER_ALIASES.get(t, t) for t in tickers]
+    if fetch and session:
+        failed = price_store.fill(symbols, session[0], session[-1])
+        if failed:
+            log.warning(f"No prices for {sorted(failed)}; their trades are skipped")
+
+    opens = np.full((len(tickers), len(days)), np.nan)
+    closes = np.full((len(tickers), len(days)), np.nan)
+    index = np.array(session, dtype="datetime64[D]")
+    for i, symbol in enumerate(symbols):
+        if not session:
+            break
+        frame = price_store.frame(symbol, session[0], session[-1])
+        if frame.empty:
+            continue
+        stored = np.array(frame.index.date, dtype="datetime64[D]")
+        pos = np.searchsorted(stored, index)
+        hit = (pos < len(stored)) & (stored[np.minimum(pos, len(stored) - 1)] == index)
+        opens[i, hit] = frame["Open"].to_numpy(dtype=float)[pos[hit]]
+        closes[i, hit] = frame["Close"].to_numpy(dtype=float)[pos[hit]]
+    return {"open": round_like_builtin(opens, 2), "close": round_like_builtin(closes, 2)}
+
+
+# ── Engine ─────────────────────────────────────────────────────────────────────
+def select_winners(cands: dict, params: dict) -> np.ndarray:
+    """Index into *cands* of each day's winner under *params*, or -1 for no trade."""
+    tickers = cands["tickers"]
+    excluded = params.get("excluded", EXCLUDED_TICKERS)
+    is_etf = np.isin(cands["ticker"], [tickers.index(t) for t in ETF_LEVERAGE_MAP if t in tickers])
+    is_excluded = np.isin(cands["ticker"], [tickers.index(t) for t in excluded if t in tickers])
+
+    required = np.where(is_etf, params["etf_min_models"], params["min_models"])
+    eligible = (cands["model_count"] >= required) & ~is_excluded & cands["valid_entry"]
+    with np.errstate(invalid="ignore"):
+        score = round_like_builtin(RANKERS[params["ranker"]](cands), 4)
+    score = np.where(eligible & np.isfinite(score), score, -np.inf)
+
+    # Best score per day, first candidate on ties (select_todays_winner uses max()).
+    order = np.lexsort((np.arange(len(score)), -score, cands["day"]))
+    first = np.unique(cands["day"][order], return_index=True)[1]
+    best = order[first]
+    winners = np.full(len(cands["days"]), -1)
+    has_pick = np.isfinite(score[best])
+    winners[cands["day"][best[has_pick]]] = best[has_pick]
+    return winners
+
+
+def trade_tickers(cands: dict, params: dict) -> np.ndarray:
+    """Ticker code actually traded for each candidate (ETF → leveraged ETF)."""
+    tickers = cands["tickers"]
+    remap = np.arange(len(tickers))
+    for etf, levered in LEVERAGE_MAPS[params["leverage"]].items():
+        if etf in tickers and levered in tickers:
+            remap[tickers.index(etf)] = tickers.index(levered)
+    return remap[cands["ticker"]]
+
+
+def simulate(winners: np.ndarray, traded: np.ndarray, signs: np.ndarray, prices: dict,
+             starting_balance: float = STARTING_BALANCE) -> dict:
+    """Run every config's daily trades at once.
+
+    *winners*, *traded* and *signs* are (config x day): the candidate index
+    (-1 = no trade), the ticker code traded and the direction sign. Returns
+    (config x day) equity and P&L, plus per-config summary arrays.
+    """
+    n_configs, n_days = winners.shape
+    day_idx = np.broadcast_to(np.arange(n_days), winners.shape)
+    entry = prices["open"][traded, day_idx]
+    exit_ = prices["close"][traded, day_idx]
+    tradeable = (winners >= 0) & (entry > 0) & ~np.isnan(exit_)
+
+    balance = np.full(n_configs, float(starting_balance))
+    equity = np.empty((n_configs, n_days))
+    pnl = np.zeros((n_configs, n_days))
+    shares = np.zeros((n_configs, n_days))
+    for d in range(n_days):
+        ok = tradeable[:, d]
+        qty = np.where(ok, np.floor(balance / np.where(ok, entry[:, d], 1.0)), 0.0)
+        day_pnl = np.where(qty > 0, round_like_builtin(signs[:, d] * (exit_[:, d] - entry[:, d]) * qty, 2), 0.0)
+        balance = round_like_builtin(balance + day_pnl, 2)
+        equity[:, d] = balance
+        pnl[:, d] = day_pnl
+        shares[:, d] = qty
+
+    traded_days = shares > 0
+    peak = np.maximum.accumulate(np.hstack([np.full((n_configs, 1), float(starting_balance)), equity]), axis=1)[:, 1:]
+    drawdown = equity / peak - 1
+    n_trades = traded_days.sum(axis=1)
+    wins = (traded_days & (pnl > 0)).sum(axis=1)
+    return {
+        "equity": equity,
+        "pnl": pnl,
+        "shares": shares,
+        "final_balance": balance,
+        "return_pct": (balance / starting_balance - 1) * 100,
+        "max_drawdown_pct": drawdown.min(axis=1, initial=0.0) * 100,
+        "trades": n_trades,
+        "hit_rate": np.divide(wins, n_trades, out=np.zeros(n_configs), where=n_trades > 0),
+    }
+
+
+def backtest(param_grid: list[dict], cands: dict, prices: dict) -> dict:
+    """Select, trade and summarize every config in *param_grid*."""
+    winners = np.stack([select_winners(cands, p) for p in param_grid])
+    picked = np.maximum(winners, 0)  # placeholder index on no-trade days (masked in simulate)
+    traded = np.stack([trade_tickers(cands, p)[picked[i]] for i, p in enumerate(param_grid)])
+    signs = cands["sign"][picked]
+    result = simulate(winners, traded, signs, prices)
+    result["winners"] = winners
+    result["traded"] = traded
+    return result
+
+
+# ── Reporting ──────────────────────────────────────────────────────────────────
+def param_grid(min_models, etf_min_models, leverage, rankers) -> list[dict]:
+    return [
+        {"min_models": m, "etf_min_models": e, "leverage": lev, "ranker": r}
+        for m, e, lev, r in itertools.product(min_models, etf_min_models, leverage, rankers)
+    ]
+
+
+def ranked_table(grid: list[dict], result: dict) -> list[dict]:
+    """Configs best-first by final balance (then shallower drawdown), with equity curves."""
+    order = np.lexsort((np.arange(len(grid)), -result["max_drawdown_pct"], -result["final_balance"]))
+    return [
+        {
+            "rank": rank,
+            "params": grid[i],
+            "final_balance": round(float(result["final_balance"][i]), 2),
+            "return_pct": round(float(result["return_pct"][i]), 2),
+            "max_drawdown_pct": round(float(result["max_drawdown_pct"][i]), 2),
+            "trades": int(result["trades"][i]),
+            "hit_rate": round(float(result["hit_rate"][i]), 4),
+            "equity": [round(float(v), 2) for v in result["equity"][i]],
+        }
+        for rank, i in enumerate(order, start=1)
+    ]
+
+
+def write_report(table: list[dict], days: list[str], out_file: Path = BACKTEST_FILE, **extra):
+    save_json(out_file, {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "starting_balance": STARTING_BALANCE,
+        "days": days,
+        "live_params": LIVE_PARAMS,
+        **extra,
+        "configs": table,
+    })
+
+
+def log_top(table: list[dict], top: int = 10):
+    for row in table[:top]:
+        p = row["params"]
+        excluded = f"excl={','.join(p['excluded']) or '-':<11} " if "excluded" in p else ""
+        log.info(
+            f"#{row['rank']:<3} min={p['min_models']} etf_min={p['etf_min_models']} "
+            f"lev={p['leverage']:<4} rank={p['ranker']:<15} {excluded}"
+            f"${row['final_balance']:>11,.2f} ({row['return_pct']:+.1f}%)  "
+            f"maxDD {row['max_drawdown_pct']:.1f}%  hit {row['hit_rate']:.0%} over {row['trades']} trades"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest consensus-winner selection parameters")
+    parser.add_argument("--min-models", type=int, nargs="+", default=[MIN_MODELS_AGREEING])
+    parser.add_argument("--etf-min-models", type=int, nargs="+", default=[ETF_MIN_MODELS])
+    parser.add_argument("--leverage", nargs="+", choices=sorted(LEVERAGE_MAPS), default=["3x"])
+    parser.add_argument("--ranker", nargs="+", choices=sorted(RANKERS) + ["all"], default=["conviction_move"])
+    parser.add_argument("--offline", action="store_true", help="Never download; use the price store as-is")
+    parser.add_argument("--top", type=int, default=10, help="Configs to log")
+    args = parser.parse_args()
+
+    rankers = sorted(RANKERS) if "all" in args.ranker else args.ranker
+    grid = param_grid(args.min_models, args.etf_min_models, args.leverage, rankers)
+
+    cands = load_candidates()
+    if not cands["days"]:
+        log.warning("No predictions to backtest")
+        return
+    prices = load_price_matrix(cands["tickers"], cands["days"], fetch=not args.offline)
+    result = backtest(grid, cands, prices)
+    table = ranked_table(grid, result)
+    write_report(table, cands["days"])
+    log_top(table, args.top)
+    log.info(f"Backtested {len(grid)} configs over {len(cands['days'])} days → {BACKTEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Vectorized daily-bar selection shared by the price store, scoring and backfill.
+
+yfinance hands back daily bars indexed by tz-aware exchange-local timestamps
+(``Ticker.history``) or naive dates (``yf.download``). ``session_dates``
+normalizes either form to naive session dates once, and ``resolve_bars``
+answers any number of (ticker, date, field) requests with a single
+``searchsorted`` per (ticker, field) instead of iterating rows.
+"""
+
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+
+def session_dates(index) -> pd.DatetimeIndex:
+    """Normalize a daily index to naive midnight session dates.
+
+    Dropping the timezone keeps the exchange-local wall date, which is the
+    session date yfinance means.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def _empty_bar(ticker: str, d: date, field: str) -> dict:
+    return {
+        "ticker": ticker,
+        "date": d,
+        "field": field,
+        "value": None,
+        "session_date": None,
+        "exact": False,
+    }
+
+
+def resolve_bars(frames: dict, requests: list[tuple], lookback_days: int = 0) -> list[dict]:
+    """Resolve (ticker, date, field) requests against per-ticker daily frames.
+
+    Each request picks the session on its date or, when *lookback_days* > 0,
+    the most recent session at most that many calendar days earlier (the
+    half-day / holiday fallback). Returns one dict per request, in order:
+    ``{"ticker", "date", "field", "value", "session_date", "exact"}``, with
+    ``value`` and ``session_date`` set to None when nothing qualifies.
+    """
+    out = [_empty_bar(t, d, f) for t, d, f in requests]
+
+    groups = defaultdict(list)
+    for i, (ticker, _d, field) in enumerate(requests):
+        groups[(ticker, field)].append(i)
+
+    for (ticker, field), positions in groups.items():
+        frame = frames.get(ticker)
+        if frame is None or frame.empty or field not in frame.columns:
+            continue
+        series = pd.Series(frame[field].to_numpy(dtype=float), index=session_dates(frame.index))
+        series = series.dropna().sort_index()
+        if series.empty:
+            continue
+
+        targets = pd.DatetimeIndex([pd.Timestamp(requests[i][1]) for i in positions])
+        pos = series.index.searchsorted(targets, side="right") - 1
+        found = pos >= 0
+        pos = np.clip(pos, 0, None)
+        sessions = series.index[pos]
+        gaps = (targets - sessions).days.to_numpy()
+        found &= gaps <= lookback_days
+        values = series.to_numpy()[pos]
+
+        for k, i in enumerate(positions):
+            if not found[k]:
+                continue
+            bar = out[i]
+            bar["value"] = float(values[k])
+            bar["session_date"] = sessions[k].date()
+            bar["exact"] = bool(gaps[k] == 0)
+    return out
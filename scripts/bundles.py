@@ -0,0 +1,215 @@
+"""
+Per-page data bundles for the frontend.
+
+Each page (home, scoreboard, model/<slug>, analytics, simulator) gets one
+minified JSON file with just the fields it renders, named by content hash
+(``bundles/home.<hash>.json``) so it can be cached forever. The small,
+unhashed ``bundles/manifest.json`` maps page keys to the current files; the
+frontend fetches it once and falls back to the individual data files when a
+bundle is missing. Bundles are written straight to public/data/bundles/
+(gitignored) and are rebuilt at deploy time, after analytics.
+
+Usage:
+    python bundles.py
+"""
+
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import (
+    get_logger,
+    load_json,
+    write_atomic,
+    DATA_DIR,
+    LEADERBOARD_FILE,
+    PREDICTIONS_DIR,
+    PUBLIC_DATA_DIR,
+    SCORES_DIR,
+    SUMMARIES_DAILY_DIR,
+)
+
+log = get_logger("bundles")
+
+BUNDLES_DIR = PUBLIC_DATA_DIR / "bundles"
+MANIFEST_FILE = BUNDLES_DIR / "manifest.json"
+HASH_LENGTH = 12
+
+ANALYTICS_FILE = DATA_DIR / "analytics.json"
+SIMULATOR_FILE = DATA_DIR / "simulator.json"
+PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
+WINNER_FILE = DATA_DIR / "winner-today.json"
+
+# Fields read by LeaderboardTable / ModelProfile (Home) and by ModelPage.
+COMPACT_MODEL_FIELDS = (
+    "model_display_name", "model_id", "total_predictions", "direction_accuracy",
+    "total_score", "avg_confidence", "current_streak",
+)
+MODEL_FIELDS = COMPACT_MODEL_FIELDS + ("best_streak", "worst_streak", "weekly_scores")
+# PredictionCard (and the client-side winner fallback on Home).
+PREDICTION_FIELDS = (
+    "id", "ticker", "direction", "target_price", "current_price_at_prediction",
+    "timeframe", "confidence", "reasoning",
+)
+SCORE_FIELDS = ("prediction_id", "status", "direction_correct", "score", "actual_close")
+TRADE_FIELDS = (
+    "date", "ticker", "direction", "entry_price", "exit_price",
+    "shares", "pnl", "pnl_pct", "models", "status",
+)
+MARKET_CONTEXT_CHARS = 80  # Home shows a one-line teaser
+
+
+def _pick(record: dict, fields: tuple) -> dict:
+    return {k: record[k] for k in fields if k in record}
+
+
+def _load(path: Path, default=None):
+    if not path.exists():
+        return default
+    try:
+        return load_json(path)
+    except Exception as e:
+        log.error(f"Could not load {path}: {e}")
+        return default
+
+
+# ── Inputs ─────────────────────────────────────────────────────────────────────
+def _active_date(winner: dict) -> Optional[str]:
+    """The day the pages show: the winner file's date, else the newest prediction day."""
+    if winner and winner.get("date"):
+        return winner["date"]
+    days = sorted(p.name for p in PREDICTIONS_DIR.iterdir() if p.is_dir()) if PREDICTIONS_DIR.exists() else []
+    return days[-1] if days else None
+
+
+def _day_predictions(date_str: str, teaser: bool) -> dict:
+    """slug -> trimmed prediction file for one day."""
+    out = {}
+    for pf in sorted((PREDICTIONS_DIR / date_str).glob("*.json")):
+        data = _load(pf)
+        if not data:
+            continue
+        context = data.get("market_context") or ""
+        out[pf.stem] = {
+            "model_display_name": data.get("model_display_name", pf.stem),
+            "market_context": context[:MARKET_CONTEXT_CHARS] if teaser else context,
+            "predictions": [_pick(p, PREDICTION_FIELDS) for p in data.get("predictions", [])],
+        }
+    return out
+
+
+def _day_scores(date_str: str, ids: Optional[set] = None) -> Optional[dict]:
+    data = _load(SCORES_DIR / f"{date_str}.json")
+    if data is None:
+        return None
+    results = data.get("results", [])
+    if ids is not None:
+        results = [r for r in results if r["prediction_id"] in ids]
+    return {"results": [_pick(r, SCORE_FIELDS) for r in results]}
+
+
+def _match_model(models: list[dict], slug: str) -> Optional[dict]:
+    """Same slug → leaderboard entry rule as ModelPage.jsx."""
+    name = "gpt-4o" if slug == "gpt4o" else slug
+    for m in models:
+        display = m["model_display_name"].lower()
+        if display == name or display.replace("-", "") == name.replace("-", ""):
+            return m
+    return None
+
+
+# ── Bundles ────────────────────────────────────────────────────────────────────
+def build_bundles() -> dict:
+    """Page key -> bundle payload."""
+    leaderboard = _load(LEADERBOARD_FILE, {"models": []})
+    winner = _load(WINNER_FILE)
+    analytics = _load(ANALYTICS_FILE)
+    simulator = _load(SIMULATOR_FILE)
+    portfolio = _load(PORTFOLIO_FILE)
+    date_str = _active_date(winner)
+    models = leaderboard.get("models", [])
+
+    bundles = {
+        "scoreboard": {
+            "leaderboard": {
+                "last_updated": leaderboard.get("last_updated"),
+                "models": [_pick(m, MODEL_FIELDS) for m in models],
+            },
+            "analytics": {
+                "head_to_head": {
+                    "recent_clashes": ((analytics or {}).get("head_to_head") or {}).get("recent_clashes", []),
+                },
+            },
+        },
+    }
+    if analytics is not None:
+        bundles["analytics"] = analytics
+    if simulator is not None:
+        bundles["simulator"] = {
+            "balance": simulator.get("balance"),
+            "starting_balance": simulator.get("starting_balance"),
+            "trades": [_pick(t, TRADE_FIELDS) for t in simulator.get("trades", [])],
+            "portfolio": portfolio,
+        }
+    if date_str is None:
+        return bundles
+
+    summary = _load(SUMMARIES_DAILY_DIR / f"{date_str}.json")
+    bundles["home"] = {
+        "date": date_str,
+        "leaderboard": {"models": [_pick(m, COMPACT_MODEL_FIELDS) for m in models]},
+        "winner": winner,
+        "scores": _day_scores(date_str),
+        "daily_summary": summary and _pick(summary, ("headline", "consensus_picks", "best_call", "worst_call")),
+        "predictions": _day_predictions(date_str, teaser=True),
+    }
+
+    for slug, data in _day_predictions(date_str, teaser=False).items():
+        entry = _match_model(models, slug)
+        ids = {p["id"] for p in data["predictions"]}
+        bundles[f"model/{slug}"] = {
+            "date": date_str,
+            "leaderboard": {"models": [_pick(entry, MODEL_FIELDS)] if entry else []},
+            "predictions": data,
+            "scores": _day_scores(date_str, ids),
+        }
+    return bundles
+
+
+def write_bundles(bundles: dict) -> dict:
+    """Write content-hashed bundle files plus the manifest; prune stale ones."""
+    paths = {}
+    for key, payload in sorted(bundles.items()):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha1(body).hexdigest()[:HASH_LENGTH]
+        rel = f"bundles/{key}.{digest}.json"
+        write_atomic(PUBLIC_DATA_DIR / rel, body, skip_unchanged=True)
+        paths[key] = {"path": rel, "bytes": len(body)}
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "bundles": {key: info["path"] for key, info in paths.items()},
+    }
+    write_atomic(MANIFEST_FILE, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    live = {PUBLIC_DATA_DIR / info["path"] for info in paths.values()}
+    for stale in BUNDLES_DIR.rglob("*.json"):
+        if stale != MANIFEST_FILE and stale not in live:
+            stale.unlink()
+    return paths
+
+
+def main():
+    paths = write_bundles(build_bundles())
+    for key, info in paths.items():
+        log.info(f"{key:<20} {info['bytes']:>9,} B  {info['path']}")
+    log.info(f"Wrote {len(paths)} page bundles → {MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
 """Fetch macro-economic indicators from the FRED API (Federal Reserve Economic Data)."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import requests
 
-from utils import get_logger
+from utils import get_logger, load_json, save_json, DATA_DIR
 
 log = get_logger("fred_data")
 
+_session = None
+
 FRED_BASE = "https://api.stlouisfed.org/fred/series/observations"
+FRED_CACHE_FILE = DATA_DIR / "fred_cache.json"
 
 # Key economic indicators and their human-readable names
 INDICATORS = {
@@ -21,11 +26,34 @@ INDICATORS = {
     "T10Y2Y": "10Y-2Y Yield Spread",
 }
 
+# How long a cached observation is trusted before refetching, by release cadence.
+# Daily series refresh every morning; monthly ones only every few days.
+DAILY_TTL = timedelta(hours=12)
+MONTHLY_TTL = timedelta(days=3)
+SERIES_TTL = {
+    "DGS10": DAILY_TTL,
+    "DGS2": DAILY_TTL,
+    "T10Y2Y": DAILY_TTL,
+    "FEDFUNDS": MONTHLY_TTL,
+    "CPIAUCSL": MONTHLY_TTL,
+    "UNRATE": MONTHLY_TTL,
+}
+
 
-def _fetch_latest(series_id: str, api_key: str) -> Optional[str]:
-    """Fetch the most recent observation for a FRED series."""
+def _get_session() -> requests.Session:
+    """One pooled session per process so series fetches reuse the TLS connection."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=len(INDICATORS))
+        _session.mount("https://", adapter)
+    return _session
+
+
+def _fetch_latest(series_id: str, api_key: str) -> Optional[dict]:
+    """Fetch the most recent observation for a FRED series as ``{"value", "date"}``."""
     try:
-        resp = requests.get(
+        resp = _get_session().get(
             FRED_BASE,
             params={
                 "series_id": series_id,
@@ -43,36 +71,75 @@ def _fetch_latest(series_id: str, api_key: str) -> Optional[str]:
             value = observations[0].get("value", ".")
             date = observations[0].get("date", "")
             if value != ".":
-                return f"{value} (as of {date})"
+                return {"value": value, "date": date}
     except Exception as e:
         log.warning(f"FRED fetch failed for {series_id}: {e}")
     return None
 
 
+def _load_cache() -> dict:
+    if FRED_CACHE_FILE.exists():
+        try:
+            return load_json(FRED_CACHE_FILE)
+        except Exception as e:
+            log.warning(f"Could not read FRED cache, refetching everything: {e}")
+    return {}
+
+
+def _is_fresh(entry: Optional[dict], series_id: str, now: datetime) -> bool:
+    if not entry or "fetched_at" not in entry:
+        return False
+    fetched_at = datetime.fromisoformat(entry["fetched_at"])
+    return now - fetched_at < SERIES_TTL.get(series_id, DAILY_TTL)
+
+
 def get_fred_context() -> str:
     """
     Fetch key macro indicators from FRED and return a formatted text block.
     Returns empty string if FRED_API_KEY is not set or all fetches fail.
+
+    Observations are cached in data/fred_cache.json with a per-series TTL;
+    only expired series are refetched (concurrently, over one session). If a
+    refetch fails, the stale cached value is used instead.
     """
     api_key = os.environ.get("FRED_API_KEY")
     if not api_key:
         log.info("FRED_API_KEY not set — skipping macro data")
         return ""
 
-    log.info("Fetching FRED macro indicators...")
+    now = datetime.now(timezone.utc)
+    cache = _load_cache()
+    due = [s for s in INDICATORS if not _is_fresh(cache.get(s), s, now)]
+
+    if due:
+        log.info(f"Fetching FRED macro indicators: {due} ({len(INDICATORS) - len(due)} cached)")
+        with ThreadPoolExecutor(max_workers=len(due)) as pool:
+            fetched = dict(zip(due, pool.map(lambda s: _fetch_latest(s, api_key), due)))
+        updated = False
+        for series_id, obs in fetched.items():
+            if obs:
+                cache[series_id] = {**obs, "fetched_at": now.isoformat()}
+                updated = True
+            elif series_id in cache:
+                log.warning(f"Using stale cached {series_id} from {cache[series_id]['fetched_at']}")
+        if updated:
+            save_json(FRED_CACHE_FILE, cache)
+    else:
+        log.info("All FRED indicators served from cache")
+
     lines = []
     lines.append("MACRO ECONOMIC INDICATORS (from Federal Reserve / FRED):")
 
-    fetched = 0
+    available = 0
     for series_id, name in INDICATORS.items():
-        result = _fetch_latest(series_id, api_key)
-        if result:
-            lines.append(f"  {name}: {result}")
-            fetched += 1
+        entry = cache.get(series_id)
+        if entry:
+            lines.append(f"  {name}: {entry['value']} (as of {entry['date']})")
+            available += 1
 
-    if fetched == 0:
+    if available == 0:
         log.warning("No FRED data retrieved")
         return ""
 
-    log.info(f"FRED context fetched ({fetched}/{len(INDICATORS)} indicators)")
+    log.info(f"FRED context ready ({available}/{len(INDICATORS)} indicators)")
     return "\n".join(lines)
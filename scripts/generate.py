@@ -5,19 +5,23 @@ Morning script: generate predictions from all AI models.
 Run at 8:30 AM ET on weekdays before market open.
 
 Usage:
-    python generate.py [--date YYYY-MM-DD] [--models claude,perplexity,...]
+    python generate.py [--date YYYY-MM-DD] [--models claude,perplexity,...] [--serial]
 """
 
 import argparse
+import asyncio
 import os
 import sys
+import time
 from datetime import date
 from pathlib import Path
 
 # Allow running from the scripts/ directory
 sys.path.insert(0, str(Path(__file__).parent))
 
-from adapters import ALL_ADAPTERS
+import pending
+import prediction_index
+from adapters import ALL_ADAPTERS, clients
 from utils import (
     ALLOWED_DIRECTIONS,
     ALLOWED_TIMEFRAMES,
@@ -33,6 +37,12 @@ from utils import (
 
 log = get_logger("generate")
 
+# Wall-clock limits for the concurrent fan-out. Each adapter gets its own
+# deadline (override with a ``timeout_s`` class attribute); the whole stage is
+# capped by the global budget so a hung provider can't push us past the open.
+ADAPTER_TIMEOUT_S = 300
+GENERATE_BUDGET_S = 420
+
 
 def _write_ci_summary(date_str, results, success_count, total, failed, failure_reasons):
     """Write summary to GitHub Actions step summary and outputs."""
@@ -64,10 +74,119 @@ def _write_ci_summary(date_str, results, success_count, total, failed, failure_r
                 f.write(f"{key}_failure_reason={safe_reason}\n")
 
 
+def _call_adapter(adapter, date_str: str, market_context: str):
+    """Run one adapter and return ``(data, failure_reason)``."""
+    log.info(f"Running {adapter.slug}...")
+    try:
+        data = adapter.generate(date_str, market_context=market_context)
+    except Exception as e:
+        log.error(f"{adapter.slug}: unexpected error: {e}")
+        data = None
+    reason = None if data is not None else getattr(adapter, "last_error", None)
+    return data, reason
+
+
+async def _acall_adapter(adapter, date_str: str, market_context: str):
+    """Async twin of ``_call_adapter``; falls back to a worker thread for sync-only adapters."""
+    log.info(f"Running {adapter.slug}...")
+    try:
+        if hasattr(adapter, "agenerate"):
+            data = await adapter.agenerate(date_str, market_context=market_context)
+        else:
+            data = await asyncio.to_thread(adapter.generate, date_str, market_context=market_context)
+    except Exception as e:
+        log.error(f"{adapter.slug}: unexpected error: {e}")
+        data = None
+    reason = None if data is not None else getattr(adapter, "last_error", None)
+    return data, reason
+
+
+async def _agenerate_all(adapters, date_str: str, market_context: str) -> dict:
+    started = time.monotonic()
+
+    async def bounded(adapter):
+        timeout_s = min(getattr(adapter, "timeout_s", ADAPTER_TIMEOUT_S), GENERATE_BUDGET_S)
+        try:
+            return await asyncio.wait_for(
+                _acall_adapter(adapter, date_str, market_context), timeout=timeout_s
+            )
+        except asyncio.TimeoutError:
+            limit = "global budget" if timeout_s == GENERATE_BUDGET_S else "adapter deadline"
+            reason = f"Timed out after {time.monotonic() - started:.0f}s ({limit})"
+            log.error(f"{adapter.slug}: {reason}")
+            return None, reason
+
+    try:
+        outputs = await asyncio.gather(*(bounded(a) for a in adapters))
+    finally:
+        await clients.aclose_async_clients()
+    return {adapter.slug: out for adapter, out in zip(adapters, outputs)}
+
+
+def _generate_concurrently(adapters, date_str: str, market_context: str) -> dict:
+    """Run all adapters at once on one event loop and collect ``{slug: (data, reason)}``.
+
+    Each adapter is bounded by its own deadline and by the global
+    GENERATE_BUDGET_S; a timed-out ``agenerate`` is cancelled outright. The
+    pooled async clients live for the duration of the loop and are shared by
+    every attempt and repair pass.
+    """
+    if not adapters:
+        return {}
+
+    started = time.monotonic()
+    log.info(f"Starting {len(adapters)} adapters concurrently (budget {GENERATE_BUDGET_S}s)")
+    outputs = asyncio.run(_agenerate_all(adapters, date_str, market_context))
+    log.info(f"Adapter fan-out finished in {time.monotonic() - started:.1f}s")
+    return outputs
+
+
+def _save_adapter_output(adapter, data, reason, date_str: str, out_dir: Path):
+    """Validate and persist one adapter's payload. Returns ``(ok, failure_reason)``."""
+    if data is None:
+        log.error(f"{adapter.slug}: returned None — skipping")
+        return False, reason
+
+    # Validate — strip invalid individual predictions before saving
+    errors = validate_prediction_payload(data, date_str, adapter.model_id)
+    if errors:
+        log.warning(f"{adapter.slug}: validation warnings: {errors}")
+
+    if "predictions" in data and isinstance(data["predictions"], list):
+        original_count = len(data["predictions"])
+        data["predictions"] = [
+            p for p in data["predictions"]
+            if p.get("direction") in ALLOWED_DIRECTIONS
+            and p.get("timeframe") in ALLOWED_TIMEFRAMES
+        ]
+        stripped = original_count - len(data["predictions"])
+        if stripped:
+            log.warning(f"{adapter.slug}: stripped {stripped} invalid predictions")
+
+    if not data.get("predictions"):
+        log.error(f"{adapter.slug}: no valid predictions, discarding")
+        return False, "No valid predictions after validation"
+
+    out_file = out_dir / f"{adapter.slug}.json"
+    save_json(out_file, data)
+    sync_to_public(out_file)
+    log.info(f"{adapter.slug}: saved {len(data.get('predictions', []))} predictions to {out_file}")
+    try:
+        pending.register(date_str, data)
+    except Exception as e:
+        log.error(f"{adapter.slug}: could not queue multi-day predictions: {e}")
+    try:
+        prediction_index.add_file(date_str, out_file, data)
+    except Exception as e:
+        log.warning(f"{adapter.slug}: prediction index not updated (rebuilt on next read): {e}")
+    return True, None
+
+
 def run(
     date_str: str,
     model_filter: list[str] | None = None,
     overwrite: bool = False,
+    concurrent: bool = True,
 ):
     ensure_dirs()
     log.info(f"Generating predictions for {date_str}")
@@ -101,57 +220,34 @@ def run(
 
     results = {}
     failure_reasons = {}
-    for adapter in adapters:
-        out_dir = PREDICTIONS_DIR / date_str
-        out_file = out_dir / f"{adapter.slug}.json"
+    out_dir = PREDICTIONS_DIR / date_str
 
-        # Idempotency by default, with an explicit overwrite path for manual reruns.
-        if out_file.exists() and not overwrite:
+    # Idempotency by default, with an explicit overwrite path for manual reruns.
+    to_run = []
+    for adapter in adapters:
+        if (out_dir / f"{adapter.slug}.json").exists() and not overwrite:
             log.info(f"{adapter.slug}: already generated, skipping")
-            results[adapter.slug] = True
             continue
+        to_run.append(adapter)
 
-        log.info(f"Running {adapter.slug}...")
-        try:
-            data = adapter.generate(date_str, market_context=market_context)
-        except Exception as e:
-            log.error(f"{adapter.slug}: unexpected error: {e}")
-            data = None
-
-        if data is None:
-            log.error(f"{adapter.slug}: returned None — skipping")
-            results[adapter.slug] = False
-            reason = getattr(adapter, "last_error", None)
-            if reason:
-                failure_reasons[adapter.slug] = reason
-            continue
+    if concurrent:
+        outputs = _generate_concurrently(to_run, date_str, market_context)
+    else:
+        outputs = {}
+        for adapter in to_run:
+            outputs[adapter.slug] = _call_adapter(adapter, date_str, market_context)
 
-        # Validate — strip invalid individual predictions before saving
-        errors = validate_prediction_payload(data, date_str, adapter.model_id)
-        if errors:
-            log.warning(f"{adapter.slug}: validation warnings: {errors}")
-
-        if "predictions" in data and isinstance(data["predictions"], list):
-            original_count = len(data["predictions"])
-            data["predictions"] = [
-                p for p in data["predictions"]
-                if p.get("direction") in ALLOWED_DIRECTIONS
-                and p.get("timeframe") in ALLOWED_TIMEFRAMES
-            ]
-            stripped = original_count - len(data["predictions"])
-            if stripped:
-                log.warning(f"{adapter.slug}: stripped {stripped} invalid predictions")
-
-        if not data.get("predictions"):
-            log.error(f"{adapter.slug}: no valid predictions, discarding")
-            results[adapter.slug] = False
-            failure_reasons[adapter.slug] = "No valid predictions after validation"
+    # Validation and saving stay on the main thread, in adapter order, so a
+    # late-finishing adapter can never write after the stage has moved on.
+    for adapter in adapters:
+        if adapter.slug not in outputs:
+            results[adapter.slug] = True
             continue
-
-        save_json(out_file, data)
-        sync_to_public(out_file)
-        log.info(f"{adapter.slug}: saved {len(data.get('predictions', []))} predictions to {out_file}")
-        results[adapter.slug] = True
+        data, reason = outputs[adapter.slug]
+        ok, reason = _save_adapter_output(adapter, data, reason, date_str, out_dir)
+        results[adapter.slug] = ok
+        if reason:
+            failure_reasons[adapter.slug] = reason
 
     success_count = sum(1 for v in results.values() if v)
     total = len(results)
@@ -167,17 +263,16 @@ def run(
 
     # Select today's winner and open paper trade
     try:
-        from winner import select_todays_winner, save_winner, load_simulator, save_simulator, open_trade, has_open_trade
+        from winner import select_todays_winner, save_winner, simulator_transaction, open_trade, has_open_trade
         winner = select_todays_winner(date_str)
         save_winner(date_str, winner)
-        if winner and not has_open_trade(load_simulator()):
-            sim = load_simulator()
-            sim = open_trade(sim, winner, date_str)
-            save_simulator(sim)
-        elif winner:
-            log.info("Winner found but trade already open — skipping")
-        else:
-            log.info("No consensus winner today — no trade opened")
+        with simulator_transaction() as sim:
+            if winner and not has_open_trade(sim):
+                open_trade(sim, winner, date_str)
+            elif winner:
+                log.info("Winner found but trade already open — skipping")
+            else:
+                log.info("No consensus winner today — no trade opened")
     except Exception as e:
         log.error(f"Winner/simulator error (non-fatal): {e}")
 
@@ -203,6 +298,11 @@ def main():
         action="store_true",
         help="Overwrite existing prediction files for the target date",
     )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Call adapters one at a time instead of concurrently",
+    )
     args = parser.parse_args()
 
     if not args.force:
@@ -213,7 +313,7 @@ def main():
             sys.exit(0)
 
     model_filter = args.models.split(",") if args.models else None
-    run(args.date, model_filter, overwrite=args.overwrite)
+    run(args.date, model_filter, overwrite=args.overwrite, concurrent=not args.serial)
 
 
 if __name__ == "__main__":
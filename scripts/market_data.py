@@ -6,7 +6,9 @@ from typing import Optional
 
 import yfinance as yf
 
-from utils import get_logger
+import price_store
+from bars import resolve_bars
+from utils import get_logger, today_et
 
 log = get_logger("market_data")
 
@@ -15,13 +17,74 @@ YFINANCE_TICKER_ALIASES = {
 }
 
 
+# Days to look back for the "last available row" fallback (half-days, holidays).
+CLOSE_LOOKBACK_DAYS = 3
+
+
+def _report_close(ticker: str, bar: dict) -> Optional[float]:
+    """Log a resolved close bar the way scoring always has and return the rounded price."""
+    yf_ticker = bar["ticker"]
+    target_date = bar["date"]
+    if bar["value"] is None:
+        log.warning(f"No data for {ticker} ({yf_ticker}) around {target_date}")
+        return None
+    close = bar["value"]
+    if bar["exact"]:
+        log.info(f"{ticker} close on {target_date}: ${close:.2f}")
+    else:
+        # Exact date not found: last available row (for half-days etc.)
+        log.warning(
+            f"{ticker} ({yf_ticker}): no data for {target_date}, "
+            f"using {bar['session_date']} close ${close:.2f}"
+        )
+    return round(close, 2)
+
+
+def resolve_prices(requests: list[tuple], lookback_days: int = 0) -> list[dict]:
+    """Resolve many (ticker, date, field) price requests from the price store.
+
+    Tickers are aliased for yfinance, the store is filled once over the
+    union of the requested dates, and every request is answered in one
+    vectorized pass (see ``bars.resolve_bars``). Each result carries the
+    resolved ``session_date`` and an ``exact`` flag. A failed download only
+    means the store's gaps stay unfilled: bars already stored still answer,
+    and requests nothing answers come back with ``value`` None.
+    """
+    if not requests:
+        return []
+    aliased = [(YFINANCE_TICKER_ALIASES.get(t, t), d, f) for t, d, f in requests]
+    symbols = list(dict.fromkeys(sym for sym, _, _ in aliased))
+    start = min(d for _, d, _ in aliased) - timedelta(days=lookback_days)
+    end = max(d for _, d, _ in aliased)
+    failed = price_store.fill(symbols, start, end)
+    if failed:
+        log.error(f"Price store could not be filled for: {sorted(failed)} — using stored bars only")
+    frames = {sym: price_store.frame(sym, start, end) for sym in symbols}
+    return resolve_bars(frames, aliased, lookback_days)
+
+
 def get_closing_price(ticker: str, target_date: date, retries: int = 3) -> Optional[float]:
     """
     Fetch the closing price for a ticker on a specific date.
     Returns None if data is unavailable.
+
+    Reads the local price store first, downloading only the days it is
+    missing; falls back to a direct yfinance request if that download fails.
     """
+    yf_ticker = YFINANCE_TICKER_ALIASES.get(ticker, ticker)
+    if target_date >= price_store.STORE_EPOCH:
+        start = target_date - timedelta(days=CLOSE_LOOKBACK_DAYS)
+        if yf_ticker not in price_store.fill([yf_ticker], start, target_date):
+            frames = {yf_ticker: price_store.frame(yf_ticker, start, target_date)}
+            bar = resolve_bars(frames, [(yf_ticker, target_date, "Close")], CLOSE_LOOKBACK_DAYS)[0]
+            return _report_close(ticker, bar)
+    return _fetch_closing_price(ticker, target_date, retries)
+
+
+def _fetch_closing_price(ticker: str, target_date: date, retries: int = 3) -> Optional[float]:
+    """Direct yfinance fetch for one ticker, bypassing the price store."""
     # yfinance needs a day window; fetch a few days in case of holiday adjustments
-    start = target_date - timedelta(days=3)
+    start = target_date - timedelta(days=CLOSE_LOOKBACK_DAYS)
     end = target_date + timedelta(days=1)
 
     for attempt in range(retries):
@@ -34,22 +97,8 @@ def get_closing_price(ticker: str, target_date: date, retries: int = 3) -> Optio
                 log.warning(f"No data for {ticker} ({yf_ticker}) around {target_date}")
                 return None
 
-            # Find the row matching the target date
-            for idx in hist.index:
-                idx_date = idx.date() if hasattr(idx, "date") else idx
-                if idx_date == target_date:
-                    close = float(hist.loc[idx, "Close"])
-                    log.info(f"{ticker} close on {target_date}: ${close:.2f}")
-                    return round(close, 2)
-
-            # If exact date not found, take the last available row (for half-days etc.)
-            close = float(hist["Close"].iloc[-1])
-            actual_date = hist.index[-1].date() if hasattr(hist.index[-1], "date") else hist.index[-1]
-            log.warning(
-                f"{ticker} ({yf_ticker}): no data for {target_date}, "
-                f"using {actual_date} close ${close:.2f}"
-            )
-            return round(close, 2)
+            bar = resolve_bars({yf_ticker: hist}, [(yf_ticker, target_date, "Close")], CLOSE_LOOKBACK_DAYS)[0]
+            return _report_close(ticker, bar)
 
         except Exception as e:
             log.error(f"yfinance error for {ticker} (attempt {attempt + 1}): {e}")
@@ -60,18 +109,46 @@ def get_closing_price(ticker: str, target_date: date, retries: int = 3) -> Optio
 
 
 def get_batch_closing_prices(tickers: list[str], target_date: date) -> dict[str, Optional[float]]:
-    """Fetch closing prices for multiple tickers. Returns dict of ticker -> price."""
+    """Fetch closing prices for multiple tickers. Returns dict of ticker -> price.
+
+    All tickers are filled into the price store with chunked multi-ticker
+    downloads and resolved together in one vectorized pass. Only tickers
+    whose download failed fall back to per-ticker fetching.
+    """
+    unique = list(dict.fromkeys(tickers))
+    if target_date < price_store.STORE_EPOCH:
+        return {t: get_closing_price(t, target_date) for t in unique}
+
+    yf_tickers = {t: YFINANCE_TICKER_ALIASES.get(t, t) for t in unique}
+    symbols = list(dict.fromkeys(yf_tickers.values()))
+    start = target_date - timedelta(days=CLOSE_LOOKBACK_DAYS)
+    failed = price_store.fill(symbols, start, target_date)
+
+    frames = {sym: price_store.frame(sym, start, target_date) for sym in symbols if sym not in failed}
+    bars = resolve_bars(frames, [(sym, target_date, "Close") for sym in symbols], CLOSE_LOOKBACK_DAYS)
+    by_symbol = dict(zip(symbols, bars))
+
     results = {}
-    seen = set()
-    for ticker in tickers:
-        if ticker in seen:
-            continue
-        seen.add(ticker)
-        results[ticker] = get_closing_price(ticker, target_date)
-        time.sleep(0.3)  # Gentle rate limiting
+    for ticker, yf_ticker in yf_tickers.items():
+        if yf_ticker in failed:
+            results[ticker] = _fetch_closing_price(ticker, target_date)
+        else:
+            results[ticker] = _report_close(ticker, by_symbol[yf_ticker])
     return results
 
 
+def prefetch_closes(tickers: list[str], start: date, end: date) -> set[str]:
+    """Bulk-fill the price store so closes for [start, end] resolve offline.
+
+    Covers the CLOSE_LOOKBACK_DAYS fallback window too. Returns the tickers
+    whose download failed (they will fall back to per-ticker fetches later).
+    """
+    yf_tickers = {t: YFINANCE_TICKER_ALIASES.get(t, t) for t in dict.fromkeys(tickers)}
+    symbols = list(dict.fromkeys(yf_tickers.values()))
+    failed = price_store.fill(symbols, start - timedelta(days=CLOSE_LOOKBACK_DAYS), end)
+    return {t for t, sym in yf_tickers.items() if sym in failed}
+
+
 def get_market_context() -> str:
     """
     Fetch standardized market data to inject into prediction prompts.
@@ -85,25 +162,25 @@ def get_market_context() -> str:
 
     all_tickers = indices + stocks + indicators + crypto
 
+    # Two calendar weeks comfortably holds the last 6 sessions, even across holidays.
+    end = today_et()
+    start = end - timedelta(days=14)
+
     log.info("Fetching market context data...")
     try:
-        data = yf.download(all_tickers, period="6d", progress=False, group_by="ticker")
+        price_store.fill(all_tickers, start, end)
     except Exception as e:
         log.error(f"Failed to fetch market context: {e}")
         return ""
 
-    if data.empty:
+    if all(price_store.closes(t, start, end).empty for t in all_tickers):
         log.warning("Market context download returned empty data")
         return ""
 
     def _get_latest(ticker):
         """Extract latest close and 5-day % change for a ticker."""
         try:
-            if len(all_tickers) == 1:
-                col = data
-            else:
-                col = data[ticker]
-            closes = col["Close"].dropna()
+            closes = price_store.closes(ticker, start, end).iloc[-6:]
             if closes.empty:
                 return None, None
             latest = round(float(closes.iloc[-1]), 2)
@@ -187,7 +264,29 @@ def get_open_price(ticker: str, target_date: date, retries: int = 3) -> Optional
     """
     Fetch the regular-session opening price (9:30 ET) for a ticker on a specific date.
     Used as the honest, reproducible entry price for paper trades.
+
+    Reads the local price store first; falls back to a direct yfinance request
+    if the store can't be filled.
     """
+    yf_ticker = YFINANCE_TICKER_ALIASES.get(ticker, ticker)
+    if target_date >= price_store.STORE_EPOCH:
+        if yf_ticker not in price_store.fill([yf_ticker], target_date, target_date):
+            frames = {yf_ticker: price_store.frame(yf_ticker, target_date, target_date)}
+            bar = resolve_bars(frames, [(yf_ticker, target_date, "Open")])[0]
+            return _report_open(ticker, bar)
+    return _fetch_open_price(ticker, target_date, retries)
+
+
+def _report_open(ticker: str, bar: dict) -> Optional[float]:
+    if bar["value"] is None:
+        log.warning(f"{ticker} ({bar['ticker']}): no open price for {bar['date']}")
+        return None
+    log.info(f"{ticker} open on {bar['date']}: ${bar['value']:.2f}")
+    return round(bar["value"], 2)
+
+
+def _fetch_open_price(ticker: str, target_date: date, retries: int = 3) -> Optional[float]:
+    """Direct yfinance fetch of one session open, bypassing the price store."""
     start = target_date - timedelta(days=3)
     end = target_date + timedelta(days=2)
 
@@ -201,15 +300,8 @@ def get_open_price(ticker: str, target_date: date, retries: int = 3) -> Optional
                 log.warning(f"No data for {ticker} ({yf_ticker}) around {target_date}")
                 return None
 
-            for idx in hist.index:
-                idx_date = idx.date() if hasattr(idx, "date") else idx
-                if idx_date == target_date:
-                    open_px = float(hist.loc[idx, "Open"])
-                    log.info(f"{ticker} open on {target_date}: ${open_px:.2f}")
-                    return round(open_px, 2)
-
-            log.warning(f"{ticker} ({yf_ticker}): no open price for {target_date}")
-            return None
+            bar = resolve_bars({yf_ticker: hist}, [(yf_ticker, target_date, "Open")])[0]
+            return _report_open(ticker, bar)
 
         except Exception as e:
             log.error(f"yfinance open-price error for {ticker} (attempt {attempt + 1}): {e}")
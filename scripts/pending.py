@@ -0,0 +1,115 @@
+"""
+Pending-horizon index for end_of_week / end_of_month predictions.
+
+Multi-day predictions are registered when they are generated into one bucket
+file per resolution session, data/pending/<YYYY-MM-DD>.json, so the evening
+scorer only reads the bucket for the day it is scoring instead of rescanning
+every prediction directory. Buckets are never pruned: score files record which
+predictions are resolved, so re-scoring a day is idempotent.
+
+Usage:
+    python pending.py --rebuild    # re-index every existing prediction file
+"""
+
+import argparse
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import (
+    get_logger,
+    horizon_date,
+    load_json,
+    save_json,
+    PENDING_DIR,
+    PREDICTIONS_DIR,
+)
+
+log = get_logger("pending")
+
+HORIZON_TIMEFRAMES = {"end_of_week", "end_of_month"}
+
+
+def _bucket_path(d: date) -> Path:
+    return PENDING_DIR / f"{d.isoformat()}.json"
+
+
+def load_bucket(d: date) -> list[dict]:
+    """Entries resolving on *d*: ``{"prediction_date", "model", "model_display_name", "prediction"}``."""
+    path = _bucket_path(d)
+    if not path.exists():
+        return []
+    return load_json(path).get("predictions", [])
+
+
+def _entries_for(date_str: str, data: dict) -> dict:
+    """Group one prediction file's multi-day predictions by resolution date."""
+    d = datetime.strptime(date_str, "%Y-%m-%d").date()
+    buckets = {}
+    for pred in data.get("predictions", []):
+        timeframe = pred.get("timeframe")
+        if timeframe not in HORIZON_TIMEFRAMES:
+            continue
+        buckets.setdefault(horizon_date(d, timeframe), []).append({
+            "prediction_date": date_str,
+            "model": data["model"],
+            "model_display_name": data["model_display_name"],
+            "prediction": pred,
+        })
+    return buckets
+
+
+def _merge(resolves_on: date, entries: list[dict]):
+    """Upsert entries into a bucket, keyed by prediction id."""
+    merged = {e["prediction"]["id"]: e for e in load_bucket(resolves_on)}
+    for e in entries:
+        merged[e["prediction"]["id"]] = e
+    save_json(_bucket_path(resolves_on), {
+        "resolves_on": resolves_on.isoformat(),
+        "predictions": sorted(merged.values(), key=lambda e: e["prediction"]["id"]),
+    })
+
+
+def register(date_str: str, data: dict) -> int:
+    """Index a freshly generated prediction payload. Returns entries registered."""
+    buckets = _entries_for(date_str, data)
+    for resolves_on, entries in buckets.items():
+        _merge(resolves_on, entries)
+        log.info(f"Queued {len(entries)} {data['model_display_name']} prediction(s) for {resolves_on}")
+    return sum(len(e) for e in buckets.values())
+
+
+def rebuild() -> int:
+    """Re-index every prediction file on disk (one-off migration / repair)."""
+    buckets = {}
+    for pred_dir in sorted(p for p in PREDICTIONS_DIR.iterdir() if p.is_dir()):
+        for pf in sorted(pred_dir.glob("*.json")):
+            try:
+                data = load_json(pf)
+            except Exception as e:
+                log.error(f"Could not load {pf}: {e}")
+                continue
+            for resolves_on, entries in _entries_for(pred_dir.name, data).items():
+                buckets.setdefault(resolves_on, []).extend(entries)
+
+    for resolves_on, entries in sorted(buckets.items()):
+        _merge(resolves_on, entries)
+    total = sum(len(e) for e in buckets.values())
+    log.info(f"Indexed {total} multi-day predictions into {len(buckets)} pending buckets")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the pending-horizon index")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index all prediction files")
+    args = parser.parse_args()
+    if args.rebuild:
+        rebuild()
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
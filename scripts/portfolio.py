@@ -0,0 +1,221 @@
+"""
+Portfolio mode for the paper-trading simulator.
+
+Where the main simulator trades only the day's single winner, the portfolio
+splits its balance across the top-N consensus picks (winner.rank_candidates)
+every day, weighted equally, by average confidence or by expected move. Each
+position is entered at the session open and exited at that day's close, like
+the main simulator; whatever doesn't buy a whole share stays in cash.
+
+Positions live in flat numpy arrays (one row per position, grouped by day), so
+sizing and marking a day's positions is a few vector operations however many
+there are. Rebuilt from the full prediction history on every run and written
+to data/portfolio.json for the Simulator page: the aggregate equity / cash
+series, per-ticker cumulative P&L series, and every position. Positions
+without a close yet (today, before scoring) are reported as OPEN at cost; the
+rest of that day's positions book as usual. An earlier position with no close
+is a data gap and is SKIPPED.
+
+Usage:
+    python portfolio.py                          # top 3, equal weight
+    python portfolio.py --top-n 5 --weighting confidence
+"""
+
+import argparse
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from market_data import resolve_prices
+from score import round_like_builtin
+from utils import get_logger, save_json, sync_to_public, DATA_DIR, PREDICTIONS_DIR
+from winner import DEFAULT_SIMULATOR, rank_candidates
+
+log = get_logger("portfolio")
+
+PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
+STARTING_BALANCE = DEFAULT_SIMULATOR["starting_balance"]
+DEFAULT_TOP_N = 3
+
+# Raw weight per candidate; normalized across each day's tradeable positions.
+WEIGHTINGS = {
+    "equal": lambda c: 1.0,
+    "confidence": lambda c: c["avg_confidence"],
+    "expected_move": lambda c: c["expected_move_pct"],
+}
+
+
+# ── Positions ──────────────────────────────────────────────────────────────────
+def _prediction_days() -> list[str]:
+    if not PREDICTIONS_DIR.exists():
+        return []
+    return sorted(p.name for p in PREDICTIONS_DIR.iterdir() if p.is_dir())
+
+
+def load_positions(days: list[str], top_n: int, weighting: str) -> dict:
+    """Top-N picks per day as aligned arrays, plus the candidate dicts behind them."""
+    rows = []
+    for day_index, date_str in enumerate(days):
+        taken = set()
+        for candidate in rank_candidates(date_str):
+            ticker = candidate.get("leveraged_ticker", candidate["ticker"])
+            if ticker in taken:
+                continue
+            taken.add(ticker)
+            rows.append((day_index, ticker, candidate))
+            if len(taken) == top_n:
+                break
+
+    weigh = WEIGHTINGS[weighting]
+    return {
+        "day": np.array([d for d, _, _ in rows], dtype=np.int64),
+        "ticker": [t for _, t, _ in rows],
+        "sign": np.array([1.0 if c["direction"] == "up" else -1.0 for _, _, c in rows]),
+        "raw_weight": np.array([weigh(c) for _, _, c in rows], dtype=float),
+        "candidates": [c for _, _, c in rows],
+    }
+
+
+def attach_prices(positions: dict, days: list[str]):
+    """Session open (entry) and close (exit) per position; NaN where unavailable."""
+    n = len(positions["ticker"])
+    positions["entry"] = np.full(n, np.nan)
+    positions["exit"] = np.full(n, np.nan)
+    if not n:
+        return
+    dates = [date.fromisoformat(days[d]) for d in positions["day"]]
+    for field, key in (("Open", "entry"), ("Close", "exit")):
+        bars = resolve_prices([(t, d, field) for t, d in zip(positions["ticker"], dates)])
+        positions[key] = np.array([np.nan if b["value"] is None else round(b["value"], 2) for b in bars])
+
+
+# ── Simulation ─────────────────────────────────────────────────────────────────
+def simulate(positions: dict, n_days: int, starting_balance: float = STARTING_BALANCE) -> dict:
+    """Size, mark and close each day's positions; returns per-position and per-day arrays.
+
+    Positions with a close book their P&L that day. On the last day, those
+    without one yet stay OPEN, held at cost; on any earlier day a missing
+    close is a data gap, so the position is left unsized and the day trades
+    the rest.
+    """
+    day, entry, exit_, sign = positions["day"], positions["entry"], positions["exit"], positions["sign"]
+    n = len(day)
+    weight = np.zeros(n)
+    shares = np.zeros(n)
+    pnl = np.full(n, np.nan)
+    equity = np.full(n_days, np.nan)
+    cash = np.full(n_days, np.nan)
+    invested = np.zeros(n_days)
+
+    bounds = np.searchsorted(day, np.arange(n_days + 1))
+    balance = float(starting_balance)
+    for d in range(n_days):
+        sl = slice(bounds[d], bounds[d + 1])
+        tradeable = (entry[sl] > 0) & ((d == n_days - 1) | ~np.isnan(exit_[sl]))
+        raw = np.where(tradeable, positions["raw_weight"][sl], 0.0)
+        if raw.sum() <= 0:
+            raw = tradeable.astype(float)
+        if not raw.any():
+            continue
+        weight[sl] = raw / raw.sum()
+        shares[sl] = np.where(tradeable, np.floor(balance * weight[sl] / np.where(tradeable, entry[sl], 1.0)), 0.0)
+        invested[d] = round(float(round_like_builtin(shares[sl] * np.nan_to_num(entry[sl]), 2).sum()), 2)
+        cash[d] = round(balance - invested[d], 2)
+
+        closes = (shares[sl] > 0) & ~np.isnan(exit_[sl])
+        pnl[sl] = np.where(closes, round_like_builtin(sign[sl] * (exit_[sl] - entry[sl]) * shares[sl], 2), np.nan)
+        balance = round(balance + float(np.nansum(pnl[sl])), 2)
+        equity[d] = balance  # open positions marked at cost
+
+    return {"weight": weight, "shares": shares, "pnl": pnl, "equity": equity, "cash": cash, "invested": invested}
+
+
+def ticker_pnl_series(positions: dict, result: dict, n_days: int) -> dict:
+    """Cumulative realized P&L per traded ticker, one value per day."""
+    tickers = sorted(set(positions["ticker"]))
+    code = {t: i for i, t in enumerate(tickers)}
+    matrix = np.zeros((len(tickers), n_days))
+    closed = ~np.isnan(result["pnl"])
+    np.add.at(
+        matrix,
+        (np.array([code[t] for t in positions["ticker"]], dtype=np.int64)[closed], positions["day"][closed]),
+        result["pnl"][closed],
+    )
+    return {t: [round(float(v), 2) for v in row] for t, row in zip(tickers, np.cumsum(matrix, axis=1))}
+
+
+# ── Output ─────────────────────────────────────────────────────────────────────
+def _num(value, digits=2):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def build_portfolio(top_n: int = DEFAULT_TOP_N, weighting: str = "equal") -> dict:
+    days = _prediction_days()
+    positions = load_positions(days, top_n, weighting)
+    attach_prices(positions, days)
+    result = simulate(positions, len(days))
+
+    records = []
+    for i, candidate in enumerate(positions["candidates"]):
+        held = result["shares"][i] > 0
+        cost = positions["entry"][i] * result["shares"][i]
+        pnl = result["pnl"][i] if held else np.nan
+        records.append({
+            "date": days[positions["day"][i]],
+            "ticker": positions["ticker"][i],
+            "direction": candidate["direction"],
+            "weight": round(float(result["weight"][i]), 4),
+            "entry_price": _num(positions["entry"][i]),
+            "exit_price": _num(positions["exit"][i]) if held else None,
+            "shares": int(result["shares"][i]),
+            "pnl": _num(pnl),
+            "pnl_pct": _num(pnl / cost * 100) if held and cost else None,
+            "models": candidate["models"],
+            "confidence": candidate["avg_confidence"],
+            "status": "CLOSED" if not np.isnan(pnl) else "OPEN" if held else "SKIPPED",
+        })
+
+    marked = ~np.isnan(result["equity"])
+    balance = float(result["equity"][marked][-1]) if marked.any() else float(STARTING_BALANCE)
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "top_n": top_n,
+        "weighting": weighting,
+        "starting_balance": STARTING_BALANCE,
+        "balance": round(balance, 2),
+        "series": {
+            "dates": [d for d, m in zip(days, marked) if m],
+            "equity": [round(float(v), 2) for v in result["equity"][marked]],
+            "cash": [round(float(v), 2) for v in result["cash"][marked]],
+            "invested": [round(float(v), 2) for v in result["invested"][marked]],
+            "by_ticker": {
+                t: [v for v, m in zip(values, marked) if m]
+                for t, values in ticker_pnl_series(positions, result, len(days)).items()
+            },
+        },
+        "positions": records,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the top-N portfolio simulation")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help=f"Positions per day (default: {DEFAULT_TOP_N})")
+    parser.add_argument("--weighting", choices=sorted(WEIGHTINGS), default="equal")
+    args = parser.parse_args()
+
+    portfolio = build_portfolio(args.top_n, args.weighting)
+    save_json(PORTFOLIO_FILE, portfolio)
+    sync_to_public(PORTFOLIO_FILE)
+    closed = sum(p["status"] == "CLOSED" for p in portfolio["positions"])
+    log.info(
+        f"Portfolio (top {args.top_n}, {args.weighting}): {closed} closed positions over "
+        f"{len(portfolio['series']['dates'])} days, balance ${portfolio['balance']:,.2f} → {PORTFOLIO_FILE}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+SQLite index over data/predictions/<date>/<model>.json.
+
+One row per prediction, keyed by (date, slug, position) and indexed by
+prediction_id, (model, ticker) and ticker, so scripts can fetch a day's
+predictions with one query and ask cross-day questions ("every NVDA call by
+Grok") without walking the tree. Each row keeps the prediction's full JSON, so
+callers get back exactly what is in the file.
+
+The index (data/predictions.sqlite) is gitignored and self-healing: reads
+first compare the day's directory listing (file sizes and mtimes) with what
+was indexed and re-index only files that changed. generate.py indexes each
+file as it writes it.
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import get_logger, load_json, DATA_DIR, PREDICTIONS_DIR
+
+log = get_logger("prediction_index")
+
+INDEX_FILE = DATA_DIR / "predictions.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    date TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    model TEXT,
+    model_display_name TEXT,
+    PRIMARY KEY (date, slug)
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    date TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    prediction_id TEXT,
+    model TEXT,
+    model_display_name TEXT,
+    ticker TEXT,
+    direction TEXT,
+    timeframe TEXT,
+    confidence REAL,
+    target_price REAL,
+    entry_price REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (date, slug, position)
+);
+CREATE INDEX IF NOT EXISTS predictions_id ON predictions (prediction_id);
+CREATE INDEX IF NOT EXISTS predictions_model_ticker ON predictions (model_display_name, ticker);
+CREATE INDEX IF NOT EXISTS predictions_ticker ON predictions (ticker, date);
+"""
+
+
+def connect() -> sqlite3.Connection:
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(INDEX_FILE, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _real(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def index_file(conn: sqlite3.Connection, date_str: str, path: Path, data: Optional[dict] = None):
+    """(Re)index one prediction file. *data* skips re-reading a payload just written."""
+    slug = path.stem
+    if data is None:
+        try:
+            data = load_json(path)
+        except Exception as e:
+            log.error(f"Could not load {path}: {e}")
+            data = {}
+    stat = path.stat()
+    model = data.get("model")
+    display = data.get("model_display_name", slug)
+
+    with conn:
+        conn.execute("DELETE FROM predictions WHERE date = ? AND slug = ?", (date_str, slug))
+        conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (date_str, slug, stat.st_size, stat.st_mtime_ns, model, display),
+        )
+        conn.executemany(
+            "INSERT INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    date_str, slug, i, pred.get("id"), model, display,
+                    pred.get("ticker"), pred.get("direction"), pred.get("timeframe"),
+                    _real(pred.get("confidence")), _real(pred.get("target_price")),
+                    _real(pred.get("current_price_at_prediction")),
+                    json.dumps(pred, ensure_ascii=False),
+                )
+                for i, pred in enumerate(data.get("predictions", []))
+            ],
+        )
+
+
+def sync_day(conn: sqlite3.Connection, date_str: str):
+    """Re-index whatever changed in one day's prediction directory."""
+    pred_dir = PREDICTIONS_DIR / date_str
+    on_disk = {}
+    if pred_dir.exists():
+        for path in pred_dir.glob("*.json"):
+            stat = path.stat()
+            on_disk[path.stem] = (path, stat.st_size, stat.st_mtime_ns)
+    indexed = {
+        row["slug"]: (row["size"], row["mtime_ns"])
+        for row in conn.execute("SELECT slug, size, mtime_ns FROM files WHERE date = ?", (date_str,))
+    }
+
+    for slug, (path, size, mtime_ns) in on_disk.items():
+        if indexed.get(slug) != (size, mtime_ns):
+            index_file(conn, date_str, path)
+    removed = set(indexed) - set(on_disk)
+    if removed:
+        with conn:
+            for slug in removed:
+                conn.execute("DELETE FROM files WHERE date = ? AND slug = ?", (date_str, slug))
+                conn.execute("DELETE FROM predictions WHERE date = ? AND slug = ?", (date_str, slug))
+
+
+def sync_all(conn: sqlite3.Connection):
+    """Bring every day in line with disk (listing + stat per file, parse only changes)."""
+    days = {p.name for p in PREDICTIONS_DIR.iterdir() if p.is_dir()} if PREDICTIONS_DIR.exists() else set()
+    days |= {row["date"] for row in conn.execute("SELECT DISTINCT date FROM files")}
+    for date_str in sorted(days):
+        sync_day(conn, date_str)
+
+
+def add_file(date_str: str, path: Path, data: dict):
+    """Index a prediction file that was just written."""
+    conn = connect()
+    try:
+        index_file(conn, date_str, path, data)
+    finally:
+        conn.close()
+
+
+def _rows_to_dicts(rows) -> list[dict]:
+    return [
+        {
+            "date": row["date"],
+            "slug": row["slug"],
+            "model": row["model"],
+            "model_display_name": row["model_display_name"],
+            "prediction": json.loads(row["data"]),
+        }
+        for row in rows
+    ]
+
+
+def day_predictions(date_str: str) -> list[dict]:
+    """A day's predictions in file order, as ``{"date", "slug", "model", "model_display_name", "prediction"}``."""
+    conn = connect()
+    try:
+        sync_day(conn, date_str)
+        rows = conn.execute(
+            "SELECT * FROM predictions WHERE date = ? ORDER BY slug, position", (date_str,)
+        ).fetchall()
+        return _rows_to_dicts(rows)
+    finally:
+        conn.close()
+
+
+def query(model: Optional[str] = None, ticker: Optional[str] = None,
+          start: Optional[str] = None, end: Optional[str] = None) -> list[dict]:
+    """Predictions across days, filtered by display name, ticker and date range (inclusive)."""
+    clauses, params = [], []
+    for column, op, value in (
+        ("model_display_name", "=", model),
+        ("ticker", "=", ticker),
+        ("date", ">=", start),
+        ("date", "<=", end),
+    ):
+        if value is not None:
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = connect()
+    try:
+        sync_all(conn)
+        rows = conn.execute(
+            f"SELECT * FROM predictions {where} ORDER BY date, slug, position", params
+        ).fetchall()
+        return _rows_to_dicts(rows)
+    finally:
+        conn.close()
+
+
+def entry_prices() -> dict:
+    """prediction_id -> current_price_at_prediction across all days."""
+    conn = connect()
+    try:
+        sync_all(conn)
+        return {
+            row["prediction_id"]: row["entry_price"]
+            for row in conn.execute("SELECT prediction_id, entry_price FROM predictions")
+        }
+    finally:
+        conn.close()
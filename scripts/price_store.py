@@ -0,0 +1,226 @@
+"""Local OHLCV price store: one memory-mapped NumPy file per ticker.
+
+Each file under data/prices/ holds a dense (calendar day x column) float64
+array starting at STORE_EPOCH, so looking up a (ticker, date) bar is a single
+row index. Non-trading days are NaN. The COVERED column records which days
+have already been downloaded (traded or not), so only missing date ranges ever
+go back to Yahoo. Today's bar is never marked covered because it may still be
+in progress.
+
+Symbols here are yfinance symbols (e.g. ``^VIX``); ticker aliasing stays in
+market_data.
+"""
+
+import os
+from datetime import date, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from bars import session_dates
+from utils import get_logger, is_market_open, today_et, PRICES_DIR
+
+log = get_logger("price_store")
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+COVERED = len(FIELDS)
+N_COLS = len(FIELDS) + 1
+STORE_EPOCH = date(2025, 1, 1)
+DOWNLOAD_CHUNK_SIZE = 40  # tickers per yf.download call
+
+_cache = {}  # symbol -> array, invalidated whenever the file is rewritten
+
+
+def _path(symbol: str):
+    return PRICES_DIR / f"{symbol.replace('^', '_')}.npy"
+
+
+def _row(d: date) -> int:
+    return (d - STORE_EPOCH).days
+
+
+def _row_date(row: int) -> date:
+    return STORE_EPOCH + timedelta(days=int(row))
+
+
+def load(symbol: str) -> Optional[np.ndarray]:
+    """Return the symbol's read-only memory-mapped array, or None if never fetched."""
+    if symbol in _cache:
+        return _cache[symbol]
+    path = _path(symbol)
+    if not path.exists():
+        return None
+    try:
+        arr = np.load(path, mmap_mode="r")
+    except Exception as e:
+        log.warning(f"Corrupt price file for {symbol}, ignoring: {e}")
+        return None
+    _cache[symbol] = arr
+    return arr
+
+
+def _save(symbol: str, arr: np.ndarray):
+    """Write atomically so concurrent readers never see a half-written file."""
+    PRICES_DIR.mkdir(parents=True, exist_ok=True)
+    path = _path(symbol)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp, arr)
+    os.replace(tmp, path)
+    _cache.pop(symbol, None)
+
+
+def missing_range(symbol: str, start: date, end: date) -> Optional[tuple[date, date]]:
+    """Return the smallest (first, last) span of uncovered days in [start, end], or None.
+
+    Days before STORE_EPOCH can't be stored and are never reported missing.
+    """
+    start = max(start, STORE_EPOCH)
+    if end < start:
+        return None
+    arr = load(symbol)
+    lo, hi = _row(start), _row(end)
+    covered = np.zeros(hi - lo + 1, dtype=bool)
+    if arr is not None and lo < len(arr):
+        top = min(hi + 1, len(arr))
+        covered[: top - lo] = arr[lo:top, COVERED] == 1.0
+    today_row = _row(today_et())
+    if lo <= today_row <= hi:
+        covered[today_row - lo] = False
+    gaps = np.flatnonzero(~covered)
+    if not gaps.size:
+        return None
+    return _row_date(lo + gaps[0]), _row_date(lo + gaps[-1])
+
+
+def _frame_for(data: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
+    if data is None or data.empty:
+        return None
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return None
+        frame = data[symbol]
+    else:
+        frame = data
+    frame = frame.dropna(how="all")
+    return frame if not frame.empty else None
+
+
+def write_frame(symbol: str, frame: pd.DataFrame, span: tuple[date, date]):
+    """Merge a downloaded daily frame into the store and mark *span* as covered."""
+    days = (session_dates(frame.index) - pd.Timestamp(STORE_EPOCH)).days.to_numpy()
+    keep = days >= 0
+    lo, hi = max(_row(span[0]), 0), _row(span[1])
+
+    existing = load(symbol)
+    size = max(hi + 1, len(existing) if existing is not None else 0)
+    if keep.any():
+        size = max(size, int(days[keep].max()) + 1)
+    arr = np.full((size, N_COLS), np.nan)
+    if existing is not None:
+        arr[: len(existing)] = existing
+
+    for col, field in enumerate(FIELDS):
+        if field in frame.columns:
+            arr[days[keep], col] = frame[field].to_numpy(dtype=float)[keep]
+
+    today_row = _row(today_et())
+    covered_hi = min(hi, today_row - 1)
+    if covered_hi >= lo:
+        arr[lo:covered_hi + 1, COVERED] = 1.0
+    _save(symbol, arr)
+
+
+def fill(symbols: list[str], start: date, end: date) -> set[str]:
+    """Download whatever the store is missing for *symbols* over [start, end].
+
+    Symbols with gaps go out in bulk ``yf.download`` calls of up to
+    DOWNLOAD_CHUNK_SIZE tickers, each over the union of its tickers' gaps.
+    Returns the set of symbols whose download failed.
+    """
+    gaps = {}
+    for symbol in dict.fromkeys(symbols):
+        span = missing_range(symbol, start, end)
+        if span:
+            gaps[symbol] = span
+    if not gaps:
+        return set()
+
+    still_missing = set()
+    needed = list(gaps)
+    for i in range(0, len(needed), DOWNLOAD_CHUNK_SIZE):
+        chunk = {sym: gaps[sym] for sym in needed[i:i + DOWNLOAD_CHUNK_SIZE]}
+        still_missing |= _download_chunk(chunk)
+    return still_missing
+
+
+def _download_chunk(gaps: dict) -> set[str]:
+    span_start = min(s for s, _ in gaps.values())
+    span_end = max(e for _, e in gaps.values())
+    needed = list(gaps)
+    log.info(f"Downloading {len(needed)} tickers {span_start} → {span_end} into price store")
+    try:
+        data = yf.download(
+            needed,
+            start=span_start.isoformat(),
+            end=(span_end + timedelta(days=1)).isoformat(),
+            progress=False,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+        )
+    except Exception as e:
+        log.error(f"Bulk price download failed: {e}")
+        return set(needed)
+
+    # An empty answer is only suspicious if the span holds a completed session.
+    days = pd.date_range(span_start, min(span_end, today_et() - timedelta(days=1))).date
+    has_session = any(is_market_open(d) for d in days)
+
+    still_missing = set()
+    for symbol in needed:
+        frame = _frame_for(data, symbol)
+        if frame is None:
+            if has_session:
+                # Leave uncovered so a transient failure isn't cached as "no data".
+                still_missing.add(symbol)
+                continue
+            frame = pd.DataFrame(columns=list(FIELDS), index=pd.DatetimeIndex([]))
+        write_frame(symbol, frame, (span_start, span_end))
+    return still_missing
+
+
+def get_value(symbol: str, d: date, field: str) -> Optional[float]:
+    """O(1) lookup of one field for one session; None if absent."""
+    arr = load(symbol)
+    row = _row(d)
+    if arr is None or row < 0 or row >= len(arr):
+        return None
+    value = arr[row, FIELDS.index(field)]
+    return None if np.isnan(value) else float(value)
+
+
+def closes(symbol: str, start: date, end: date) -> pd.Series:
+    """Non-NaN closes in [start, end] as a date-indexed Series."""
+    arr = load(symbol)
+    if arr is None:
+        return pd.Series(dtype=float)
+    lo, hi = max(_row(start), 0), min(_row(end), len(arr) - 1)
+    if hi < lo:
+        return pd.Series(dtype=float)
+    col = np.asarray(arr[lo:hi + 1, FIELDS.index("Close")])
+    present = np.flatnonzero(~np.isnan(col))
+    return pd.Series(col[present], index=[_row_date(lo + i) for i in present])
+
+
+def frame(symbol: str, start: date, end: date) -> pd.DataFrame:
+    """Stored sessions in [start, end] as a daily OHLCV frame (empty if none)."""
+    arr = load(symbol)
+    lo, hi = max(_row(start), 0), _row(end)
+    if arr is None or lo >= len(arr) or hi < lo:
+        return pd.DataFrame(columns=list(FIELDS))
+    block = np.asarray(arr[lo:min(hi + 1, len(arr)), : len(FIELDS)])
+    present = np.flatnonzero(~np.isnan(block).all(axis=1))
+    index = pd.DatetimeIndex([pd.Timestamp(_row_date(lo + i)) for i in present])
+    return pd.DataFrame(block[present], index=index, columns=list(FIELDS))
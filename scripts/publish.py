@@ -0,0 +1,239 @@
+"""
+Publish stage: mirror data/ into public/data/ for the frontend.
+
+Replaces the workflows' ``cp -r data/... public/data/``. Published files are
+hardlinked (copied only across filesystems), and data/publish_manifest.json
+records each source's size, mtime and hash, so a rerun where nothing changed
+costs one stat() per file and no reads or writes. Files that left data/ are
+removed from public/data/.
+
+With --minify, public/data/ gets compact JSON instead of links (data/ keeps
+the pretty-printed copies for human diffs). --compress adds .gz and .br
+siblings next to each published file for hosts that serve precompressed
+assets; GitHub Pages does not, so the Pages deploy leaves it off. .br needs
+the optional ``brotli`` package. Both modes log, per artifact, the bytes
+saved against the pretty-printed source.
+
+Usage:
+    python publish.py                       # incremental hardlink mirror
+    python publish.py --minify              # compact JSON in public/data/
+    python publish.py --minify --compress   # plus .gz/.br siblings (static hosts that serve them)
+    python publish.py --full                # ignore the manifest and re-check every file
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import (
+    content_hash,
+    get_logger,
+    load_json,
+    mirror_file,
+    save_json,
+    write_atomic,
+    DATA_DIR,
+    PUBLIC_DATA_DIR,
+)
+
+log = get_logger("publish")
+
+MANIFEST_FILE = DATA_DIR / "publish_manifest.json"
+MANIFEST_VERSION = 2
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+# Everything the frontend fetches, relative to data/.
+PUBLISH_GLOBS = (
+    "predictions/*/*.json",
+    "scores/*.json",
+    "summaries/daily/*.json",
+    "summaries/weekly/*.json",
+    "leaderboard.json",
+    "simulator.json",
+    "portfolio.json",
+    "winner-today.json",
+    "analytics.json",
+    "weeks-index.json",
+    "scoring_rules.json",
+)
+
+
+def published_files(root: Path = DATA_DIR) -> list[str]:
+    """Publishable paths under *root*, relative to it (POSIX separators)."""
+    found = set()
+    for pattern in PUBLISH_GLOBS:
+        found.update(p.relative_to(root).as_posix() for p in root.glob(pattern) if p.is_file())
+    return sorted(found)
+
+
+def _load_manifest(mode: dict) -> dict:
+    if not MANIFEST_FILE.exists():
+        return {}
+    try:
+        manifest = load_json(MANIFEST_FILE)
+    except Exception as e:
+        log.warning(f"Unreadable publish manifest, re-checking everything: {e}")
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("mode") != mode:
+        return {}
+    return manifest.get("files", {})
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def _unchanged(entry: dict, src_stat: os.stat_result, dst: Path) -> bool:
+    """Both sides still look exactly as they did when *entry* was recorded."""
+    if not entry or (entry["size"], entry["mtime_ns"]) != (src_stat.st_size, src_stat.st_mtime_ns):
+        return False
+    try:
+        if dst.stat().st_mtime_ns != entry["public_mtime_ns"]:
+            return False
+    except FileNotFoundError:
+        return False
+    return all(_sibling(dst, suffix).exists() for suffix in entry["compressed"])
+
+
+def minify_json(raw: bytes) -> bytes:
+    return json.dumps(json.loads(raw), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compress(payload: bytes) -> dict:
+    """Precompressed variants by file suffix (gzip always, brotli if installed)."""
+    out = {".gz": gzip.compress(payload, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        out[".br"] = brotli.compress(payload, quality=11)
+    return out
+
+
+def publish(full: bool = False, minify: bool = False, precompress: bool = False) -> dict:
+    """Bring public/data in line with data/. Returns per-outcome file counts."""
+    mode = {"minify": minify, "compress": precompress}
+    previous = {} if full else _load_manifest(mode)
+    files = {}
+    stats = {"unchanged": 0, "linked": 0, "updated": 0, "removed": 0}
+    if precompress and brotli is None:
+        log.warning("brotli not installed — writing .gz siblings only")
+
+    for rel in published_files():
+        src, dst = DATA_DIR / rel, PUBLIC_DATA_DIR / rel
+        src_stat = src.stat()
+        if _unchanged(previous.get(rel), src_stat, dst):
+            files[rel] = previous[rel]
+            stats["unchanged"] += 1
+            continue
+
+        sha = content_hash(src)
+        if minify:
+            payload = minify_json(src.read_bytes())
+            stats["updated" if write_atomic(dst, payload, skip_unchanged=True) else "unchanged"] += 1
+        else:
+            payload = None
+            same_content = dst.exists() and dst.stat().st_size == src_stat.st_size and content_hash(dst) == sha
+            relinked = mirror_file(src, dst)
+            stats["updated" if not same_content else "linked" if relinked else "unchanged"] += 1
+
+        compressed = {}
+        if precompress:
+            for suffix, blob in compress(payload if payload is not None else dst.read_bytes()).items():
+                write_atomic(_sibling(dst, suffix), blob, skip_unchanged=True)
+                compressed[suffix] = len(blob)
+        else:
+            for suffix in COMPRESSED_SUFFIXES:
+                _sibling(dst, suffix).unlink(missing_ok=True)
+
+        dst_stat = dst.stat()
+        files[rel] = {
+            "size": src_stat.st_size,
+            "mtime_ns": src_stat.st_mtime_ns,
+            "sha1": sha,
+            "public_size": dst_stat.st_size,
+            "public_mtime_ns": dst_stat.st_mtime_ns,
+            "compressed": compressed,
+        }
+
+    for rel in sorted((set(previous) | set(published_files(PUBLIC_DATA_DIR))) - set(files)):
+        (PUBLIC_DATA_DIR / rel).unlink(missing_ok=True)
+        for suffix in COMPRESSED_SUFFIXES:
+            _sibling(PUBLIC_DATA_DIR / rel, suffix).unlink(missing_ok=True)
+        stats["removed"] += 1
+
+    save_json(MANIFEST_FILE, {"version": MANIFEST_VERSION, "mode": mode, "files": files},
+              indent=None, skip_unchanged=True)
+    log.info(
+        f"Published {len(files)} files: {stats['updated']} updated, {stats['linked']} relinked, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed"
+    )
+    if minify or precompress:
+        report_savings(files)
+    return stats
+
+
+# ── Size report ────────────────────────────────────────────────────────────────
+def _artifact(rel: str) -> str:
+    """Report bucket: top-level files by name, directories as a whole."""
+    head, _, rest = rel.partition("/")
+    return f"{head}/" if rest else head
+
+
+def report_savings(files: dict) -> list[dict]:
+    """Bytes per artifact: pretty source vs published vs .gz/.br siblings."""
+    totals = defaultdict(lambda: {"files": 0, "source": 0, "published": 0, ".gz": 0, ".br": 0})
+    for rel, entry in files.items():
+        for key in (_artifact(rel), "total"):
+            row = totals[key]
+            row["files"] += 1
+            row["source"] += entry["size"]
+            row["published"] += entry["public_size"]
+            for suffix, size in entry["compressed"].items():
+                row[suffix] += size
+
+    def pct(part, whole):
+        return f"{100 * (1 - part / whole):.0f}%" if whole and part else "—"
+
+    rows = []
+    for name in sorted(totals, key=lambda k: (k == "total", -totals[k]["source"])):
+        row = totals[name]
+        rows.append({"artifact": name, **row})
+        log.info(
+            f"{name:<22} {row['source']:>10,} B → {row['published']:>10,} B ({pct(row['published'], row['source'])})"
+            f"  gz {row['.gz']:>9,} ({pct(row['.gz'], row['source'])})"
+            f"  br {row['.br']:>9,} ({pct(row['.br'], row['source'])})"
+        )
+
+    summary_file = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary_file:
+        with open(summary_file, "a") as f:
+            f.write("## Published data size\n\n")
+            f.write("| Artifact | Files | Pretty | Published | .gz | .br |\n|---|---:|---:|---:|---:|---:|\n")
+            for row in rows:
+                f.write(
+                    f"| {row['artifact']} | {row['files']} | {row['source']:,} | {row['published']:,} "
+                    f"({pct(row['published'], row['source'])}) | {row['.gz']:,} | {row['.br']:,} |\n"
+                )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror data/ into public/data/")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-check every file")
+    parser.add_argument("--minify", action="store_true", help="Publish compact JSON instead of hardlinks")
+    parser.add_argument("--compress", action="store_true", help="Also write .gz and .br siblings")
+    args = parser.parse_args()
+    publish(full=args.full, minify=args.minify, precompress=args.compress)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Columnar archive of every score result, rebuilt from data/scores/ on demand.
+
+All results (resolved and unresolved) live in one NumPy structured array,
+memory-mapped on read, with string columns dictionary-encoded as int32 codes.
+A JSON sidecar holds the dictionaries, the name of the current array file and
+the content hash, mtime and size of every score file the archive reflects.
+
+Writes never modify a published array: a new ``results.<generation>.npy`` is
+written, then the sidecar is atomically replaced to point at it, so readers
+always see a consistent (array, dictionaries) pair. Dictionaries only ever
+grow, so codes are stable across generations.
+
+The archive lives in data/archive/ (gitignored; the workflows restore it with
+actions/cache). ``load()`` brings it in line with the score files first: it
+stats every file, re-hashes only those whose mtime or size moved, and
+re-parses only those whose hash changed. A fresh checkout rebuilds it once;
+after that, loads with no score changes read no score files and just mmap it.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import content_hash, get_logger, load_json, save_json, DATA_DIR, SCORES_DIR
+
+log = get_logger("results_archive")
+
+ARCHIVE_DIR = DATA_DIR / "archive"
+SIDECAR_FILE = ARCHIVE_DIR / "results.json"
+ARCHIVE_VERSION = 1
+
+# "date" is the score file's stem. RECORD_FIELDS is the score-file key order;
+# OPTIONAL_FIELDS only exist on horizon results.
+STRING_COLUMNS = (
+    "prediction_id", "model", "model_display_name", "ticker",
+    "predicted_direction", "actual_direction", "status", "timeframe",
+    "date", "prediction_date",
+)
+FLOAT_COLUMNS = ("predicted_target", "actual_close", "target_accuracy", "confidence_at_prediction", "score")
+RECORD_FIELDS = (
+    "prediction_id", "model", "model_display_name", "ticker", "predicted_direction",
+    "predicted_target", "actual_close", "actual_direction", "direction_correct",
+    "target_accuracy", "confidence_at_prediction", "score", "status",
+)
+OPTIONAL_FIELDS = ("timeframe", "prediction_date")
+
+DTYPE = np.dtype(
+    [(name, "i4") for name in STRING_COLUMNS]
+    + [(name, "f8") for name in FLOAT_COLUMNS]
+    + [("direction_correct", "i1")]  # -1 = None
+)
+MISSING = -1
+
+
+class ResultsArchive:
+    """Read-only view over one archive generation."""
+
+    def __init__(self, rows: np.ndarray, dictionaries: dict, files: dict):
+        self.rows = rows
+        self.dictionaries = dictionaries
+        self.files = files  # score file stem -> content hash
+        self._lookup = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def code(self, column: str, value: str) -> int:
+        """Dictionary code for *value* in *column*, or MISSING if never seen."""
+        if column not in self._lookup:
+            self._lookup[column] = {v: i for i, v in enumerate(self.dictionaries[column])}
+        return self._lookup[column].get(value, MISSING)
+
+    def decode(self, column: str, codes: np.ndarray) -> list:
+        values = self.dictionaries[column]
+        return [values[c] if c != MISSING else None for c in codes.tolist()]
+
+    def day(self, date_str: str) -> np.ndarray:
+        """Rows for one scoring day, in score-file order."""
+        return self.rows[self.rows["date"] == self.code("date", date_str)]
+
+    def dates(self) -> list[str]:
+        """Scoring days present in the archive, oldest first."""
+        return sorted(self.decode("date", np.unique(self.rows["date"])))
+
+    def records(self, rows: np.ndarray, resolved_only: bool = False) -> list[dict]:
+        """Materialize rows back into score-file result dicts."""
+        if resolved_only:
+            rows = rows[rows["status"] == self.code("status", "resolved")]
+        columns = {name: self.decode(name, rows[name]) for name in STRING_COLUMNS}
+        for name in FLOAT_COLUMNS:
+            columns[name] = [None if v != v else v for v in rows[name].tolist()]
+        columns["direction_correct"] = [None if v == MISSING else bool(v) for v in rows["direction_correct"].tolist()]
+
+        out = []
+        for i in range(len(rows)):
+            rec = {name: columns[name][i] for name in RECORD_FIELDS}
+            for name in OPTIONAL_FIELDS:
+                if columns[name][i] is not None:
+                    rec[name] = columns[name][i]
+            out.append(rec)
+        return out
+
+    def iter_days(self, resolved_only: bool = False):
+        """Yield (date, result dicts) per scoring day, oldest first."""
+        for date_str in self.dates():
+            yield date_str, self.records(self.day(date_str), resolved_only)
+
+
+# ── Reading ────────────────────────────────────────────────────────────────────
+def _empty_sidecar() -> dict:
+    return {
+        "version": ARCHIVE_VERSION,
+        "array": None,
+        "dictionaries": {name: [] for name in STRING_COLUMNS},
+        "files": {},
+        "stats": {},
+    }
+
+
+def _read_sidecar() -> dict:
+    if not SIDECAR_FILE.exists():
+        return _empty_sidecar()
+    try:
+        sidecar = load_json(SIDECAR_FILE)
+    except Exception as e:
+        log.warning(f"Unreadable archive sidecar, rebuilding: {e}")
+        return _empty_sidecar()
+    if sidecar.get("version") != ARCHIVE_VERSION:
+        return _empty_sidecar()
+    sidecar.setdefault("stats", {})  # sidecars from before stats were recorded
+    return sidecar
+
+
+def _open(sidecar: dict) -> ResultsArchive:
+    """Memory-map the sidecar's array (re-reading the sidecar if a writer just swapped it)."""
+    for _attempt in range(3):
+        if not sidecar["array"]:
+            break
+        try:
+            rows = np.load(ARCHIVE_DIR / sidecar["array"], mmap_mode="r")
+        except FileNotFoundError:
+            sidecar = _read_sidecar()
+            continue
+        return ResultsArchive(rows, sidecar["dictionaries"], sidecar["files"])
+    empty = _empty_sidecar()
+    return ResultsArchive(np.zeros(0, dtype=DTYPE), empty["dictionaries"], empty["files"])
+
+
+# ── Writing ────────────────────────────────────────────────────────────────────
+def _encode(results: list[dict], date_str: str, dictionaries: dict) -> np.ndarray:
+    lookups = {name: {v: i for i, v in enumerate(values)} for name, values in dictionaries.items()}
+
+    def code(column, value):
+        if value is None:
+            return MISSING
+        table = lookups[column]
+        if value not in table:
+            table[value] = len(dictionaries[column])
+            dictionaries[column].append(value)
+        return table[value]
+
+    rows = np.zeros(len(results), dtype=DTYPE)
+    for name in STRING_COLUMNS:
+        rows[name] = [code(name, date_str if name == "date" else r.get(name)) for r in results]
+    for name in FLOAT_COLUMNS:
+        rows[name] = [np.nan if r.get(name) is None else r[name] for r in results]
+    rows["direction_correct"] = [
+        MISSING if r.get("direction_correct") is None else int(r["direction_correct"]) for r in results
+    ]
+    return rows
+
+
+def _stat(path: Path) -> list:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _publish(rows: np.ndarray, sidecar: dict):
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    old_array = sidecar["array"]
+    generation = f"results.{os.urandom(6).hex()}.npy"
+    np.save(ARCHIVE_DIR / generation, rows)
+    sidecar["array"] = generation
+
+    save_json(SIDECAR_FILE, sidecar, indent=None)  # atomic swap to the new generation
+    if old_array and old_array != generation:
+        (ARCHIVE_DIR / old_array).unlink(missing_ok=True)
+
+
+def _apply(changed: dict, removed: set, sidecar: dict, current: ResultsArchive):
+    """Replace the rows of *changed* ({stem: path}) and drop *removed* stems."""
+    dictionaries = sidecar["dictionaries"]
+    keep = np.asarray(current.rows)
+    stale = [current.code("date", stem) for stem in set(changed) | removed]
+    keep = keep[~np.isin(keep["date"], stale)]
+
+    parts = [keep]
+    for stem, path in sorted(changed.items()):
+        try:
+            results = load_json(path).get("results", [])
+        except Exception as e:
+            log.error(f"Could not load {path}: {e}")
+            results = []
+        parts.append(_encode(results, stem, dictionaries))
+        sidecar["stats"][stem] = _stat(path)
+        sidecar["files"][stem] = content_hash(path)
+    for stem in removed:
+        sidecar["files"].pop(stem, None)
+        sidecar["stats"].pop(stem, None)
+
+    rows = np.concatenate(parts)
+    day_names = np.array(dictionaries["date"] or [""], dtype=str)
+    rows = rows[np.argsort(day_names[rows["date"]], kind="stable")]
+    _publish(rows, sidecar)
+
+
+def load(sync: bool = True) -> ResultsArchive:
+    """Open the archive, first folding in any added, changed or removed score files."""
+    sidecar = _read_sidecar()
+    archive = _open(sidecar)
+    if not sync:
+        return archive
+
+    paths = {path.stem: path for path in sorted(SCORES_DIR.glob("*.json"))}
+    stats = {stem: _stat(path) for stem, path in paths.items()}
+    moved = [stem for stem in paths if sidecar["stats"].get(stem) != stats[stem]]
+    changed = {stem: paths[stem] for stem in moved if sidecar["files"].get(stem) != content_hash(paths[stem])}
+    removed = set(sidecar["files"]) - set(paths)
+    if not changed and not removed:
+        if moved:  # touched but identical (e.g. a fresh checkout): just record the new stats
+            sidecar["stats"].update({stem: stats[stem] for stem in moved})
+            save_json(SIDECAR_FILE, sidecar, indent=None)
+        return archive
+
+    log.info(f"Updating results archive ({len(changed)} changed, {len(removed)} removed score files)")
+    _apply(changed, removed, sidecar, archive)
+    return _open(_read_sidecar())
+
+
+def write_day(path: Path) -> Optional[ResultsArchive]:
+    """Fold a just-written score file into the archive."""
+    sidecar = _read_sidecar()
+    if not sidecar["array"] and any(SCORES_DIR.glob("*.json")):
+        # No archive yet — build it from everything instead of just this day.
+        return load()
+    _apply({path.stem: path}, set(), sidecar, _open(sidecar))
+    return _open(_read_sidecar())
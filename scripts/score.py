@@ -3,18 +3,28 @@ Evening script: score predictions against actual market closes.
 Run at 5:30 PM ET on weekdays after market close.
 
 Usage:
-    python score.py [--date YYYY-MM-DD]
+    python score.py [--date YYYY-MM-DD] [--rescore] [--full-rebuild]
+    python score.py --from YYYY-MM-DD [--to YYYY-MM-DD] [--rescore] [--workers N]
 """
 
 import argparse
+import copy
+import os
 import sys
-from datetime import date, datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent))
 
-from market_data import get_batch_closing_prices
+import pending
+import prediction_index
+import results_archive
+import scoring_rules
+from market_data import get_batch_closing_prices, prefetch_closes
 from utils import (
     ensure_dirs,
     get_logger,
@@ -23,27 +33,174 @@ from utils import (
     save_json,
     sync_to_public,
     today_et,
-    PREDICTIONS_DIR,
     SCORES_DIR,
     LEADERBOARD_FILE,
+    LEADERBOARD_STATE_FILE,
 )
 
 log = get_logger("score")
 
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
 
 def compute_score(direction_correct: bool, confidence: float, target_accuracy: float) -> float:
     """
-    Scoring formula:
+    Scoring formula (scoring_rules.DEFAULT_RULE):
     - Direction correct: +1 * confidence
     - Direction wrong: -1 * confidence
     - Bonus: +0.5 if actual close within 1% of target price
     """
-    base = confidence if direction_correct else -confidence
-    bonus = 0.5 if (target_accuracy >= 0.99) and direction_correct else 0.0
-    return round(base + bonus, 4)
+    inputs = {
+        "direction_correct": np.array([direction_correct], dtype=bool),
+        "confidence": np.array([confidence], dtype=float),
+        "target_accuracy": np.array([target_accuracy], dtype=float),
+    }
+    return round(float(scoring_rules.evaluate(scoring_rules.DEFAULT_RULE, inputs)[0]), 4)
+
+
+# ── Batch scoring kernel ───────────────────────────────────────────────────────
+def round_like_builtin(values: np.ndarray, ndigits: int = 4) -> np.ndarray:
+    """Vectorized round() that agrees with Python's builtin element for element.
+
+    np.round scales by 10**ndigits before rounding, which can tip exact decimal
+    ties the other way (0.91125 -> 0.9112 instead of 0.9113). Only elements
+    that sit on a tie after scaling are redone with round().
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.round(values, ndigits)
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * 10 ** ndigits
+        near_tie = np.isfinite(scaled) & (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in np.flatnonzero(near_tie):
+        out.flat[i] = round(float(values.flat[i]), ndigits)
+    return out
+
+
+def score_batch(directions, entries, targets, confidences, closes) -> dict:
+    """Score aligned arrays of predictions in one vectorized pass.
+
+    *closes* holds NaN where no price is available; those rows come back with
+    ``resolved`` False and their other values are meaningless. Returns arrays
+    keyed ``resolved``, ``actual_direction``, ``direction_correct``,
+    ``target_accuracy`` and ``score`` (under scoring_rules.DEFAULT_RULE),
+    matching compute_score exactly.
+    """
+    directions = np.asarray(directions)
+    entries = np.asarray(entries, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    confidences = np.asarray(confidences, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+
+    resolved = ~np.isnan(closes)
+    actual_up = closes >= entries
+    direction_correct = (directions == "up") == actual_up
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_accuracy = 1 - np.abs(closes - targets) / targets
+    target_accuracy = np.where(targets != 0, round_like_builtin(raw_accuracy), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        actual_return = (closes - entries) / entries
+    scores = scoring_rules.evaluate(scoring_rules.DEFAULT_RULE, {
+        "direction_correct": direction_correct,
+        "confidence": confidences,
+        "target_accuracy": target_accuracy,
+        "actual_return": actual_return,
+    })
+    return {
+        "resolved": resolved,
+        "actual_direction": np.where(actual_up, "up", "down"),
+        "direction_correct": direction_correct,
+        "target_accuracy": target_accuracy,
+        "score": round_like_builtin(scores),
+    }
+
+
+def score_items(items: list[dict], closes: list[Optional[float]]) -> list[dict]:
+    """Score ``{"prediction", "model", "model_display_name"}`` items against aligned closes.
+
+    Items may span any number of days, so the whole history can be rescored in
+    one call. Returns score records in item order.
+    """
+    preds = [item["prediction"] for item in items]
+    batch = score_batch(
+        [p["direction"] for p in preds],
+        [p["current_price_at_prediction"] for p in preds],
+        [p["target_price"] for p in preds],
+        [p["confidence"] for p in preds],
+        [np.nan if c is None else c for c in closes],
+    )
+    return [_score_record(item, close, batch, i) for i, (item, close) in enumerate(zip(items, closes))]
+
+
+def _score_record(item: dict, actual_close: Optional[float], batch: dict, i: int) -> dict:
+    pred = item["prediction"]
+    resolved = bool(batch["resolved"][i])
+    return {
+        "prediction_id": pred["id"],
+        "model": item["model"],
+        "model_display_name": item["model_display_name"],
+        "ticker": pred["ticker"],
+        "predicted_direction": pred["direction"],
+        "predicted_target": pred["target_price"],
+        "actual_close": actual_close if resolved else None,
+        "actual_direction": str(batch["actual_direction"][i]) if resolved else None,
+        "direction_correct": bool(batch["direction_correct"][i]) if resolved else None,
+        "target_accuracy": float(batch["target_accuracy"][i]) if resolved else None,
+        "confidence_at_prediction": pred["confidence"],
+        "score": float(batch["score"][i]) if resolved else 0.0,
+        "status": "resolved" if resolved else "unresolved",
+        **_horizon_fields(item),
+    }
+
+
+def _horizon_fields(item: dict) -> dict:
+    """Extra keys that mark a result as resolving an earlier multi-day prediction."""
+    if "prediction_date" not in item:
+        return {}
+    return {"timeframe": item["prediction"]["timeframe"], "prediction_date": item["prediction_date"]}
+
+
+def _collect_to_score(date_str: str, resolved_ids: set) -> Optional[list[dict]]:
+    """Predictions to score on *date_str*, or None if there is nothing for that day.
+
+    That is the day's end_of_day predictions plus multi-day ones whose horizon
+    closes that day, minus anything in *resolved_ids*.
+    """
+    d = datetime.strptime(date_str, "%Y-%m-%d").date()
+    rows = prediction_index.day_predictions(date_str)
+    due = pending.load_bucket(d)
+    if not rows and not due:
+        return None
+
+    to_score = []
+    for row in rows:
+        pred = row["prediction"]
+        if pred["id"] in resolved_ids:
+            continue
+        if pred.get("timeframe") != "end_of_day":
+            # Queued in data/pending/ at generation time
+            continue
+        to_score.append({
+            "prediction": pred,
+            "model": row["model"],
+            "model_display_name": row["model_display_name"],
+        })
+
+    horizon_items = [e for e in due if e["prediction"]["id"] not in resolved_ids]
+    if horizon_items:
+        log.info(f"Resolving {len(horizon_items)} end_of_week/end_of_month prediction(s) due {date_str}")
+    to_score.extend(horizon_items)
+    return to_score
+
 
+def score_date(date_str: str, rescore: bool = False, archive: bool = True) -> Optional[dict]:
+    """Score one day and write data/scores/<date>.json.
 
-def score_date(date_str: str) -> Optional[dict]:
+    Already-resolved predictions are kept as-is unless *rescore* is set, in
+    which case the day is scored from scratch. The day is also folded into the
+    results archive unless *archive* is False (parallel range scoring syncs
+    the archive once afterwards instead).
+    """
     ensure_dirs()
 
     # Check if already scored
@@ -51,7 +208,7 @@ def score_date(date_str: str) -> Optional[dict]:
     existing_data = None
     resolved_ids = set()
     existing_results = []
-    if out_file.exists():
+    if out_file.exists() and not rescore:
         existing_data = load_json(out_file)
         existing_results = existing_data.get("results", [])
         resolved_ids = {
@@ -61,41 +218,13 @@ def score_date(date_str: str) -> Optional[dict]:
         }
         log.info(f"Existing scores found for {date_str}, will add unscored predictions")
 
-    pred_dir = PREDICTIONS_DIR / date_str
-    if not pred_dir.exists():
-        log.warning(f"No predictions directory for {date_str} — nothing to score")
-        return None
-
-    pred_files = list(pred_dir.glob("*.json"))
-    if not pred_files:
-        log.error(f"No prediction files in {pred_dir}")
+    to_score = _collect_to_score(date_str, resolved_ids)
+    if to_score is None:
+        log.warning(f"No predictions or pending horizons for {date_str} — nothing to score")
         return None
 
-    # Collect all end-of-day predictions that need scoring today
-    to_score = []
-    for pf in pred_files:
-        try:
-            data = load_json(pf)
-        except Exception as e:
-            log.error(f"Could not load {pf}: {e}")
-            continue
-
-        for pred in data.get("predictions", []):
-            pid = pred["id"]
-            if pid in resolved_ids:
-                continue
-            if pred.get("timeframe") != "end_of_day":
-                # End-of-week/month predictions scored on their respective day
-                log.info(f"Skipping {pid} (timeframe: {pred.get('timeframe')})")
-                continue
-            to_score.append({
-                "prediction": pred,
-                "model": data["model"],
-                "model_display_name": data["model_display_name"],
-            })
-
     if not to_score:
-        log.info(f"No new end_of_day predictions to score for {date_str}")
+        log.info(f"No new predictions to score for {date_str}")
         return existing_data
 
     # Fetch closing prices
@@ -107,58 +236,17 @@ def score_date(date_str: str) -> Optional[dict]:
     retry_ids = {item["prediction"]["id"] for item in to_score}
     results = [r for r in existing_results if r.get("prediction_id") not in retry_ids]
 
-    for item in to_score:
-        pred = item["prediction"]
-        ticker = pred["ticker"]
-        actual_close = closes.get(ticker)
-
-        if actual_close is None:
-            log.warning(f"No closing price for {ticker} — marking as unresolved")
-            results.append({
-                "prediction_id": pred["id"],
-                "model": item["model"],
-                "model_display_name": item["model_display_name"],
-                "ticker": ticker,
-                "predicted_direction": pred["direction"],
-                "predicted_target": pred["target_price"],
-                "actual_close": None,
-                "actual_direction": None,
-                "direction_correct": None,
-                "target_accuracy": None,
-                "confidence_at_prediction": pred["confidence"],
-                "score": 0.0,
-                "status": "unresolved",
-            })
+    records = score_items(to_score, [closes.get(item["prediction"]["ticker"]) for item in to_score])
+    for rec in records:
+        if rec["status"] != "resolved":
+            log.warning(f"No closing price for {rec['ticker']} — marking as unresolved")
             continue
-
-        entry_price = pred["current_price_at_prediction"]
-        actual_direction = "up" if actual_close >= entry_price else "down"
-        direction_correct = actual_direction == pred["direction"]
-        target_accuracy = round(
-            1 - abs(actual_close - pred["target_price"]) / pred["target_price"], 4
-        ) if pred["target_price"] != 0 else 0.0
-        score = compute_score(direction_correct, pred["confidence"], target_accuracy)
-
-        results.append({
-            "prediction_id": pred["id"],
-            "model": item["model"],
-            "model_display_name": item["model_display_name"],
-            "ticker": ticker,
-            "predicted_direction": pred["direction"],
-            "predicted_target": pred["target_price"],
-            "actual_close": actual_close,
-            "actual_direction": actual_direction,
-            "direction_correct": direction_correct,
-            "target_accuracy": target_accuracy,
-            "confidence_at_prediction": pred["confidence"],
-            "score": score,
-            "status": "resolved",
-        })
         log.info(
-            f"{item['model_display_name']} {ticker}: "
-            f"predicted {pred['direction']}, actual {actual_direction} "
-            f"({'✓' if direction_correct else '✗'}) score={score:+.2f}"
+            f"{rec['model_display_name']} {rec['ticker']}: "
+            f"predicted {rec['predicted_direction']}, actual {rec['actual_direction']} "
+            f"({'✓' if rec['direction_correct'] else '✗'}) score={rec['score']:+.2f}"
         )
+    results.extend(records)
 
     score_data = {
         "date": date_str,
@@ -169,117 +257,234 @@ def score_date(date_str: str) -> Optional[dict]:
     save_json(out_file, score_data)
     sync_to_public(out_file)
     log.info(f"Saved {len(results)} scored results to {out_file}")
+    if archive:
+        results_archive.write_day(out_file)
     return score_data
 
 
-def update_leaderboard(score_data: dict = None):
-    """Rebuild the leaderboard from ALL score files (fully idempotent).
+# ── Leaderboard ────────────────────────────────────────────────────────────────
+# The leaderboard is a left fold over every resolved result in (date,
+# prediction_id) order. LEADERBOARD_STATE_FILE checkpoints that fold as of the
+# second-newest score file, together with the content hash of every file it
+# covers, so a normal run only replays the newest day(s). If any covered file
+# changed or disappeared, the checkpoint is discarded and history is replayed.
+LEADERBOARD_STATE_VERSION = 1
 
-    Safe to call multiple times — always produces the same result for the
-    same set of score files on disk.  The optional *score_data* argument is
-    accepted for call-site compatibility but ignored; all data comes from
-    SCORES_DIR.
-    """
-    score_files = sorted(SCORES_DIR.glob("*.json"))
-    if not score_files:
-        log.warning("No score files found — nothing to update")
-        return
 
-    # Collect every resolved result with its date for chronological ordering
-    entries = []  # list of (date_str, prediction_id, result_dict)
-    for sf in score_files:
-        try:
-            data = load_json(sf)
-        except Exception as e:
-            log.error(f"Could not load {sf}: {e}")
-            continue
-        date_str = data.get("date", sf.stem)
-        for result in data.get("results", []):
-            if result.get("status") != "resolved":
-                continue
-            entries.append((date_str, result.get("prediction_id", ""), result))
-
-    # Sort chronologically (then by prediction_id for stable intra-day order)
-    entries.sort(key=lambda e: (e[0], e[1]))
-
-    # Build per-model stats
-    model_stats = {}   # display_name -> stats dict
-    conf_totals = {}   # display_name -> sum of confidences
-    weekly_data = {}   # (display_name, "YYYY-WNN") -> {score, preds, correct}
-
-    for date_str, _pid, result in entries:
-        name = result["model_display_name"]
-        if name not in model_stats:
-            model_stats[name] = {
-                "model_id": result["model"],
-                "model_display_name": name,
-                "total_predictions": 0,
-                "correct_directions": 0,
-                "direction_accuracy": 0.0,
-                "total_score": 0.0,
-                "avg_confidence": 0.0,
-                "current_streak": 0,
-                "best_streak": 0,
-                "worst_streak": 0,
-                "weekly_scores": [],
-            }
-            conf_totals[name] = 0.0
-        m = model_stats[name]
-        m["total_predictions"] += 1
-        if result["direction_correct"]:
-            m["correct_directions"] += 1
-        m["total_score"] = round(m["total_score"] + result["score"], 4)
-        conf_totals[name] += result.get("confidence_at_prediction", 0.0)
-
-        # Weekly accumulation
-        d = datetime.strptime(date_str, "%Y-%m-%d").date()
-        cal = d.isocalendar()
-        week_key = f"{cal[0]}-W{cal[1]:02d}"
-        wk = weekly_data.setdefault((name, week_key), {"score": 0.0, "predictions": 0, "correct": 0})
-        wk["score"] = round(wk["score"] + result["score"], 4)
-        wk["predictions"] += 1
-        if result["direction_correct"]:
-            wk["correct"] += 1
-
-        # Streak
-        streak = m["current_streak"]
-        if result["direction_correct"]:
-            m["current_streak"] = max(1, streak + 1) if streak >= 0 else 1
-        else:
-            m["current_streak"] = min(-1, streak - 1) if streak <= 0 else -1
-        m["best_streak"] = max(m["best_streak"], m["current_streak"])
-        m["worst_streak"] = min(m["worst_streak"], m["current_streak"])
-
-    # Finalize derived fields
-    for name, m in model_stats.items():
+def _new_accumulator() -> dict:
+    return {
+        "models": {},       # display_name -> stats dict (leaderboard shape)
+        "conf_totals": {},  # display_name -> sum of confidences
+        "weekly": {},       # display_name -> {"YYYY-WNN": {score, predictions, correct}}
+        "last_applied": None,  # [date_str, prediction_id] of the last folded result
+        "results": 0,
+    }
+
+
+def _apply_result(acc: dict, date_str: str, result: dict):
+    name = result["model_display_name"]
+    if name not in acc["models"]:
+        acc["models"][name] = {
+            "model_id": result["model"],
+            "model_display_name": name,
+            "total_predictions": 0,
+            "correct_directions": 0,
+            "direction_accuracy": 0.0,
+            "total_score": 0.0,
+            "avg_confidence": 0.0,
+            "current_streak": 0,
+            "best_streak": 0,
+            "worst_streak": 0,
+            "weekly_scores": [],
+        }
+        acc["conf_totals"][name] = 0.0
+    m = acc["models"][name]
+    m["total_predictions"] += 1
+    if result["direction_correct"]:
+        m["correct_directions"] += 1
+    m["total_score"] = round(m["total_score"] + result["score"], 4)
+    acc["conf_totals"][name] += result.get("confidence_at_prediction", 0.0)
+
+    # Weekly accumulation
+    d = datetime.strptime(date_str, "%Y-%m-%d").date()
+    cal = d.isocalendar()
+    week_key = f"{cal[0]}-W{cal[1]:02d}"
+    weeks = acc["weekly"].setdefault(name, {})
+    wk = weeks.setdefault(week_key, {"score": 0.0, "predictions": 0, "correct": 0})
+    wk["score"] = round(wk["score"] + result["score"], 4)
+    wk["predictions"] += 1
+    if result["direction_correct"]:
+        wk["correct"] += 1
+
+    # Streak
+    streak = m["current_streak"]
+    if result["direction_correct"]:
+        m["current_streak"] = max(1, streak + 1) if streak >= 0 else 1
+    else:
+        m["current_streak"] = min(-1, streak - 1) if streak <= 0 else -1
+    m["best_streak"] = max(m["best_streak"], m["current_streak"])
+    m["worst_streak"] = min(m["worst_streak"], m["current_streak"])
+
+    acc["last_applied"] = [date_str, result.get("prediction_id", "")]
+    acc["results"] += 1
+
+
+def _apply_day(acc: dict, archive, date_str: str):
+    """Fold one day's resolved results into *acc* in prediction_id order."""
+    resolved = archive.records(archive.day(date_str), resolved_only=True)
+    resolved.sort(key=lambda r: r.get("prediction_id", ""))
+    for result in resolved:
+        _apply_result(acc, date_str, result)
+
+
+def _finalize(acc: dict) -> list[dict]:
+    """Derive the leaderboard model rows without mutating the accumulator."""
+    models = copy.deepcopy(acc["models"])
+    for name, m in models.items():
         if m["total_predictions"] > 0:
             m["direction_accuracy"] = round(
                 m["correct_directions"] / m["total_predictions"], 4
             )
             m["avg_confidence"] = round(
-                conf_totals[name] / m["total_predictions"], 4
+                acc["conf_totals"][name] / m["total_predictions"], 4
             )
 
         # Build weekly_scores array sorted chronologically
-        m["weekly_scores"] = []
-        for (wname, week_key), wk in sorted(weekly_data.items()):
-            if wname != name:
-                continue
-            m["weekly_scores"].append({
+        m["weekly_scores"] = [
+            {
                 "week": week_key,
                 "score": wk["score"],
                 "predictions": wk["predictions"],
                 "accuracy": round(wk["correct"] / wk["predictions"], 4) if wk["predictions"] else 0.0,
-            })
+            }
+            for week_key, wk in sorted(acc["weekly"].get(name, {}).items())
+        ]
+    return list(models.values())
+
+
+def _load_leaderboard_state(hashes: dict) -> Optional[dict]:
+    """Return the saved checkpoint if every score file it covers is unchanged."""
+    if not LEADERBOARD_STATE_FILE.exists():
+        return None
+    try:
+        state = load_json(LEADERBOARD_STATE_FILE)
+    except Exception as e:
+        log.warning(f"Could not read leaderboard checkpoint, rebuilding: {e}")
+        return None
+    if state.get("version") != LEADERBOARD_STATE_VERSION:
+        log.info("Leaderboard checkpoint format changed — rebuilding")
+        return None
+    covered = {stem: h for stem, h in hashes.items() if stem <= state["through"]}
+    if covered != state["files"]:
+        log.info(f"Score files on or before {state['through']} changed — rebuilding leaderboard")
+        return None
+    return state
+
+
+def update_leaderboard(score_data: dict = None, full_rebuild: bool = False):
+    """Bring the leaderboard up to date with ALL score files (fully idempotent).
+
+    By default only score files newer than the checkpoint in
+    LEADERBOARD_STATE_FILE are applied; *full_rebuild* ignores the checkpoint
+    and replays every file. Both paths produce the same leaderboard. The
+    optional *score_data* argument is accepted for call-site compatibility but
+    ignored; all data comes from SCORES_DIR.
+    """
+    archive = results_archive.load()
+    hashes = archive.files
+    if not hashes:
+        log.warning("No score files found — nothing to update")
+        return
+
+    state = None if full_rebuild else _load_leaderboard_state(hashes)
+    if state:
+        acc = state["accumulator"]
+        through = state["through"]
+    else:
+        acc = _new_accumulator()
+        through = ""
+    new_days = [stem for stem in sorted(hashes) if stem > through]
+
+    # Fold everything but the newest day, checkpoint, then fold the newest.
+    # The newest day is the one most likely to be re-scored, so keeping it out
+    # of the checkpoint means re-running today never forces a full rebuild.
+    for stem in new_days[:-1]:
+        _apply_day(acc, archive, stem)
+    if len(new_days) > 1:
+        through = new_days[-2]
+    save_json(LEADERBOARD_STATE_FILE, {
+        "version": LEADERBOARD_STATE_VERSION,
+        "through": through,
+        "files": {stem: h for stem, h in hashes.items() if stem <= through},
+        "accumulator": acc,
+    })
+    for stem in new_days[-1:]:
+        _apply_day(acc, archive, stem)
 
     lb = {
         "last_updated": datetime.now(timezone.utc).isoformat(),
-        "models": list(model_stats.values()),
+        "models": _finalize(acc),
     }
 
     save_json(LEADERBOARD_FILE, lb)
     sync_to_public(LEADERBOARD_FILE)
-    log.info(f"Leaderboard rebuilt from {len(score_files)} score files ({len(entries)} results)")
+    if state:
+        log.info(
+            f"Leaderboard updated from {len(new_days)} new score file(s) "
+            f"({acc['results']} results across {len(hashes)} files)"
+        )
+    else:
+        log.info(f"Leaderboard rebuilt from {len(hashes)} score files ({acc['results']} results)")
+
+
+# ── Range rescoring ────────────────────────────────────────────────────────────
+def _range_dates(start: date, end: date, force: bool) -> list[str]:
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return [d.isoformat() for d in days if force or is_market_open(d)]
+
+
+def _score_day_worker(date_str: str, rescore: bool) -> tuple[str, int]:
+    score_data = score_date(date_str, rescore=rescore, archive=False)
+    return date_str, len(score_data["results"]) if score_data else 0
+
+
+def score_range(start: date, end: date, rescore: bool = False, force: bool = False,
+                workers: int = DEFAULT_WORKERS):
+    """Score every market day in [start, end], then rebuild derived data once.
+
+    All closes the range needs are bulk-downloaded into the price store up
+    front, so the per-day workers resolve prices locally.
+    """
+    dates = _range_dates(start, end, force)
+    if not dates:
+        log.info(f"No market days between {start} and {end}")
+        return
+
+    tickers = set()
+    for date_str in dates:
+        for item in _collect_to_score(date_str, set()) or []:
+            tickers.add(item["prediction"]["ticker"])
+    log.info(f"Prefetching closes for {len(tickers)} tickers across {len(dates)} days")
+    failed = prefetch_closes(sorted(tickers), start, end)
+    if failed:
+        log.warning(f"Prefetch failed for {sorted(failed)} — those fall back to per-day fetches")
+
+    scored = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(dates))) as pool:
+        futures = [pool.submit(_score_day_worker, date_str, rescore) for date_str in dates]
+        for future in as_completed(futures):
+            try:
+                date_str, n = future.result()
+            except Exception as e:
+                log.error(f"Scoring worker failed: {e}")
+                continue
+            scored += 1
+            log.info(f"Scored {date_str}: {n} results")
+    log.info(f"Scored {scored}/{len(dates)} days from {start} to {end}")
+
+    update_leaderboard()
+    import analytics
+    analytics.run()
 
 
 def main():
@@ -294,8 +499,32 @@ def main():
         action="store_true",
         help="Skip market holiday check",
     )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Ignore the leaderboard checkpoint and replay every score file",
+    )
+    parser.add_argument("--from", dest="from_date", help="First date of a range to score (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", help="Last date of the range (default: today)")
+    parser.add_argument(
+        "--rescore",
+        action="store_true",
+        help="Discard existing results and score from scratch (e.g. after a formula change)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Worker processes for range scoring (default: {DEFAULT_WORKERS})",
+    )
     args = parser.parse_args()
 
+    if args.from_date:
+        start = datetime.strptime(args.from_date, "%Y-%m-%d").date()
+        end = datetime.strptime(args.to_date, "%Y-%m-%d").date() if args.to_date else today_et()
+        score_range(start, end, rescore=args.rescore, force=args.force, workers=args.workers)
+        return
+
     if not args.force:
         from datetime import datetime as dt
         d = dt.strptime(args.date, "%Y-%m-%d").date()
@@ -303,23 +532,17 @@ def main():
             log.info(f"{args.date} is not a market day — exiting")
             sys.exit(0)
 
-    score_data = score_date(args.date)
+    score_data = score_date(args.date, rescore=args.rescore)
     if score_data:
-        update_leaderboard(score_data)
+        update_leaderboard(score_data, full_rebuild=args.full_rebuild)
 
         # Close open paper trade if one exists
         try:
-            from winner import load_simulator, save_simulator, close_trade, has_open_trade
-            sim = load_simulator()
-            if has_open_trade(sim):
-                # Find the open trade's ticker and get its closing price
-                open_ticker = None
-                for trade in sim["trades"]:
-                    if trade["status"] == "OPEN":
-                        open_ticker = trade["ticker"]
-                        break
-
-                if open_ticker:
+            from winner import simulator_transaction, close_trade, current_trade
+            with simulator_transaction() as sim:
+                open_position = current_trade(sim)
+                if open_position:
+                    open_ticker = open_position["ticker"]
                     # Look for closing price in score results
                     closing_price = None
                     for result in score_data.get("results", []):
@@ -338,12 +561,11 @@ def main():
                             log.warning(f"Could not fetch closing price for {open_ticker}: {e}")
 
                     if closing_price is not None:
-                        sim = close_trade(sim, closing_price)
-                        save_simulator(sim)
+                        close_trade(sim, closing_price)
                     else:
                         log.warning(f"No closing price for {open_ticker} — trade stays open")
-            else:
-                log.info("No open trade to close")
+                else:
+                    log.info("No open trade to close")
         except Exception as e:
             log.error(f"Simulator close error (non-fatal): {e}")
 
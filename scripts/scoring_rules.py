@@ -0,0 +1,165 @@
+"""
+Scoring-rule registry and offline side-by-side evaluation.
+
+Every rule is a vectorized function of a dict of aligned NumPy arrays:
+
+    direction_correct  bool   predicted direction matched the close
+    confidence         float  stated confidence (0.50-0.95)
+    target_accuracy    float  1 - |close - target| / target, rounded to 4 places
+    actual_return      float  (close - entry) / entry, NaN if the entry is unknown
+
+and returns one score per prediction, higher is better. Evening scoring only
+ever runs DEFAULT_RULE (via score.score_batch); the others are evaluated
+offline over the stored score history, so registering a rule costs nothing at
+scoring time.
+
+Usage:
+    python scoring_rules.py    # writes data/scoring_rules.json
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import prediction_index
+from utils import (
+    get_logger,
+    load_json,
+    save_json,
+    sync_to_public,
+    DATA_DIR,
+    SCORES_DIR,
+)
+
+log = get_logger("scoring_rules")
+
+SCORING_RULES_FILE = DATA_DIR / "scoring_rules.json"
+DEFAULT_RULE = "conviction"
+PROB_FLOOR = 1e-6  # keeps the log score finite for p = 0
+
+RULES = {}  # name -> {"fn", "description"}
+
+
+def register(name: str, description: str):
+    def decorator(fn):
+        RULES[name] = {"fn": fn, "description": description}
+        return fn
+    return decorator
+
+
+def evaluate(name: str, inputs: dict) -> np.ndarray:
+    """Unrounded per-prediction scores for one registered rule."""
+    return RULES[name]["fn"](inputs)
+
+
+def _outcome_prob(inputs: dict) -> np.ndarray:
+    """Probability the forecaster put on what actually happened."""
+    conf = inputs["confidence"]
+    return np.where(inputs["direction_correct"], conf, 1 - conf)
+
+
+# ── Rules ──────────────────────────────────────────────────────────────────────
+@register("conviction", "±confidence, +0.5 if the close is within 1% of target (live rule)")
+def conviction(inputs: dict) -> np.ndarray:
+    correct = inputs["direction_correct"]
+    base = np.where(correct, inputs["confidence"], -inputs["confidence"])
+    bonus = np.where((inputs["target_accuracy"] >= 0.99) & correct, 0.5, 0.0)
+    return base + bonus
+
+
+@register("brier", "Negated Brier loss of the direction call: -(1 - p)^2")
+def brier(inputs: dict) -> np.ndarray:
+    return -(1 - _outcome_prob(inputs)) ** 2
+
+
+@register("log", "Log score of the direction call: ln(p)")
+def log_score(inputs: dict) -> np.ndarray:
+    return np.log(np.maximum(_outcome_prob(inputs), PROB_FLOOR))
+
+
+@register("magnitude", "±confidence × realized move in percent")
+def magnitude(inputs: dict) -> np.ndarray:
+    sign = np.where(inputs["direction_correct"], 1.0, -1.0)
+    return sign * inputs["confidence"] * np.abs(inputs["actual_return"]) * 100
+
+
+@register("graded_target", "±confidence, plus a target bonus fading from 0.5 at a 0% miss to 0 at 5%")
+def graded_target(inputs: dict) -> np.ndarray:
+    correct = inputs["direction_correct"]
+    base = np.where(correct, inputs["confidence"], -inputs["confidence"])
+    closeness = np.clip(1 - (1 - inputs["target_accuracy"]) / 0.05, 0.0, 1.0)
+    return base + np.where(correct, 0.5 * closeness, 0.0)
+
+
+# ── Offline evaluation ─────────────────────────────────────────────────────────
+def load_history() -> tuple[list[str], dict]:
+    """Every resolved result as (model name per row, rule input arrays)."""
+    entries = prediction_index.entry_prices()
+    models, correct, conf, accuracy, returns = [], [], [], [], []
+    for sf in sorted(SCORES_DIR.glob("*.json")):
+        for r in load_json(sf).get("results", []):
+            if r.get("status") != "resolved":
+                continue
+            entry = entries.get(r["prediction_id"])
+            models.append(r["model_display_name"])
+            correct.append(r["direction_correct"])
+            conf.append(r["confidence_at_prediction"])
+            accuracy.append(r["target_accuracy"])
+            returns.append((r["actual_close"] - entry) / entry if entry else np.nan)
+    inputs = {
+        "direction_correct": np.array(correct, dtype=bool),
+        "confidence": np.array(conf, dtype=float),
+        "target_accuracy": np.array(accuracy, dtype=float),
+        "actual_return": np.array(returns, dtype=float),
+    }
+    return models, inputs
+
+
+def compare_rules(models: list[str], inputs: dict) -> dict:
+    """Per-model total, mean and rank under every registered rule."""
+    names, codes = np.unique(np.array(models, dtype=str), return_inverse=True)
+    counts = np.bincount(codes, minlength=len(names))
+    per_model = {name: {"model": name, "predictions": int(n), "scores": {}} for name, n in zip(names, counts)}
+
+    for rule in RULES:
+        values = evaluate(rule, inputs)
+        valid = np.isfinite(values)
+        totals = np.bincount(codes[valid], weights=values[valid], minlength=len(names))
+        scored = np.bincount(codes[valid], minlength=len(names))
+        means = np.divide(totals, scored, out=np.zeros(len(names)), where=scored > 0)
+        ranks = np.empty(len(names), dtype=int)
+        ranks[np.argsort(-means, kind="stable")] = np.arange(1, len(names) + 1)
+        for i, name in enumerate(names):
+            per_model[name]["scores"][rule] = {
+                "total": round(float(totals[i]), 4),
+                "mean": round(float(means[i]), 4),
+                "rank": int(ranks[i]),
+                "scored": int(scored[i]),
+            }
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "default_rule": DEFAULT_RULE,
+        "predictions": len(models),
+        "rules": [{"name": n, "description": r["description"]} for n, r in RULES.items()],
+        "models": list(per_model.values()),
+    }
+
+
+def main():
+    models, inputs = load_history()
+    if not models:
+        log.warning("No resolved results to evaluate")
+        return
+    table = compare_rules(models, inputs)
+    save_json(SCORING_RULES_FILE, table)
+    sync_to_public(SCORING_RULES_FILE)
+    log.info(f"Evaluated {len(RULES)} scoring rules over {len(models)} results → {SCORING_RULES_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Append-only event log behind the paper-trading simulator.
+
+Every change to the simulator is one JSON line in data/simulator_events.jsonl:
+
+    trade_opened      {"trade": {...}}                        new position
+    trade_closed      {"index", "exit_price", "pnl", "pnl_pct"}  books the P&L
+    trade_revised     {"index", "changes": {...}}             price corrections (backfill)
+    balance_adjusted  {"balance", "reason"[, "starting_balance"]}
+
+Lines carry a random ``id`` and a ``recorded_at`` stamp, so recording a trade
+is a single O(1) append and the full history can be replayed and audited. The
+state replay produces — ``balance``, ``starting_balance``, ``trades``, plus
+``open_trade`` (index of the open position, or None), ``ledger_seq`` (events
+applied) and ``ledger_head`` (id of the last one) — is what winner.py exports
+as data/simulator.json; that file doubles as the snapshot, so a load only
+replays the events after its head.
+
+Concurrency: within one checkout the simulator lock serializes writers. Across
+CI runs (morning and evening can overlap) each run appends to its own copy and
+the logs meet in ``git pull --rebase``; .gitattributes merges this file with
+the union driver and keeps either side's simulator.json. Ids are unique per
+writer, so the merged log needs no renumbering: an event's position in the
+file is its sequence number, replay follows file order and drops duplicate
+ids, and a snapshot whose head no longer sits at its ``ledger_seq`` position
+is discarded for a full replay. Older lines that only carry ``seq`` keep it as
+their id. Runs must still not race on the same trade: only the morning run
+opens one and only the evening run closes it.
+
+The first load bootstraps the log from an existing simulator.json.
+"""
+
+import copy
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import get_logger, write_atomic, DATA_DIR
+
+log = get_logger("simulator_ledger")
+
+EVENTS_FILE = DATA_DIR / "simulator_events.jsonl"
+
+
+def empty_state(starting_balance: float) -> dict:
+    return {
+        "balance": starting_balance,
+        "starting_balance": starting_balance,
+        "trades": [],
+        "open_trade": None,
+        "ledger_seq": 0,
+        "ledger_head": None,
+    }
+
+
+def new_event_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def event_id(event: dict) -> str:
+    """The event's id; pre-id lines are identified by their ``seq``."""
+    return event.get("id") or f"seq-{event['seq']}"
+
+
+def _encode(event: dict) -> bytes:
+    return (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# ── Log I/O ────────────────────────────────────────────────────────────────────
+def read_events(path: Path = EVENTS_FILE) -> list[dict]:
+    """Every event in log order, duplicate ids dropped. A malformed line raises."""
+    if not path.exists():
+        return []
+    events, seen = [], set()
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError as e:
+                raise RuntimeError(f"{path}:{lineno} is not valid JSON — refusing to replay: {e}") from e
+            if event_id(event) in seen:
+                log.warning(f"{path}:{lineno} repeats event {event_id(event)} — skipping")
+                continue
+            seen.add(event_id(event))
+            events.append(event)
+    return events
+
+
+def append_event(event: dict, path: Path = EVENTS_FILE):
+    """Append one event line (single write, fsynced). Callers hold the simulator lock."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, _encode(event))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ── Replay ─────────────────────────────────────────────────────────────────────
+def apply_event(state: dict, event: dict) -> dict:
+    """Apply one event to *state* in place."""
+    kind = event["type"]
+    if kind == "trade_opened":
+        if state["open_trade"] is not None:
+            raise RuntimeError(f"Event {event_id(event)} opens a trade while trade {state['open_trade']} is open")
+        state["trades"].append(copy.deepcopy(event["trade"]))
+        state["open_trade"] = len(state["trades"]) - 1
+    elif kind == "trade_closed":
+        trade = state["trades"][event["index"]]
+        trade.update(exit_price=event["exit_price"], pnl=event["pnl"], pnl_pct=event["pnl_pct"], status="CLOSED")
+        state["balance"] = round(state["balance"] + (event["pnl"] or 0), 2)
+        if state["open_trade"] == event["index"]:
+            state["open_trade"] = None
+    elif kind == "trade_revised":
+        state["trades"][event["index"]].update(copy.deepcopy(event["changes"]))
+    elif kind == "balance_adjusted":
+        state["balance"] = event["balance"]
+        if "starting_balance" in event:
+            state["starting_balance"] = event["starting_balance"]
+    else:
+        raise RuntimeError(f"Unknown simulator event type {kind!r} (event {event_id(event)})")
+
+    state["ledger_seq"] += 1
+    state["ledger_head"] = event_id(event)
+    return state
+
+
+def replay(events: list[dict], state: Optional[dict] = None, starting_balance: float = 0) -> dict:
+    """Fold *events* into *state* (a fresh one if None)."""
+    state = empty_state(starting_balance) if state is None else state
+    for event in events:
+        apply_event(state, event)
+    return state
+
+
+def catch_up(snapshot: Optional[dict], events: list[dict]) -> dict:
+    """*snapshot* advanced by the events after its head.
+
+    Falls back to a full replay when the snapshot is missing, predates ledger
+    ids, or no longer matches the log (a concurrent run's events were merged
+    in ahead of its head).
+    """
+    if snapshot and snapshot.get("ledger_head"):
+        seq = snapshot.get("ledger_seq", 0)
+        if 0 < seq <= len(events) and event_id(events[seq - 1]) == snapshot["ledger_head"]:
+            return replay(events[seq:], snapshot)
+        log.info("Simulator snapshot is behind a merged ledger — replaying in full")
+    return replay(events)
+
+
+def record(state: dict, kind: str, path: Path = EVENTS_FILE, **fields) -> dict:
+    """Append a *kind* event built from *fields* and apply it to *state*."""
+    event = {
+        "id": new_event_id(),
+        "type": kind,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **fields,
+    }
+    apply_event(state, event)
+    append_event(event, path)
+    return event
+
+
+# ── Bootstrap ──────────────────────────────────────────────────────────────────
+def bootstrap_events(sim: dict) -> list[dict]:
+    """Events that rebuild a legacy simulator.json, ending on its exact balance."""
+    stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    starting = sim["starting_balance"]
+    events = [{"type": "balance_adjusted", "balance": starting, "starting_balance": starting, "reason": "initial"}]
+    for i, trade in enumerate(sim.get("trades", [])):
+        opened = {**trade, "exit_price": None, "pnl": None, "pnl_pct": None, "status": "OPEN"}
+        events.append({"type": "trade_opened", "trade": opened})
+        if trade.get("status") == "CLOSED":
+            events.append({
+                "type": "trade_closed", "index": i,
+                "exit_price": trade["exit_price"], "pnl": trade["pnl"], "pnl_pct": trade["pnl_pct"],
+            })
+    events = [{"id": new_event_id(), "type": event.pop("type"), "recorded_at": stamp, **event} for event in events]
+
+    state = replay(events, starting_balance=starting)
+    if state["balance"] != sim["balance"]:
+        events.append({
+            "id": new_event_id(), "type": "balance_adjusted", "recorded_at": stamp,
+            "balance": sim["balance"], "reason": "bootstrap: match simulator.json",
+        })
+    return events
+
+
+def write_events(events: list[dict], path: Path = EVENTS_FILE):
+    """Replace the whole log (bootstrap only — everything else appends)."""
+    write_atomic(path, b"".join(_encode(e) for e in events))
+    log.info(f"Wrote {len(events)} simulator events → {path}")
@@ -18,8 +18,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+import prediction_index
+import results_archive
 from utils import (
     DATA_DIR,
+    call_key,
     ensure_dirs,
     get_logger,
     load_json,
@@ -27,7 +30,6 @@ from utils import (
     sync_to_public,
     today_et,
     extract_json_from_text,
-    PREDICTIONS_DIR,
     SCORES_DIR,
     SUMMARIES_DAILY_DIR,
     SUMMARIES_WEEKLY_DIR,
@@ -113,7 +115,7 @@ def build_fallback_weekly_summary(
         per_model[model]["score"] += result["score"]
         per_model[model]["predictions"] += 1
         per_model[model]["correct"] += int(bool(result["direction_correct"]))
-        ticker_groups[(result.get("date"), result["ticker"])].append(result)
+        ticker_groups[call_key(result)].append(result)
 
     scores = []
     for model, stats in per_model.items():
@@ -180,22 +182,13 @@ def build_daily_summary(date_str: str, force: bool = False) -> dict | None:
         log.info(f"Daily summary already exists for {date_str}")
         return load_json(out_file)
 
-    pred_dir = PREDICTIONS_DIR / date_str
     score_file = SCORES_DIR / f"{date_str}.json"
 
-    if not pred_dir.exists():
+    rows = prediction_index.day_predictions(date_str)
+    if not rows:
         log.error(f"No predictions for {date_str}")
         return None
 
-    # Collect all predictions and scores
-    all_preds = []
-    for pf in sorted(pred_dir.glob("*.json")):
-        try:
-            data = load_json(pf)
-            all_preds.append(data)
-        except Exception as e:
-            log.error(f"Could not load {pf}: {e}")
-
     scores = []
     if score_file.exists():
         score_data = load_json(score_file)
@@ -205,20 +198,20 @@ def build_daily_summary(date_str: str, force: bool = False) -> dict | None:
 
     # Build a compact summary for the AI to analyze
     pred_summary = []
-    for model_data in all_preds:
-        for pred in model_data.get("predictions", []):
-            score = score_map.get(pred["id"])
-            pred_summary.append({
-                "model": model_data["model_display_name"],
-                "ticker": pred["ticker"],
-                "direction": pred["direction"],
-                "confidence": pred["confidence"],
-                "target": pred["target_price"],
-                "reasoning_snippet": pred["reasoning"][:100],
-                "score": score["score"] if score else None,
-                "correct": score["direction_correct"] if score else None,
-                "actual_close": score["actual_close"] if score else None,
-            })
+    for row in rows:
+        pred = row["prediction"]
+        score = score_map.get(pred["id"])
+        pred_summary.append({
+            "model": row["model_display_name"],
+            "ticker": pred["ticker"],
+            "direction": pred["direction"],
+            "confidence": pred["confidence"],
+            "target": pred["target_price"],
+            "reasoning_snippet": pred["reasoning"][:100],
+            "score": score["score"] if score else None,
+            "correct": score["direction_correct"] if score else None,
+            "actual_close": score["actual_close"] if score else None,
+        })
 
     prompt = f"""You are summarizing a daily AI stock prediction experiment for {date_str}.
 
@@ -304,13 +297,11 @@ def build_weekly_summary(week_str: str) -> dict | None:
     log.info(f"Summarizing week {week_str}: {monday} to {friday}")
 
     # Gather all scores for the week
+    archive = results_archive.load()
     all_results = []
     d = monday
     while d <= friday:
-        score_file = SCORES_DIR / f"{d.isoformat()}.json"
-        if score_file.exists():
-            score_data = load_json(score_file)
-            all_results.extend(score_data.get("results", []))
+        all_results.extend(archive.records(archive.day(d.isoformat())))
         d += timedelta(days=1)
 
     if not all_results:
@@ -0,0 +1,180 @@
+"""
+Parallel parameter sweep for consensus-winner selection.
+
+Fans a grid of selection parameters (minimum agreeing models, the ETF
+threshold, leverage map, ranking score and the excluded-ticker set) across a
+process pool and ranks the results. The candidate and price arrays from
+backtest.py are loaded once in the parent and placed in shared memory; each
+worker maps them read-only instead of receiving a pickled copy, so only the
+small per-chunk parameter lists and result rows cross process boundaries.
+
+Writes data/sweep.json in the same shape as data/backtest.json: configs
+best-first, each with its metrics and daily equity curve.
+
+Usage:
+    python sweep.py                                     # default grid
+    python sweep.py --min-models 2 3 4 --exclusions live none --workers 8
+    python sweep.py --offline                           # cached prices only
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backtest import (
+    LEVERAGE_MAPS,
+    RANKERS,
+    backtest,
+    load_candidates,
+    load_price_matrix,
+    log_top,
+    param_grid,
+    ranked_table,
+    write_report,
+)
+from utils import get_logger, DATA_DIR
+from winner import EXCLUDED_TICKERS
+
+log = get_logger("sweep")
+
+SWEEP_FILE = DATA_DIR / "sweep.json"
+DEFAULT_WORKERS = os.cpu_count() or 1
+CHUNKS_PER_WORKER = 4
+
+EXCLUSION_SETS = {
+    "live": sorted(EXCLUDED_TICKERS),
+    "none": [],
+}
+
+DEFAULT_GRID = {
+    "min_models": [1, 2, 3, 4, 5],
+    "etf_min_models": [2, 3, 4, 5, 6],
+    "leverage": sorted(LEVERAGE_MAPS),
+    "rankers": sorted(RANKERS),
+    "exclusions": ["live", "none"],
+}
+
+
+# ── Shared arrays ──────────────────────────────────────────────────────────────
+def share_arrays(arrays: dict) -> tuple[list, dict]:
+    """Copy each array into a shared-memory block. Returns (blocks, spec)."""
+    blocks, spec = [], {}
+    for key, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        blocks.append(shm)
+        spec[key] = (shm.name, arr.shape, arr.dtype.str)
+    return blocks, spec
+
+
+def attach_arrays(spec: dict) -> tuple[list, dict]:
+    """Read-only views onto blocks created by share_arrays."""
+    blocks, arrays = [], {}
+    for key, (name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        view.flags.writeable = False
+        blocks.append(shm)
+        arrays[key] = view
+    return blocks, arrays
+
+
+# Per-worker state, set once by _init_worker.
+_blocks = []
+_cands = None
+_prices = None
+
+
+def _init_worker(cand_spec: dict, price_spec: dict, days: list[str], tickers: list[str]):
+    global _blocks, _cands, _prices
+    cand_blocks, cands = attach_arrays(cand_spec)
+    price_blocks, _prices = attach_arrays(price_spec)
+    _blocks = cand_blocks + price_blocks
+    _cands = {"days": days, "tickers": tickers, **cands}
+
+
+def _run_chunk(start: int, grid: list[dict]) -> tuple[int, dict]:
+    result = backtest(grid, _cands, _prices)
+    return start, {k: result[k] for k in ("equity", "final_balance", "return_pct",
+                                          "max_drawdown_pct", "trades", "hit_rate")}
+
+
+# ── Sweep ──────────────────────────────────────────────────────────────────────
+def build_grid(min_models, etf_min_models, leverage, rankers, exclusions) -> list[dict]:
+    return [
+        {**params, "excluded": EXCLUSION_SETS[name]}
+        for name in exclusions
+        for params in param_grid(min_models, etf_min_models, leverage, rankers)
+    ]
+
+
+def sweep(grid: list[dict], cands: dict, prices: dict, workers: int = DEFAULT_WORKERS) -> dict:
+    """Backtest *grid* across a process pool; results are in grid order."""
+    workers = max(1, min(workers, len(grid)))
+    chunk = max(1, -(-len(grid) // (workers * CHUNKS_PER_WORKER)))
+    arrays = {k: v for k, v in cands.items() if isinstance(v, np.ndarray)}
+
+    cand_blocks, cand_spec = share_arrays(arrays)
+    price_blocks, price_spec = share_arrays(prices)
+    parts = {}
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(cand_spec, price_spec, cands["days"], cands["tickers"]),
+        ) as pool:
+            futures = [pool.submit(_run_chunk, i, grid[i:i + chunk]) for i in range(0, len(grid), chunk)]
+            for future in futures:
+                start, part = future.result()
+                parts[start] = part
+    finally:
+        for shm in cand_blocks + price_blocks:
+            shm.close()
+            shm.unlink()
+
+    ordered = [parts[i] for i in sorted(parts)]
+    return {k: np.concatenate([p[k] for p in ordered]) for k in ordered[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel sweep of consensus-winner parameters")
+    parser.add_argument("--min-models", type=int, nargs="+", default=DEFAULT_GRID["min_models"])
+    parser.add_argument("--etf-min-models", type=int, nargs="+", default=DEFAULT_GRID["etf_min_models"])
+    parser.add_argument("--leverage", nargs="+", choices=sorted(LEVERAGE_MAPS), default=DEFAULT_GRID["leverage"])
+    parser.add_argument("--ranker", nargs="+", choices=sorted(RANKERS), default=DEFAULT_GRID["rankers"])
+    parser.add_argument("--exclusions", nargs="+", choices=sorted(EXCLUSION_SETS),
+                        default=DEFAULT_GRID["exclusions"], help="Excluded-ticker sets to try")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Worker processes (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--offline", action="store_true", help="Never download; use the price store as-is")
+    parser.add_argument("--top", type=int, default=10, help="Configs to log")
+    args = parser.parse_args()
+
+    grid = build_grid(args.min_models, args.etf_min_models, args.leverage, args.ranker, args.exclusions)
+    cands = load_candidates()
+    if not cands["days"]:
+        log.warning("No predictions to sweep")
+        return
+    prices = load_price_matrix(cands["tickers"], cands["days"], fetch=not args.offline)
+
+    started = time.perf_counter()
+    result = sweep(grid, cands, prices, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    table = ranked_table(grid, result)
+    write_report(table, cands["days"], out_file=SWEEP_FILE, exclusion_sets=EXCLUSION_SETS)
+    log_top(table, args.top)
+    log.info(f"Swept {len(grid)} configs over {len(cands['days'])} days in {elapsed:.2f}s → {SWEEP_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,23 @@ from __future__ import annotations
 
 """Shared utilities: schema validation, logging, file helpers."""
 
+import hashlib
 import json
 import logging
 import os
 import re
+import tempfile
+from contextlib import contextmanager
 from datetime import date, datetime, timezone, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+try:
+    import fcntl
+except ImportError:  # Windows: locking is a no-op, CI runs on Linux
+    fcntl = None
+
 # US Eastern offset: UTC-5 (EST) or UTC-4 (EDT).
 # Python 3.9+ has zoneinfo, but keep it simple with a fixed check.
 def today_et() -> date:
@@ -30,12 +39,15 @@ SCORES_DIR = DATA_DIR / "scores"
 SUMMARIES_DAILY_DIR = DATA_DIR / "summaries" / "daily"
 SUMMARIES_WEEKLY_DIR = DATA_DIR / "summaries" / "weekly"
 LEADERBOARD_FILE = DATA_DIR / "leaderboard.json"
+LEADERBOARD_STATE_FILE = DATA_DIR / "leaderboard_state.json"
+PENDING_DIR = DATA_DIR / "pending"
+PRICES_DIR = DATA_DIR / "prices"
 PUBLIC_DATA_DIR = REPO_ROOT / "public" / "data"
 
 
 def ensure_dirs():
     for d in [
-        PREDICTIONS_DIR, SCORES_DIR,
+        PREDICTIONS_DIR, SCORES_DIR, PENDING_DIR,
         SUMMARIES_DAILY_DIR, SUMMARIES_WEEKLY_DIR,
     ]:
         d.mkdir(parents=True, exist_ok=True)
@@ -61,19 +73,99 @@ def load_json(path: Path) -> Any:
         return json.load(f)
 
 
-def save_json(path: Path, data: Any, indent: int = 2):
+def save_json(path: Path, data: Any, indent: int = 2, skip_unchanged: bool = False) -> bool:
+    """Atomically write *data* as JSON. Returns False if skipped as unchanged."""
+    payload = json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+    return write_atomic(path, payload, skip_unchanged)
+
+
+def content_hash(path: Path) -> str:
+    """SHA-1 of a file's bytes, used to detect changed inputs between runs."""
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomic(path: Path, payload: bytes, skip_unchanged: bool = False) -> bool:
+    """Write via a fsynced temp file + rename, so readers never see a torn file.
+
+    With *skip_unchanged*, identical content is left alone (no mtime bump, no
+    git diff). Returns whether the file was written.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+    if skip_unchanged and path.exists():
+        if hashlib.sha1(payload).hexdigest() == content_hash(path):
+            return False
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o666 & ~_UMASK)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+    return True
+
+
+def _fsync_dir(directory: Path):
+    """Persist a rename (best effort — not every platform can open a directory)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive advisory lock on ``<path>.lock`` for read-modify-write cycles."""
+    lock_path = path.with_name(f"{path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def mirror_file(src: Path, dst: Path) -> bool:
+    """Make *dst* a hardlink to *src* (atomic copy across filesystems).
+
+    Safe because data/ files are only ever replaced (write_atomic), never
+    rewritten in place, so a link can't observe a partial write. Returns False
+    if *dst* already is *src*.
+    """
+    if dst.exists() and os.path.samefile(src, dst):
+        return False
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        return write_atomic(dst, src.read_bytes(), skip_unchanged=True)
+    os.replace(tmp, dst)
+    return True
 
 
 def sync_to_public(src: Path):
     """Mirror a data file to the public/ folder so Vite serves it at runtime."""
-    rel = src.relative_to(DATA_DIR)
-    dst = PUBLIC_DATA_DIR / rel
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    import shutil
-    shutil.copy2(src, dst)
+    mirror_file(src, PUBLIC_DATA_DIR / src.relative_to(DATA_DIR))
 
 
 # ── Schema validation ──────────────────────────────────────────────────────────
@@ -214,6 +306,23 @@ US_HOLIDAYS_2027 = {
 }
 
 US_MARKET_HOLIDAYS = US_HOLIDAYS_2025 | US_HOLIDAYS_2026 | US_HOLIDAYS_2027
+HOLIDAY_YEARS = {d.year for d in US_MARKET_HOLIDAYS}
+
+
+@lru_cache(maxsize=None)
+def _xnys_holidays(year: int) -> frozenset:
+    """Weekday NYSE closures in *year*, from the exchange_calendars XNYS calendar.
+
+    Used for years without a hand-kept list above, so horizons past 2027
+    still land on real sessions.
+    """
+    import exchange_calendars
+
+    start, end = date(year, 1, 1), date(year, 12, 31)
+    calendar = exchange_calendars.get_calendar("XNYS", start=start.isoformat(), end=end.isoformat())
+    sessions = {ts.date() for ts in calendar.sessions}
+    days = (start + timedelta(days=i) for i in range((end - start).days + 1))
+    return frozenset(d for d in days if d.weekday() < 5 and d not in sessions)
 
 
 def is_market_open(d: date | None = None) -> bool:
@@ -222,4 +331,43 @@ def is_market_open(d: date | None = None) -> bool:
         d = today_et()
     if d.weekday() >= 5:  # Saturday or Sunday
         return False
-    return d not in US_MARKET_HOLIDAYS
+    holidays = US_MARKET_HOLIDAYS if d.year in HOLIDAY_YEARS else _xnys_holidays(d.year)
+    return d not in holidays
+
+
+def last_trading_day_on_or_before(d: date) -> date:
+    while not is_market_open(d):
+        d -= timedelta(days=1)
+    return d
+
+
+def last_trading_day_of_week(d: date) -> date:
+    """Last session of d's Mon–Fri week (Friday unless it's a holiday)."""
+    return last_trading_day_on_or_before(d + timedelta(days=4 - d.weekday()))
+
+
+def last_trading_day_of_month(d: date) -> date:
+    next_month = (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return last_trading_day_on_or_before(next_month - timedelta(days=1))
+
+
+def call_key(result: dict) -> tuple:
+    """(ticker, prediction date, timeframe) of the call a score result resolves.
+
+    Horizon results are filed under the day they resolve, so grouping by the
+    score file's date alone would lump them in with that day's end_of_day calls.
+    """
+    return (
+        result["ticker"],
+        result.get("prediction_date") or result.get("date"),
+        result.get("timeframe", "end_of_day"),
+    )
+
+
+def horizon_date(d: date, timeframe: str) -> date:
+    """Session whose close resolves a prediction made on *d* with *timeframe*."""
+    if timeframe == "end_of_week":
+        return last_trading_day_of_week(d)
+    if timeframe == "end_of_month":
+        return last_trading_day_of_month(d)
+    return d
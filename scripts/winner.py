@@ -2,22 +2,28 @@
 Today's Winner selection and paper trading simulator.
 
 Finds the highest-conviction individual stock pick where 3+ models agree
-on direction, then manages simulated trades in data/simulator.json.
+on direction, then manages simulated trades. Trades are recorded as events in
+data/simulator_events.jsonl (see simulator_ledger.py); data/simulator.json is
+the materialized state exported for the frontend.
 """
 
+import copy
 import sys
 from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+import prediction_index
+import simulator_ledger
 from utils import (
+    file_lock,
     get_logger,
     load_json,
     save_json,
     sync_to_public,
     DATA_DIR,
-    PREDICTIONS_DIR,
 )
 
 log = get_logger("winner")
@@ -41,50 +47,41 @@ DEFAULT_WINNER = {
 }
 
 
-def select_todays_winner(date_str):
-    """Find the highest-conviction stock pick where 3+ models agree."""
-    pred_dir = PREDICTIONS_DIR / date_str
-    if not pred_dir.exists():
-        log.warning(f"No predictions directory for {date_str}")
-        return None
+def rank_candidates(date_str):
+    """Every consensus pick for a day, highest score first (ties keep file order).
 
-    pred_files = list(pred_dir.glob("*.json"))
-    if not pred_files:
-        log.warning(f"No prediction files for {date_str}")
-        return None
+    ETF picks carry the ``leveraged_ticker`` they trade as.
+    """
+    rows = prediction_index.day_predictions(date_str)
+    if not rows:
+        log.warning(f"No predictions for {date_str}")
+        return []
 
     # Group by (ticker, direction)
     groups = defaultdict(list)
-    for pf in pred_files:
-        try:
-            data = load_json(pf)
-        except Exception as e:
-            log.error(f"Could not load {pf}: {e}")
+    for row in rows:
+        pred = row["prediction"]
+        ticker = pred.get("ticker", "")
+        direction = pred.get("direction")
+        target = pred.get("target_price")
+        entry = pred.get("current_price_at_prediction")
+        confidence = pred.get("confidence")
+
+        # Skip non-stock picks
+        if ticker in EXCLUDED_TICKERS:
+            continue
+        if ticker.endswith("-USD"):
+            continue
+        # Skip predictions with missing price data
+        if target is None or entry is None or confidence is None:
             continue
 
-        model_name = data.get("model_display_name", pf.stem)
-        for pred in data.get("predictions", []):
-            ticker = pred.get("ticker", "")
-            direction = pred.get("direction")
-            target = pred.get("target_price")
-            entry = pred.get("current_price_at_prediction")
-            confidence = pred.get("confidence")
-
-            # Skip non-stock picks
-            if ticker in EXCLUDED_TICKERS:
-                continue
-            if ticker.endswith("-USD"):
-                continue
-            # Skip predictions with missing price data
-            if target is None or entry is None or confidence is None:
-                continue
-
-            groups[(ticker, direction)].append({
-                "model": model_name,
-                "confidence": confidence,
-                "target": target,
-                "entry": entry,
-            })
+        groups[(ticker, direction)].append({
+            "model": row["model_display_name"],
+            "confidence": confidence,
+            "target": target,
+            "entry": entry,
+        })
 
     # Filter for groups with enough models agreeing
     candidates = []
@@ -116,16 +113,23 @@ def select_todays_winner(date_str):
             "high_conviction": avg_confidence >= 0.85,
         })
 
+    # ETF consensus: remap to 3x leveraged ticker for trading
+    for candidate in candidates:
+        if candidate["ticker"] in ETF_LEVERAGE_MAP:
+            candidate["leveraged_ticker"] = ETF_LEVERAGE_MAP[candidate["ticker"]]
+
+    return sorted(candidates, key=lambda c: c["score"], reverse=True)
+
+
+def select_todays_winner(date_str):
+    """Find the highest-conviction stock pick where 3+ models agree."""
+    candidates = rank_candidates(date_str)
     if not candidates:
         log.info(f"No consensus winner for {date_str} (no ticker with 3+ models agreeing)")
         return None
 
-    # Return highest-scoring candidate
-    winner = max(candidates, key=lambda c: c["score"])
-
-    # ETF consensus: remap to 3x leveraged ticker for trading
-    if winner["ticker"] in ETF_LEVERAGE_MAP:
-        winner["leveraged_ticker"] = ETF_LEVERAGE_MAP[winner["ticker"]]
+    winner = candidates[0]
+    if "leveraged_ticker" in winner:
         log.info(
             f"Today's winner: {winner['ticker']} → {winner['leveraged_ticker']} "
             f"{winner['direction'].upper()} ({winner['model_count']} models, "
@@ -139,35 +143,71 @@ def select_todays_winner(date_str):
     return winner
 
 
-def load_simulator():
-    """Load simulator state from file or return default."""
+def _load_snapshot():
+    """The last exported simulator.json, or None if missing or unreadable."""
+    if not SIMULATOR_FILE.exists():
+        return None
+    try:
+        return load_json(SIMULATOR_FILE)
+    except ValueError as e:
+        log.warning(f"{SIMULATOR_FILE} is unreadable — replaying the full ledger: {e}")
+        return None
+
+
+def _bootstrap_ledger():
+    """Seed the event log from a pre-ledger simulator.json (or the default)."""
+    legacy = copy.deepcopy(DEFAULT_SIMULATOR)
     if SIMULATOR_FILE.exists():
         try:
-            return load_json(SIMULATOR_FILE)
-        except Exception as e:
-            log.error(f"Could not load simulator: {e}")
-    return dict(DEFAULT_SIMULATOR)
+            legacy = load_json(SIMULATOR_FILE)
+        except ValueError as e:
+            raise RuntimeError(f"{SIMULATOR_FILE} is corrupt and there is no ledger to rebuild it from: {e}") from e
+    simulator_ledger.write_events(simulator_ledger.bootstrap_events(legacy))
+
+
+def load_simulator():
+    """Current simulator state: the simulator.json snapshot plus newer ledger events.
+
+    A corrupt ledger raises instead of silently resetting the paper balance;
+    a missing, corrupt or out-of-date snapshot is rebuilt by replaying the
+    whole ledger.
+    """
+    if not simulator_ledger.EVENTS_FILE.exists():
+        _bootstrap_ledger()
+    return simulator_ledger.catch_up(_load_snapshot(), simulator_ledger.read_events())
 
 
 def save_simulator(data):
-    """Save simulator state and sync to public."""
-    save_json(SIMULATOR_FILE, data)
+    """Export the materialized simulator state and sync to public."""
+    save_json(SIMULATOR_FILE, data, skip_unchanged=True)
     sync_to_public(SIMULATOR_FILE)
 
 
+@contextmanager
+def simulator_transaction():
+    """Lock the simulator, yield its state for ledger updates, export on success."""
+    with file_lock(SIMULATOR_FILE):
+        sim = load_simulator()
+        yield sim
+        save_simulator(sim)
+
+
 def save_winner(date_str, winner):
     """Save today's winner and sync to public."""
     data = {"date": date_str, "winner": winner}
-    save_json(WINNER_FILE, data)
+    save_json(WINNER_FILE, data, skip_unchanged=True)
     sync_to_public(WINNER_FILE)
 
 
 def has_open_trade(sim):
     """Check if there's an open trade in the simulator."""
-    for trade in sim.get("trades", []):
-        if trade.get("status") == "OPEN":
-            return True
-    return False
+    return sim.get("open_trade") is not None
+
+
+def current_trade(sim):
+    """The open trade, or None."""
+    index = sim.get("open_trade")
+    return None if index is None else sim["trades"][index]
 
 
 def open_trade(sim, winner, date_str):
@@ -219,7 +259,7 @@ def open_trade(sim, winner, date_str):
         "status": "OPEN",
     }
 
-    sim["trades"].append(trade)
+    simulator_ledger.record(sim, "trade_opened", trade=trade)
     log.info(
         f"Opened trade: {winner['direction'].upper()} {shares} shares of "
         f"{trade_ticker} @ ${entry_price:.2f}"
@@ -229,32 +269,47 @@ def open_trade(sim, winner, date_str):
 
 def close_trade(sim, closing_price):
     """Close the open paper trade with the closing price."""
-    for trade in sim.get("trades", []):
-        if trade.get("status") != "OPEN":
-            continue
+    trade = current_trade(sim)
+    if trade is None:
+        log.warning("No open trade to close")
+        return sim
 
-        trade["exit_price"] = closing_price
-        entry = trade["entry_price"]
-        shares = trade["shares"]
+    entry = trade["entry_price"]
+    shares = trade["shares"]
 
-        if trade["direction"] == "up":
-            pnl = (closing_price - entry) * shares
-        else:
-            pnl = (entry - closing_price) * shares
+    if trade["direction"] == "up":
+        pnl = (closing_price - entry) * shares
+    else:
+        pnl = (entry - closing_price) * shares
 
-        pnl_pct = (pnl / (entry * shares)) * 100 if entry * shares != 0 else 0
+    pnl_pct = (pnl / (entry * shares)) * 100 if entry * shares != 0 else 0
 
-        trade["pnl"] = round(pnl, 2)
-        trade["pnl_pct"] = round(pnl_pct, 2)
-        trade["status"] = "CLOSED"
+    simulator_ledger.record(
+        sim, "trade_closed",
+        index=sim["open_trade"],
+        exit_price=closing_price,
+        pnl=round(pnl, 2),
+        pnl_pct=round(pnl_pct, 2),
+    )
 
-        sim["balance"] = round(sim["balance"] + pnl, 2)
+    log.info(
+        f"Closed trade: {trade['ticker']} @ ${closing_price:.2f} — "
+        f"P&L: ${pnl:+.2f} ({pnl_pct:+.2f}%)"
+    )
+    return sim
+
+
+def revise_trade(sim, index, changes):
+    """Correct fields of a recorded trade (e.g. re-sourced prices). No-op if nothing changed."""
+    trade = sim["trades"][index]
+    changes = {k: v for k, v in changes.items() if trade.get(k) != v}
+    if changes:
+        simulator_ledger.record(sim, "trade_revised", index=index, changes=changes)
+    return sim
 
-        log.info(
-            f"Closed trade: {trade['ticker']} @ ${closing_price:.2f} — "
-            f"P&L: ${pnl:+.2f} ({pnl_pct:+.2f}%)"
-        )
-        return sim
 
-    log.warning("No open trade to close")
+def adjust_balance(sim, balance, reason):
+    """Set the balance outright (reconciliation), recorded with a reason."""
+    if sim["balance"] != balance:
+        simulator_ledger.record(sim, "balance_adjusted", balance=balance, reason=reason)
     return sim
@@ -12,6 +12,28 @@ async function fetchJSON(path) {
   return res.json()
 }
 
+let bundleManifest = null
+
+function loadBundleManifest() {
+  if (!bundleManifest) {
+    bundleManifest = fetch(`${BASE}data/bundles/manifest.json`, { cache: 'no-cache' })
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null)
+  }
+  return bundleManifest
+}
+
+/**
+ * Precomputed per-page bundle (scripts/bundles.py), or null if none is
+ * published — callers then fall back to the individual data files.
+ */
+export async function loadBundle(page) {
+  const manifest = await loadBundleManifest()
+  const path = manifest?.bundles?.[page]
+  if (!path) return null
+  return fetchJSON(`data/${path}`).catch(() => null)
+}
+
 export async function loadLeaderboard() {
   return fetchJSON('data/leaderboard.json')
 }
@@ -36,6 +58,10 @@ export async function loadSimulator() {
   return fetchJSON('data/simulator.json')
 }
 
+export async function loadPortfolio() {
+  return fetchJSON('data/portfolio.json')
+}
+
 export async function loadTodaysWinner() {
   return fetchJSON('data/winner-today.json')
 }
@@ -3,7 +3,7 @@ import {
   LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid,
   Tooltip, Legend, ResponsiveContainer, ReferenceLine,
 } from 'recharts'
-import { loadAnalytics, MODEL_COLORS } from '../data/useData'
+import { loadBundle, loadAnalytics, MODEL_COLORS } from '../data/useData'
 import styles from './Analytics.module.css'
 
 const COLORS = MODEL_COLORS
@@ -11,9 +11,10 @@ const COLORS = MODEL_COLORS
 export default function Analytics() {
   const [data, setData] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [rollingWindow, setRollingWindow] = useState('5')
 
   useEffect(() => {
-    loadAnalytics().then(setData).catch(() => setData(null)).finally(() => setLoading(false))
+    loadBundle('analytics').then(bundle => bundle || loadAnalytics()).then(setData).catch(() => setData(null)).finally(() => setLoading(false))
   }, [])
 
   if (loading) return <div className={styles.loading}>Loading analytics...</div>
@@ -32,7 +33,17 @@ export default function Analytics() {
   const byTicker = ticker_breakdown.by_ticker || []
   const calibrationModels = calibration.models || []
   const dailySeries = time_series.daily || []
-  const rollingSeries = time_series.rolling_accuracy || []
+  const rollingWindows = time_series.rolling_windows || { 5: time_series.rolling_accuracy || [] }
+  const rollingOptions = [
+    ...Object.keys(rollingWindows).map(w => ({ key: w, label: `${w}-Day` })),
+    ...(time_series.ewm_accuracy ? [{ key: 'ewm', label: 'EWM' }] : []),
+  ]
+  const rollingSeries = rollingWindow === 'ewm'
+    ? time_series.ewm_accuracy || []
+    : rollingWindows[rollingWindow] || []
+  const rollingTitle = rollingWindow === 'ewm'
+    ? `Exponentially Weighted Accuracy (${time_series.ewm_span}-Day Span)`
+    : `${rollingWindow}-Day Rolling Accuracy`
   const herdingSeries = herding.daily_herding || []
   const herdingSummary = herding.summary || {}
   const h2hRecords = head_to_head.records || []
@@ -325,7 +336,20 @@ export default function Analytics() {
       </section>
 
       <section>
-        <h2 className={styles.sectionTitle}>5-Day Rolling Accuracy</h2>
+        <h2 className={styles.sectionTitle}>{rollingTitle}</h2>
+        {rollingOptions.length > 1 && (
+          <div className={styles.windowToggle}>
+            {rollingOptions.map(o => (
+              <button
+                key={o.key}
+                className={o.key === rollingWindow ? styles.windowBtnActive : styles.windowBtn}
+                onClick={() => setRollingWindow(o.key)}
+              >
+                {o.label}
+              </button>
+            ))}
+          </div>
+        )}
         <div className={styles.chart}>
           <ResponsiveContainer width="100%" height={300}>
             <LineChart data={rollingData}>
@@ -4,7 +4,7 @@ import PredictionCard from '../components/PredictionCard'
 import LeaderboardTable from '../components/LeaderboardTable'
 import ConsensusHighlight from '../components/ConsensusHighlight'
 import TodaysWinner from '../components/TodaysWinner'
-import { loadLeaderboard, loadPredictions, loadScores, loadDailySummary, loadTodaysWinner, MODEL_NAMES, MODEL_DISPLAY_MAP, MODEL_COLORS, getTodayDate } from '../data/useData'
+import { loadBundle, loadLeaderboard, loadPredictions, loadScores, loadDailySummary, loadTodaysWinner, MODEL_NAMES, MODEL_DISPLAY_MAP, MODEL_COLORS, getTodayDate } from '../data/useData'
 import styles from './Home.module.css'
 
 const EXCLUDED_TICKERS = new Set(['SPY', 'QQQ', 'DIA', 'VIX', 'IWM'])
@@ -71,6 +71,17 @@ export default function Home() {
   useEffect(() => {
     async function load() {
       try {
+        const bundle = await loadBundle('home')
+        if (bundle) {
+          setLeaderboard(bundle.leaderboard)
+          setScores(bundle.scores)
+          setDailySummary(bundle.daily_summary)
+          setTodaysWinner(bundle.winner)
+          setActiveDate(bundle.date)
+          setPredictions(bundle.predictions)
+          return
+        }
+
         const [lb, tw] = await Promise.all([
           loadLeaderboard(),
           loadTodaysWinner().catch(() => null),
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react'
 import { useParams, NavLink } from 'react-router-dom'
 import PredictionCard from '../components/PredictionCard'
-import { loadLeaderboard, loadPredictions, loadScores, loadTodaysWinner, getTodayDate, MODEL_COLORS } from '../data/useData'
+import { loadBundle, loadLeaderboard, loadPredictions, loadScores, loadTodaysWinner, getTodayDate, MODEL_COLORS } from '../data/useData'
 import {
   LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer
 } from 'recharts'
@@ -33,17 +33,25 @@ export default function ModelPage() {
   const today = getTodayDate()
 
   useEffect(() => {
+    async function loadFiles() {
+      const [lb, winnerData] = await Promise.all([
+        loadLeaderboard(),
+        loadTodaysWinner().catch(() => null),
+      ])
+      const latestDate = winnerData?.date || today
+      const [pd, sc] = await Promise.all([
+        loadPredictions(latestDate, slug).catch(() => null),
+        loadScores(latestDate).catch(() => null),
+      ])
+      return { lb, pd, sc, latestDate }
+    }
+
     async function load() {
       try {
-        const [lb, winnerData] = await Promise.all([
-          loadLeaderboard(),
-          loadTodaysWinner().catch(() => null),
-        ])
-        const latestDate = winnerData?.date || today
-        const [pd, sc] = await Promise.all([
-          loadPredictions(latestDate, slug).catch(() => null),
-          loadScores(latestDate).catch(() => null),
-        ])
+        const bundle = await loadBundle(`model/${slug}`)
+        const { lb, pd, sc, latestDate } = bundle
+          ? { lb: bundle.leaderboard, pd: bundle.predictions, sc: bundle.scores, latestDate: bundle.date }
+          : await loadFiles()
         const found = lb.models.find(
           m => m.model_display_name.toLowerCase() === normalizedName ||
                m.model_display_name.toLowerCase().replace('-', '') === normalizedName.replace('-', '')
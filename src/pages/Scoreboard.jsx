@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react'
 import LeaderboardTable from '../components/LeaderboardTable'
 import ScoreChart from '../components/ScoreChart'
-import { loadLeaderboard, loadAnalytics, enrichModelsWithColors } from '../data/useData'
+import { loadBundle, loadLeaderboard, loadAnalytics, enrichModelsWithColors } from '../data/useData'
 import styles from './Scoreboard.module.css'
 
 export default function Scoreboard() {
@@ -10,10 +10,14 @@ export default function Scoreboard() {
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    Promise.all([
-      loadLeaderboard(),
-      loadAnalytics().catch(() => null),
-    ]).then(([lb, an]) => {
+    loadBundle('scoreboard').then(bundle => (
+      bundle
+        ? [bundle.leaderboard, bundle.analytics]
+        : Promise.all([
+          loadLeaderboard(),
+          loadAnalytics().catch(() => null),
+        ])
+    )).then(([lb, an]) => {
       setLeaderboard(lb)
       setAnalytics(an)
     }).finally(() => setLoading(false))
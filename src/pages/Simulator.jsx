@@ -1,14 +1,23 @@
 import { useState, useEffect } from 'react'
-import { loadSimulator, MODEL_COLORS } from '../data/useData'
+import {
+  LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer,
+} from 'recharts'
+import { loadBundle, loadPortfolio, loadSimulator, MODEL_COLORS } from '../data/useData'
 import styles from './Simulator.module.css'
 
 export default function Simulator() {
   const [sim, setSim] = useState(null)
+  const [portfolio, setPortfolio] = useState(null)
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    loadSimulator()
-      .then(setSim)
+    loadBundle('simulator')
+      .then(bundle => bundle || loadSimulator())
+      .then(data => {
+        setSim(data)
+        return data.portfolio || loadPortfolio().catch(() => null)
+      })
+      .then(setPortfolio)
       .catch(() => setSim(null))
       .finally(() => setLoading(false))
   }, [])
@@ -177,10 +186,140 @@ export default function Simulator() {
           No trades yet. The simulator will open its first trade when 3+ models agree on a stock pick.
         </div>
       )}
+
+      {portfolio && portfolio.series.dates.length > 0 && <PortfolioSection portfolio={portfolio} />}
     </div>
   )
 }
 
+const TICKER_COLORS = ['#60a5fa', '#f472b6', '#facc15', '#34d399', '#a78bfa', '#fb923c', '#22d3ee', '#f87171']
+const RECENT_POSITIONS = 15
+
+function PortfolioSection({ portfolio }) {
+  const { balance, starting_balance, series, positions, top_n, weighting } = portfolio
+  const totalPnl = round(balance - starting_balance)
+  const totalPnlPct = starting_balance ? round((totalPnl / starting_balance) * 100) : 0
+  const closed = positions.filter(p => p.status === 'CLOSED')
+  const wins = closed.filter(p => p.pnl > 0).length
+  const tickers = Object.keys(series.by_ticker)
+
+  const chartData = series.dates.map((date, i) => {
+    const row = { date, equity: series.equity[i], cash: series.cash[i] }
+    tickers.forEach(t => { row[t] = series.by_ticker[t][i] })
+    return row
+  })
+  const recent = positions.filter(p => p.status !== 'SKIPPED').slice(-RECENT_POSITIONS).reverse()
+  const axisTick = { fill: '#555', fontSize: 11, fontFamily: 'IBM Plex Mono, monospace' }
+  const tooltipProps = {
+    contentStyle: { background: '#161616', border: '1px solid #262626', borderRadius: 8 },
+    labelStyle: { color: '#888', fontSize: 11 },
+    itemStyle: { fontFamily: 'IBM Plex Mono, monospace', fontSize: 12 },
+  }
+
+  return (
+    <section className={styles.portfolio}>
+      <h2 className={styles.sectionTitle}>Portfolio Mode — Top {top_n}, {weighting.replace('_', '-')} weighted</h2>
+      <p className={styles.portfolioNote}>
+        Splits the balance across the day's top {top_n} consensus picks instead of only the winner.
+        Same open-to-close fills; unspent cash is carried.
+      </p>
+
+      <div className={styles.statGrid}>
+        <div className={styles.statCard}>
+          <span className={styles.statLabel}>Balance</span>
+          <span className={[styles.statValue, totalPnl >= 0 ? styles.statUp : styles.statDown].join(' ')}>
+            ${balance.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 2 })}
+            <span className={styles.statPct}> ({totalPnlPct >= 0 ? '+' : ''}{totalPnlPct}%)</span>
+          </span>
+        </div>
+        <div className={styles.statCard}>
+          <span className={styles.statLabel}>Position Win Rate</span>
+          <span className={styles.statValue}>{closed.length ? round((wins / closed.length) * 100) : 0}%</span>
+          <span className={styles.statSub}>{wins} of {closed.length} positions</span>
+        </div>
+        <div className={styles.statCard}>
+          <span className={styles.statLabel}>Trading Days</span>
+          <span className={styles.statValue}>{series.dates.length}</span>
+        </div>
+      </div>
+
+      <div className={styles.chart}>
+        <ResponsiveContainer width="100%" height={260}>
+          <LineChart data={chartData} margin={{ top: 8, right: 16, left: 10, bottom: 0 }}>
+            <CartesianGrid strokeDasharray="3 3" stroke="#1f1f1f" />
+            <XAxis dataKey="date" tick={axisTick} axisLine={false} tickLine={false} />
+            <YAxis tick={axisTick} axisLine={false} tickLine={false} domain={['auto', 'auto']} />
+            <Tooltip {...tooltipProps} />
+            <Legend />
+            <Line type="monotone" dataKey="equity" name="Equity" stroke="#e5e5e5" strokeWidth={2} dot={false} />
+            <Line type="monotone" dataKey="cash" name="Uninvested cash" stroke="#555" strokeWidth={1} dot={false} />
+          </LineChart>
+        </ResponsiveContainer>
+      </div>
+
+      <div className={styles.chart}>
+        <ResponsiveContainer width="100%" height={220}>
+          <LineChart data={chartData} margin={{ top: 8, right: 16, left: 10, bottom: 0 }}>
+            <CartesianGrid strokeDasharray="3 3" stroke="#1f1f1f" />
+            <XAxis dataKey="date" tick={axisTick} axisLine={false} tickLine={false} />
+            <YAxis tick={axisTick} axisLine={false} tickLine={false} />
+            <Tooltip {...tooltipProps} />
+            <Legend />
+            {tickers.map((t, i) => (
+              <Line key={t} type="stepAfter" dataKey={t} stroke={TICKER_COLORS[i % TICKER_COLORS.length]} strokeWidth={1.5} dot={false} />
+            ))}
+          </LineChart>
+        </ResponsiveContainer>
+      </div>
+
+      <div className={styles.tableWrap}>
+        <table className={styles.table}>
+          <thead>
+            <tr>
+              <th>Date</th>
+              <th>Ticker</th>
+              <th>Dir</th>
+              <th>Weight</th>
+              <th>Entry</th>
+              <th>Exit</th>
+              <th>Shares</th>
+              <th>P&L $</th>
+              <th>P&L %</th>
+            </tr>
+          </thead>
+          <tbody>
+            {recent.map((p, i) => {
+              const isWin = p.pnl > 0
+              const isLoss = p.pnl !== null && p.pnl < 0
+              return (
+                <tr key={i} className={[styles.row, isWin ? styles.rowWin : '', isLoss ? styles.rowLoss : ''].join(' ')}>
+                  <td className={styles.mono}>{p.date}</td>
+                  <td className={styles.mono}><strong>{p.ticker}</strong></td>
+                  <td>
+                    <span className={[styles.dirBadgeSmall, p.direction === 'up' ? styles.badgeUp : styles.badgeDown].join(' ')}>
+                      {p.direction === 'up' ? '▲' : '▼'}
+                    </span>
+                  </td>
+                  <td className={styles.mono}>{round(p.weight * 100, 1)}%</td>
+                  <td className={styles.mono}>${p.entry_price?.toFixed(2)}</td>
+                  <td className={styles.mono}>{p.exit_price != null ? `$${p.exit_price.toFixed(2)}` : '—'}</td>
+                  <td>{p.shares}</td>
+                  <td className={[styles.mono, isWin ? styles.pnlUp : '', isLoss ? styles.pnlDown : ''].join(' ')}>
+                    {p.pnl != null ? `${p.pnl >= 0 ? '+' : ''}$${p.pnl.toFixed(2)}` : '—'}
+                  </td>
+                  <td className={[styles.mono, isWin ? styles.pnlUp : '', isLoss ? styles.pnlDown : ''].join(' ')}>
+                    {p.pnl_pct != null ? `${p.pnl_pct >= 0 ? '+' : ''}${p.pnl_pct}%` : '—'}
+                  </td>
+                </tr>
+              )
+            })}
+          </tbody>
+        </table>
+      </div>
+    </section>
+  )
+}
+
 function round(n, d = 2) {
   return Math.round(n * 10 ** d) / 10 ** d
 }
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from portfolio import simulate
+
+
+def _positions(day, entry, exit_):
+    n = len(day)
+    return {
+        "day": np.array(day, dtype=np.int64),
+        "sign": np.ones(n),
+        "raw_weight": np.ones(n),
+        "entry": np.array(entry, dtype=float),
+        "exit": np.array(exit_, dtype=float),
+    }
+
+
+def test_mid_history_gap_is_skipped_not_reserved():
+    # Day 0: one position has no close (data gap), the other closes flat.
+    positions = _positions([0, 0, 1], [100.0, 100.0, 100.0], [np.nan, 100.0, 101.0])
+    result = simulate(positions, 2, starting_balance=1000)
+
+    assert result["shares"][0] == 0 and np.isnan(result["pnl"][0])
+    assert result["shares"][1] == 10  # the whole balance goes to the position that closes
+    assert result["shares"][2] == 10  # day 1 sizes against the full balance again
+    assert result["cash"][1] == 0
+    assert result["equity"][1] == 1010
+
+
+def test_last_day_without_close_stays_open_at_cost():
+    positions = _positions([0, 0], [100.0, 50.0], [102.0, np.nan])
+    result = simulate(positions, 1, starting_balance=1000)
+
+    assert result["shares"].tolist() == [5, 10]
+    assert result["pnl"][0] == 10 and np.isnan(result["pnl"][1])
+    assert result["invested"][0] == 1000
+    assert result["equity"][0] == 1010